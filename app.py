@@ -1,21 +1,33 @@
+import sqlite3
+import time
+import uuid
+
 import streamlit as st
 import pandas as pd
-import io
-from datetime import datetime
+
+from worklist import batch, cache, criteria, export, importer, jobs, profiling, store, summary, validation
+from worklist.numeric import input_number, parse_number
+from worklist.records import HEADER_KEYS, UnitRecord, clone_unit, empty_header, new_hazard_entry, split_header, strip_header, with_header
+from worklist.schema import (
+    BURDEN_OPTIONS,
+    FIXED_MAX_HAZARD_ANALYTICS,
+    HAZARD_TYPE_FORCE,
+    HAZARD_TYPE_OTHER,
+    HAZARD_TYPE_POSTURE,
+    HAZARD_TYPE_REPEAT,
+    UNIT_UID_KEY,
+)
 
 st.set_page_config(layout="wide")
 
 st.title("📋 작업목록표 입력 시스템")
 
-# 헬퍼 함수: 문자열에서 숫자 추출 (단위 제거)
-def parse_value(value_str, default_val=0, val_type=float):
-    if pd.isna(value_str) or str(value_str).strip() == "":
-        return default_val
-    try:
-        cleaned_value = str(value_str).replace("시간", "").replace("분", "").replace("kg", "").replace("회", "").replace("일", "").replace("/", "").replace("초", "").strip()
-        return val_type(cleaned_value)
-    except ValueError:
-        return default_val
+# 단위작업 입력 폼 페이지 설정 (선택한 페이지의 단위작업만 입력 위젯을 그림)
+UNITS_PER_PAGE_OPTIONS = [1, 5, 10, 20, 50]
+DEFAULT_UNITS_PER_PAGE = 10
+
+def page_count_for(unit_count, units_per_page):
+    return max(1, (unit_count + units_per_page - 1) // units_per_page)
 
 # --- 세션 상태 초기화 및 기본값 설정 ---
 def initialize_session_state():
@@ -23,46 +35,139 @@ def initialize_session_state():
         st.session_state.task_units = []
     if 'unit_count' not in st.session_state:
         st.session_state.unit_count = 0
-    if 'group_name' not in st.session_state:
-        st.session_state.group_name = ""
-    if '소속' not in st.session_state:
-        st.session_state.소속 = ""
-    if '반' not in st.session_state:
-        st.session_state.반 = ""
+    if 'header' not in st.session_state:
+        st.session_state.header = empty_header()
     if 'file_processed' not in st.session_state:
         st.session_state.file_processed = False
+    if 'upload_issues' not in st.session_state:
+        st.session_state.upload_issues = None # 마지막 업로드의 검증 결과 (셀별 오류 행 목록)
+    if 'units_per_page' not in st.session_state:
+        st.session_state.units_per_page = DEFAULT_UNITS_PER_PAGE
+    if 'unit_page' not in st.session_state:
+        st.session_state.unit_page = 1
+    if 'last_selected_unit' not in st.session_state:
+        st.session_state.last_selected_unit = None
+    if 'workspace_owner' not in st.session_state:
+        # 저장된 작업을 구분하는 브라우저별 토큰 (주소의 ?ws=...에 두어 새로고침하거나 북마크로 다시 열어도 유지)
+        st.session_state.workspace_owner = store.owner_token(st.query_params.get(store.OWNER_QUERY_PARAM))
+    if st.query_params.get(store.OWNER_QUERY_PARAM) != st.session_state.workspace_owner:
+        st.query_params[store.OWNER_QUERY_PARAM] = st.session_state.workspace_owner
+    if 'autosave_tracker' not in st.session_state:
+        st.session_state.autosave_tracker = store.WorkspaceTracker(st.session_state.workspace_owner)
+        st.session_state.autosave_full_sync = True
+    if 'exposure_summary' not in st.session_state:
+        st.session_state.exposure_summary = summary.ExposureSummary()
+    if 'export_job' not in st.session_state:
+        st.session_state.export_job = None
+        st.session_state.export_job_source = None
+        st.session_state.export_notice = None
+    if 'shared_unit_ids' not in st.session_state:
+        st.session_state.shared_unit_ids = set() # 업로드 캐시나 내보내기 작업과 함께 쓰는 (아직 복사하지 않은) 단위작업
+    if 'profile_session_id' not in st.session_state:
+        st.session_state.profile_session_id = uuid.uuid4().hex[:8]
+        st.session_state.profile_run_number = 0
+        st.session_state.profile_history = []
 
 def create_default_unit():
-    return {
-        "회사명": st.session_state.group_name,
-        "소속": st.session_state.소속,
-        "반": st.session_state.반,
+    return UnitRecord({
         "단위작업명": "",
         "작업내용(상세설명)": "",
         "작업자 수": 1,
         "작업자 이름": "",
         "작업형태": "주간",
         "1일 작업시간": 0,
-        "자세": {},
-        "중량물": [],
-        "도구": [],
-        "유해요인_원인분석": [{"유형": "", "부담작업": "", "부담작업자세": ""}],
+        "유해요인_원인분석": [new_hazard_entry()],
         "보호구": [],
         "작성자": "",
         "연락처": ""
-    }
+    })
+
+# 회사명/소속/반 입력칸의 위젯 키
+HEADER_WIDGET_KEYS = {"회사명": "input_group_name", "소속": "input_affiliation", "반": "input_class"}
+
+# 회사명/소속/반 머리글을 바꿈 (입력칸 위젯 상태도 함께 바꿔야 이전 입력값으로 되돌아가지 않음, 입력칸을 그리기 전에만 호출)
+def set_header(header):
+    st.session_state.header = {key: header.get(key, "") for key in HEADER_KEYS}
+    for key, widget_key in HEADER_WIDGET_KEYS.items():
+        st.session_state[widget_key] = st.session_state.header[key]
+
+# 업로드 캐시에 넣을 값: (단위작업 목록, 머리글, 읽기 방법, 검증 결과), 반환값: 머리글
+# 머리글 분리와 고유ID 부여를 캐시에 넣기 전에 끝내 두어, 캐시의 단위작업은 꺼낸 뒤 고치지 않고 여러 세션이 함께 씀
+def cache_upload(cache_key, task_units, method, issues):
+    header = split_header(task_units)
+    for unit in task_units:
+        store.ensure_uid(unit)
+    cache.workbook_cache.put(cache_key, (task_units, header, method, issues))
+    return header
+
+# 캐시의 단위작업 목록을 바로 고쳐 쓸 수 있는 복사본으로 (머리글 값을 다시 채우고 고유ID는 새로 부여)
+def unshared_units(task_units, header):
+    copies = with_header(task_units, header, clone_unit)
+    for unit in copies:
+        unit.pop(UNIT_UID_KEY, None)
+    return copies
+
+# 단위작업 i를 고치기 전에 호출 (업로드 캐시나 내보내기 작업과 함께 쓰는 단위작업이면 이 세션용 복사본으로 바꿈, copy-on-write)
+def own_unit(i):
+    return cache.own_unit(st.session_state.task_units, st.session_state.shared_unit_ids, i)
+
+# 측정 결과를 남기고 다시 실행 (st.rerun() 대신 사용, 측정이 꺼져 있으면 st.rerun()과 같음)
+# 조각만 다시 실행 중일 때는 전체 실행의 측정이 이미 끝났으므로 다시 기록하지 않음
+# scope="fragment"는 조각만 다시 실행 중일 때만 가능하므로 전체 실행 중에는 전체를 다시 실행
+def rerun(scope="app"):
+    if profiling.is_fragment_rerun():
+        st.rerun(scope=scope)
+    if profile.finish(status="rerun") is not None:
+        remember_profile(profile.record)
+    st.rerun()
+
+# 진단 화면의 최근 실행 시간 그래프용 (세션당 최근 PROFILE_HISTORY_SIZE회)
+PROFILE_HISTORY_SIZE = 50
+
+def remember_profile(record):
+    st.session_state.profile_history = (st.session_state.profile_history + [record])[-PROFILE_HISTORY_SIZE:]
 
 # 세션 상태 초기화
 initialize_session_state()
 
+# 성능 측정 (환경 변수 WORKLIST_PROFILE=1 또는 주소에 ?profile=1일 때만)
+st.session_state.profile_run_number += 1
+profile = profiling.RerunProfile(
+    st.session_state.profile_session_id,
+    st.session_state.profile_run_number,
+    enabled=profiling.profiling_requested(st.query_params.to_dict()),
+    widget_counter=profiling.count_rendered_widgets
+)
+profile.lap("초기화")
+
 # 앱 시작 시 또는 파일 로드 후, 최소 1개의 단위작업공정이 있도록 보장
 if st.session_state.unit_count == 0 and not st.session_state.task_units:
     st.session_state.unit_count = 1
     st.session_state.task_units.append(create_default_unit())
 
 # 엑셀 파일 업로드 섹션
+profile.lap("업로드")
 st.sidebar.header("📊 데이터 불러오기/내보내기")
-uploaded_file = st.sidebar.file_uploader("엑셀 파일 업로드 (재시작/수정)", type=["xlsx", "xls"], key="file_uploader")
+multi_upload = st.sidebar.checkbox(
+    "여러 파일 합치기",
+    key="multi_upload",
+    help="여러 반의 작업목록 파일을 동시에 읽어 하나의 목록으로 합칩니다. (내용이 같은 단위작업은 하나만 남김)"
+)
+uploaded_file = None
+uploaded_files = []
+streaming_upload = False
+if multi_upload:
+    uploaded_files = st.sidebar.file_uploader("엑셀 파일 여러 개 업로드", type=["xlsx", "xls"], accept_multiple_files=True, key="file_uploader_multi")
+else:
+    uploaded_file = st.sidebar.file_uploader("엑셀 파일 업로드 (재시작/수정)", type=["xlsx", "xls"], key="file_uploader")
+    streaming_upload = st.sidebar.checkbox(
+        "대용량 파일 모드 (xlsx를 일정 행씩 나누어 읽기)",
+        key="streaming_upload",
+        help="파일 전체를 한 번에 메모리에 올리지 않고 행 묶음 단위로 읽어 변환합니다."
+    )
+upload_row_cap = 0
+if streaming_upload:
+    upload_row_cap = st.sidebar.number_input("최대 읽을 행 수 (0 = 전체)", min_value=0, step=1000, key="upload_row_cap")
 
 # #############################################################################
 # ##########               파일 업로드 처리 로직 (수정된 부분)               ##########
@@ -71,148 +176,91 @@ if uploaded_file is not None and not st.session_state.file_processed:
     try:
         st.sidebar.info(f"📁 파일: {uploaded_file.name} ({uploaded_file.size} bytes)")
 
-        # 파일을 메모리 버퍼로 읽어 안정성 확보
-        file_buffer = io.BytesIO(uploaded_file.getvalue())
-        
         df_uploaded = None
+        loaded_task_units = None
         success_method = None
+        upload_issues = []
         error_details = []
-        
-        # 시도할 엔진과 시트 이름 목록 정의
-        engines_to_try = ['openpyxl', 'calamine', 'xlrd']
-        sheets_to_try = ['작업목록', 0] # '작업목록' 시트 또는 첫 번째 시트
-
-        # 다양한 엔진과 시트 이름으로 파일 읽기 시도
-        for engine in engines_to_try:
-            for sheet in sheets_to_try:
-                try:
-                    # 버퍼의 커서를 맨 앞으로 이동
-                    file_buffer.seek(0)
-                    df_uploaded = pd.read_excel(file_buffer, sheet_name=sheet, engine=engine)
-                    
-                    # 시트 이름을 숫자로 지정했다면 실제 시트 이름 가져오기
-                    sheet_name_str = sheet if isinstance(sheet, str) else pd.ExcelFile(file_buffer, engine=engine).sheet_names[0]
-                    success_method = f"엔진: {engine}, 시트: '{sheet_name_str}'"
-                    break # 성공 시 루프 탈출
-                except Exception as e:
-                    sheet_name_str = sheet if isinstance(sheet, str) else "첫 번째 시트"
-                    error_details.append(f"엔진 '{engine}', 시트 '{sheet_name_str}' 시도 실패: {e}")
-            if df_uploaded is not None:
-                break # 성공 시 외부 루프도 탈출
+
+        # 같은 파일(같은 읽기 옵션)을 이미 파싱한 적이 있으면 캐시된 결과를 사용
+        upload_cache_key = cache.content_key(
+            uploaded_file.getbuffer(),
+            "stream" if streaming_upload else "full",
+            upload_row_cap
+        )
+        cached_upload = cache.workbook_cache.get(upload_cache_key)
+
+        if cached_upload is not None:
+            loaded_task_units, upload_header, success_method, upload_issues = cached_upload
+            success_method += " (캐시)"
+        elif streaming_upload:
+            # 읽기 전용 모드로 행 묶음씩 읽어 바로 변환 (업로드 파일을 다시 복사하지 않음)
+            upload_progress = st.sidebar.progress(0.0, text="파일 읽는 중...")
+
+            def show_upload_progress(rows_read, total_rows):
+                if total_rows:
+                    upload_progress.progress(min(rows_read / total_rows, 1.0), text=f"{rows_read} / {total_rows} 행 읽는 중...")
+                else:
+                    upload_progress.progress(0.0, text=f"{rows_read} 행 읽는 중...")
+
+            try:
+                loaded_task_units, success_method = importer.stream_task_units(
+                    uploaded_file,
+                    max_rows=upload_row_cap or None,
+                    progress_callback=show_upload_progress,
+                    chunk_callback=lambda sheet_name, chunk: upload_issues.extend(validation.validate_chunk(sheet_name, chunk))
+                )
+            except Exception as e:
+                error_details.append(f"파일 읽기 실패: {e}")
+            upload_progress.empty()
+        else:
+            # 파일 시그니처로 형식(xlsx/xls)과 엔진을 판별하고, '작업목록' 시트(없으면 첫 번째 시트)를 한 번만 읽음
+            try:
+                df_uploaded, hazard_df_uploaded, success_method = importer.read_worklist_tables(uploaded_file)
+                # 변환하기 전에 파일 전체를 한 번에 검사 (건너뛰거나 기본값으로 읽는 셀을 알려 줌)
+                upload_issues = validation.validate_tables(df_uploaded, hazard_df_uploaded)
+            except Exception as e:
+                error_details.append(f"파일 읽기 실패: {e}")
 
         # 파일 읽기 성공 시
-        if df_uploaded is not None:
+        if df_uploaded is not None or loaded_task_units is not None:
             st.sidebar.success(f"🎉 파일 로드 성공!\n(사용된 방법: {success_method})")
-            
-            with st.sidebar.expander("데이터 미리보기"):
-                st.dataframe(df_uploaded.head(3))
 
-            # --- 기존 데이터 처리 로직 (이하 동일) ---
+            if df_uploaded is not None:
+                with st.sidebar.expander("데이터 미리보기"):
+                    st.dataframe(df_uploaded.head(3))
+
+                # --- 업로드 데이터를 컬럼 단위로 한꺼번에 단위작업 목록으로 변환 ---
+                # 정규화 양식이면 유해요인 시트의 항목을 단위작업ID로 연결 (개수 제한 없음)
+                hazards_by_unit = None
+                if hazard_df_uploaded is not None:
+                    hazards_by_unit = importer.decode_hazard_rows(hazard_df_uploaded)
+                loaded_task_units = importer.decode_task_units(df_uploaded, hazards_by_unit=hazards_by_unit)
+
             st.session_state.task_units = []
             st.session_state.unit_count = 0
-            loaded_task_units = []
-            for index, row in df_uploaded.iterrows():
-                unit = {
-                    "회사명": str(row.get("회사명", "")).strip(),
-                    "소속": str(row.get("소속", "")).strip(),
-                    "반": str(row.get("반", "")).strip(),
-                    "단위작업명": str(row.get("단위작업명", "")).strip(),
-                    "작업내용(상세설명)": str(row.get("작업내용(상세설명)", "")).strip(),
-                    "작업자 수": int(row.get("작업자 수", 1)) if pd.notna(row.get("작업자 수")) else 1,
-                    "작업자 이름": str(row.get("작업자 이름", "")).strip(),
-                    "작업형태": str(row.get("작업형태", "주간")).strip(),
-                    "1일 작업시간": row.get("1일 작업시간", 0),
-                    "자세": {},
-                    "중량물": [],
-                    "도구": [],
-                    "유해요인_원인분석": [],
-                    "보호구": [],
-                    "작성자": str(row.get("작성자", "")).strip(),
-                    "연락처": str(row.get("연락처", "")).strip()
-                }
-                
-                protection_gear_str = row.get("보호구", "")
-                if pd.notna(protection_gear_str) and str(protection_gear_str).strip():
-                    unit["보호구"] = [item.strip() for item in str(protection_gear_str).split(",") if item.strip()]
-
-                for k_crit in range(1, 13):
-                    col_name = f"부담작업_{k_crit}호"
-                    value = row.get(col_name, "X")
-                    unit[col_name] = str(value).strip() if pd.notna(value) else "X"
-
-                FIXED_MAX_HAZARD_ANALYTICS_FOR_PARSE = 5
-                for j_hazard in range(FIXED_MAX_HAZARD_ANALYTICS_FOR_PARSE):
-                    hazard_type = row.get(f"유해요인_원인분석_유형_{j_hazard+1}")
-                    if pd.notna(hazard_type) and str(hazard_type).strip() != "":
-                        hazard_entry = {"유형": hazard_type}
-                        
-                        if hazard_type == "반복동작":
-                            hazard_entry["부담작업"] = row.get(f"유해요인_원인분석_부담작업_{j_hazard+1}_반복", "")
-                            hazard_entry["수공구 종류"] = row.get(f"유해요인_원인분석_수공구_종류_{j_hazard+1}", "")
-                            hazard_entry["수공구 용도"] = row.get(f"유해요인_원인분석_수공구_용도_{j_hazard+1}", "")
-                            hazard_entry["수공구 무게(kg)"] = row.get(f"유해요인_원인분석_수공구_무게(kg)_{j_hazard+1}", 0.0)
-                            hazard_entry["수공구 사용시간(분)"] = row.get(f"유해요인_원인분석_수공구_사용시간(분)_{j_hazard+1}", "")
-                            hazard_entry["부담부위"] = row.get(f"유해요인_원인분석_부담부위_{j_hazard+1}", "")
-                            hazard_entry["회당 반복시간(초/회)"] = row.get(f"유해요인_원인분석_반복_회당시간(초/회)_{j_hazard+1}", "")
-                            hazard_entry["작업시간동안 반복횟수(회/일)"] = row.get(f"유해요인_원인분석_반복_이횟수(회/일)_{j_hazard+1}", "")
-                            hazard_entry["이 작업시간(분)"] = row.get(f"유해요인_원인분석_반복_이시간(분)_{j_hazard+1}", "")
-                            hazard_entry["물체 무게(kg)_10호"] = row.get(f"유해요인_원인분석_반복_물체무게_10호(kg)_{j_hazard+1}", 0.0)
-                            hazard_entry["분당 반복횟수(회/분)_10호"] = row.get(f"유해요인_원인분석_반복_분당반복횟수_10호(회/분)_{j_hazard+1}", "")
-                            hazard_entry["작업내용_12호_정적"] = row.get(f"유해요인_원인분석_반복_작업내용_12호_정적_{j_hazard+1}", "")
-                            hazard_entry["작업시간(분)_12호_정적"] = row.get(f"유해요인_원인분석_반복_작업시간_12호_정적_{j_hazard+1}", "")
-                            hazard_entry["휴식시간(분)_12호_정적"] = row.get(f"유해요인_원인분석_반복_휴식시간_12호_정적_{j_hazard+1}", "")
-                            hazard_entry["인체부담부위_12호_정적"] = row.get(f"유해요인_원인분석_반복_인체부담부위_12호_정적_{j_hazard+1}", "")
-
-                        elif hazard_type == "부자연스러운 자세":
-                            hazard_entry["부담작업자세"] = row.get(f"유해요인_원인분석_부담작업자세_{j_hazard+1}", "")
-                            hazard_entry["회당 반복시간(초/회)"] = row.get(f"유해요인_원인분석_자세_회당시간(초/회)_{j_hazard+1}", "")
-                            hazard_entry["작업시간동안 반복횟수(회/일)"] = row.get(f"유해요인_원인분석_자세_이횟수(회/일)_{j_hazard+1}", "")
-                            hazard_entry["이 작업시간(분)"] = row.get(f"유해요인_원인분석_자세_이시간(분)_{j_hazard+1}", "")
-                            
-                        elif hazard_type == "과도한 힘":
-                            hazard_entry["부담작업"] = row.get(f"유해요인_원인분석_부담작업_{j_hazard+1}_힘", "")
-                            hazard_entry["중량물 명칭"] = row.get(f"유해요인_원인분석_힘_중량물_명칭_{j_hazard+1}", "")
-                            hazard_entry["중량물 용도"] = row.get(f"유해요인_원인분석_힘_중량물_용도_{j_hazard+1}", "")
-                            hazard_entry["중량물 무게(kg)"] = row.get(f"유해요인_원인분석_중량물_무게(kg)_{j_hazard+1}", 0.0)
-                            hazard_entry["하루 8시간동안 중량물을 드는 횟수(회)"] = row.get(f"유해요인_원인분석_하루8시간_중량물_횟수(회)_{j_hazard+1}", 0)
-                            hazard_entry["취급방법"] = row.get(f"유해요인_원인분석_힘_취급방법_{j_hazard+1}", "")
-                            hazard_entry["중량물 이동방법"] = row.get(f"유해요인_원인분석_힘_이동방법_{j_hazard+1}", "")
-                            hazard_entry["작업자가 직접 밀고/당기기"] = row.get(f"유해요인_원인분석_힘_직접_밀당_{j_hazard+1}", "")
-                            hazard_entry["기타_밀당_설명"] = row.get(f"유해요인_원인분석_힘_기타_밀당_설명_{j_hazard+1}", "")
-                            hazard_entry["작업시간동안 작업횟수(회/일)"] = row.get(f"유해요인_원인분석_힘_이횟수(회/일)_{j_hazard+1}", "")
-                            
-                        elif hazard_type == "접촉스트레스 또는 기타(진동, 밀고 당기기 등)":
-                            hazard_entry["부담작업"] = row.get(f"유해요인_원인분석_부담작업_{j_hazard+1}_기타", "")
-                            if hazard_entry["부담작업"] == "(11호)접촉스트레스":
-                                hazard_entry["작업시간(분)"] = row.get(f"유해요인_원인분석_기타_작업시간(분)_{j_hazard+1}", "")
-                            elif hazard_entry["부담작업"] == "(12호)진동작업(그라인더, 임팩터 등)":
-                                hazard_entry["진동수공구명"] = row.get(f"유해요인_원인분석_기타_진동수공구명_{j_hazard+1}", "")
-                                hazard_entry["진동수공구 용도"] = row.get(f"유해요인_원인분석_기타_진동수공구_용도_{j_hazard+1}", "")
-                                hazard_entry["작업시간(분)_진동"] = row.get(f"유해요인_원인분석_기타_작업시간_진동_{j_hazard+1}", "")
-                                hazard_entry["작업빈도(초/회)_진동"] = row.get(f"유해요인_원인분석_기타_작업빈도_진동_{j_hazard+1}", "")
-                                hazard_entry["작업량(회/일)_진동"] = row.get(f"유해요인_원인분석_기타_작업량_진동_{j_hazard+1}", "")
-                                hazard_entry["수공구사용시 지지대가 있는가?"] = row.get(f"유해요인_원인분석_기타_지지대_여부_{j_hazard+1}", "")
-                        
-                        unit["유해요인_원인분석"].append(hazard_entry)
-                
-                if not any([unit["회사명"], unit["단위작업명"], unit["작업내용(상세설명)"]]):
-                    continue
-                    
-                if not unit["유해요인_원인분석"]:
-                    unit["유해요인_원인분석"].append({"유형": "", "부담작업": "", "부담작업자세": ""})
-
-                loaded_task_units.append(unit)
+            if cached_upload is None:
+                # 화면에 표시되지 않는 단위작업도 부담작업 판정이 최신이 되도록 전체를 한 번에 판정
+                criteria.apply_burden_criteria(loaded_task_units)
+                upload_header = cache_upload(upload_cache_key, loaded_task_units, success_method, upload_issues)
             
             if loaded_task_units:
-                st.session_state.group_name = loaded_task_units[0].get("회사명", "")
-                st.session_state.소속 = loaded_task_units[0].get("소속", "")
-                st.session_state.반 = loaded_task_units[0].get("반", "")
-                st.session_state.task_units = loaded_task_units
+                # 캐시의 단위작업을 그대로 함께 쓰고, 입력 폼에서 고치는 단위작업만 이 세션용으로 복사 (own_unit)
+                set_header(upload_header)
+                st.session_state.task_units, st.session_state.shared_unit_ids = cache.share_units(loaded_task_units)
                 st.session_state.unit_count = len(loaded_task_units)
+                st.session_state.unit_page = 1
                 st.session_state.file_processed = True
-                st.rerun()
+                st.session_state.upload_report = None
+                st.session_state.upload_issues = upload_issues
+                # 업로드한 파일은 새 작업으로 자동 저장 (이전 작업은 저장소에 그대로 남음)
+                st.session_state.autosave_tracker = store.WorkspaceTracker(st.session_state.workspace_owner)
+                st.session_state.autosave_full_sync = True
+                st.session_state.exposure_summary = summary.ExposureSummary()
+                rerun()
             else:
                 st.sidebar.warning("업로드된 파일에 유효한 작업 데이터가 없습니다.")
+                st.session_state.upload_issues = upload_issues
                 st.session_state.unit_count = 1
                 st.session_state.task_units = [create_default_unit()]
         
@@ -233,6 +281,7 @@ if uploaded_file is not None and not st.session_state.file_processed:
             # 실패 시 기본 데이터로 초기화
             st.session_state.task_units = [create_default_unit()]
             st.session_state.unit_count = 1
+            st.session_state.upload_issues = None
 
     # 예측 불가능한 전체 오류 처리
     except Exception as e:
@@ -247,6 +296,93 @@ if uploaded_file is not None and not st.session_state.file_processed:
         # 실패 시 기본 데이터로 초기화
         st.session_state.task_units = [create_default_unit()]
         st.session_state.unit_count = 1
+        st.session_state.exposure_summary = summary.ExposureSummary()
+        st.session_state.upload_issues = None
+
+# 여러 파일 업로드 처리 (캐시에 없는 파일을 프로세스 풀에서 동시에 읽은 뒤 파일 순서대로 합침)
+if uploaded_files and not st.session_state.file_processed:
+    upload_results = []
+    pending_uploads = []
+    for multi_file in uploaded_files:
+        multi_cache_key = cache.content_key(multi_file.getbuffer(), "full", 0)
+        cached_upload = cache.workbook_cache.get(multi_cache_key)
+        if cached_upload is None:
+            upload_results.append(None)
+            pending_uploads.append((len(upload_results) - 1, multi_file.name, multi_file.getvalue(), multi_cache_key))
+            continue
+        # 합치면서 출처/소속/반을 채우므로 캐시의 단위작업은 복사해서 사용
+        cached_task_units = unshared_units(cached_upload[0], cached_upload[1])
+        cached_method, cached_issues = cached_upload[2], cached_upload[3]
+        upload_results.append({
+            "파일": multi_file.name,
+            "상태": "성공" if cached_task_units else "경고",
+            "단위작업 수": len(cached_task_units),
+            "검증 오류": len(cached_issues),
+            "읽기 방법": cached_method + " (캐시)",
+            "오류": "" if cached_task_units else "유효한 작업 데이터가 없습니다.",
+            "task_units": cached_task_units,
+            "issues": cached_issues
+        })
+
+    if pending_uploads:
+        with st.sidebar:
+            with st.spinner(f"파일 {len(pending_uploads)}개를 동시에 읽는 중..."):
+                parsed_results = batch.run_batch_contents(
+                    [(name, content) for _, name, content, _ in pending_uploads],
+                    merge_existing=True
+                )
+        for (result_index, _, _, multi_cache_key), result in zip(pending_uploads, parsed_results):
+            upload_results[result_index] = result
+            if result["상태"] != "실패":
+                cache_upload(multi_cache_key, [clone_unit(unit) for unit in result["task_units"]], result["읽기 방법"], result["issues"])
+
+    loaded_task_units = batch.merge_results(upload_results)
+    st.session_state.upload_report = [batch.report_row(result) for result in upload_results]
+    st.session_state.upload_issues = [
+        issue for result in upload_results for issue in validation.tag_file(result["issues"], result["파일"])
+    ]
+    st.session_state.file_processed = True
+
+    if loaded_task_units:
+        # 여러 소속/반이 섞여 있으면 공통 값만 머리글(입력칸)로 옮김 (단위작업별 소속/반은 그대로 유지)
+        set_header(split_header(loaded_task_units))
+        st.session_state.task_units = loaded_task_units
+        st.session_state.unit_count = len(loaded_task_units)
+        st.session_state.unit_page = 1
+        st.session_state.autosave_tracker = store.WorkspaceTracker(st.session_state.workspace_owner)
+        st.session_state.autosave_full_sync = True
+        st.session_state.exposure_summary = summary.ExposureSummary()
+        st.session_state.shared_unit_ids = set()
+        rerun()
+    else:
+        st.sidebar.error("❌ 업로드한 파일에서 작업 데이터를 읽지 못했습니다.")
+
+# 여러 파일 업로드의 파일별 처리 결과
+if multi_upload and st.session_state.get("upload_report"):
+    with st.sidebar.expander("📑 파일별 처리 결과", expanded=True):
+        failed_uploads = sum(1 for row in st.session_state.upload_report if row["상태"] == "실패")
+        merged_units = sum(row["단위작업 수"] - row.get("중복 제거", 0) for row in st.session_state.upload_report)
+        st.caption(f"파일 {len(st.session_state.upload_report)}개 (실패 {failed_uploads}개), 합친 단위작업 {merged_units}개")
+        st.dataframe(pd.DataFrame(st.session_state.upload_report), hide_index=True)
+
+# 업로드 검증 결과 (셀별 오류 표, 전체를 엑셀로 내려받아 한 번에 고칠 수 있게)
+if st.session_state.upload_issues is not None:
+    upload_issues = st.session_state.upload_issues
+    if not upload_issues:
+        st.sidebar.caption("✅ 업로드 검증: 문제가 있는 셀이 없습니다.")
+    else:
+        with st.sidebar.expander(f"🔎 업로드 검증 결과 (셀 {len(upload_issues)}개)", expanded=True):
+            issue_columns = (["파일"] if "파일" in upload_issues[0] else []) + validation.ISSUE_COLUMNS
+            st.caption("건너뛰거나 기본값으로 읽은 셀입니다. 원본 파일을 고친 뒤 다시 올려 주세요.")
+            st.dataframe(pd.DataFrame(upload_issues, columns=issue_columns), hide_index=True)
+            st.download_button(
+                label="📥 검증 결과 다운로드",
+                data=lambda: export.build_table_xlsx_bytes({"검증 결과": (issue_columns, upload_issues)}),
+                file_name=export.make_file_name(st.session_state.header["반"], "xlsx", prefix="업로드검증결과"),
+                mime=export.XLSX_MIME,
+                on_click="ignore",
+                key="upload_issues_download"
+            )
 
 # #############################################################################
 # ##########                       (수정된 부분 끝)                        ##########
@@ -257,54 +393,552 @@ if uploaded_file is not None and not st.session_state.file_processed:
 if st.session_state.file_processed:
     if st.sidebar.button("새 파일 업로드 준비"):
         st.session_state.file_processed = False
+        st.session_state.upload_report = None
+        st.session_state.upload_issues = None
         st.session_state.file_uploader = None # uploader 상태도 초기화
-        st.rerun()
+        rerun()
+
+# 자동 저장 및 저장된 작업 이어서 하기 (엑셀을 다시 올리지 않고 저장소에서 바로 불러옴)
+autosave_enabled = st.sidebar.checkbox(
+    "💾 변경 내용 자동 저장",
+    value=store.AUTOSAVE_ENABLED,
+    key="autosave_enabled",
+    help=f"바뀐 단위작업과 유해요인 항목만 로컬 저장소({store.AUTOSAVE_PATH})에 기록합니다. "
+         "저장된 작업은 지금 주소(?ws=...)로 연 화면에서만 보이므로 이어서 하려면 주소를 북마크해 두세요."
+)
+
+# 자동 저장 (unit_indices의 단위작업만 비교, None이면 전체 비교), 내용이 없는 새 작업은 저장하지 않음
+# 반환값: 실패한 경우 오류 메시지
+def autosave(unit_indices=None):
+    autosave_tracker = st.session_state.autosave_tracker
+    if not autosave_enabled or not (autosave_tracker.started or any(st.session_state.header.values()) or any(
+        unit.get("단위작업명") or unit.get("작업내용(상세설명)") for unit in st.session_state.task_units
+    )):
+        return None
+    try:
+        autosave_tracker.save(
+            store.autosave_store,
+            st.session_state.header,
+            st.session_state.task_units[:st.session_state.unit_count],
+            unit_indices
+        )
+    except sqlite3.Error as e:
+        return str(e)
+    return None
+
+st.sidebar.checkbox(
+    "📝 입력 양식 모드",
+    key="form_input_mode",
+    help="입력칸을 바꿀 때마다 다시 실행하지 않고 단위작업/유해요인 항목별 '적용' 버튼을 누를 때 한 번에 반영합니다. "
+         "(유형·부담작업 선택과 이 작업시간 자동계산은 바로 반영)"
+)
+
+with st.sidebar.expander("📂 저장된 작업 이어서 하기"):
+    try:
+        saved_workspaces = [
+            workspace for workspace in store.autosave_store.list_workspaces(st.session_state.workspace_owner)
+            if workspace["workspace_id"] != st.session_state.autosave_tracker.workspace_id
+        ]
+    except sqlite3.Error as e:
+        saved_workspaces = []
+        st.warning(f"저장소를 열 수 없습니다: {e}")
+
+    if saved_workspaces:
+        selected_workspace = st.selectbox(
+            "저장된 작업",
+            saved_workspaces,
+            format_func=lambda workspace: (
+                f"{workspace['반'] or '미정반'} · {workspace['소속'] or '-'} · {workspace['회사명'] or '-'} "
+                f"({workspace['단위작업 수']}개, {time.strftime('%m-%d %H:%M', time.localtime(workspace['저장 시각']))})"
+            ),
+            key="resume_workspace"
+        )
+        col_resume, col_delete_saved = st.columns(2)
+        if col_delete_saved.button("삭제", key="delete_workspace_button"):
+            # 저장소에서 작업을 지움 (현재 작업은 목록에 없으므로 지울 수 없음, 다른 브라우저의 작업은 지우지 않음)
+            try:
+                store.autosave_store.delete_workspace(selected_workspace["workspace_id"], st.session_state.workspace_owner)
+            except sqlite3.Error as e:
+                st.warning(f"저장된 작업을 삭제할 수 없습니다: {e}")
+            else:
+                rerun()
+        if col_resume.button("불러오기", key="resume_workspace_button"):
+            saved_header, saved_task_units = store.autosave_store.load_workspace(
+                selected_workspace["workspace_id"], st.session_state.workspace_owner
+            )
+            set_header(saved_header)
+            # 예전 자동 저장처럼 단위작업마다 복사된 머리글 값은 지움
+            st.session_state.task_units = strip_header(saved_task_units, saved_header) or [create_default_unit()]
+            st.session_state.unit_count = len(st.session_state.task_units)
+            st.session_state.unit_page = 1
+            # 불러온 작업에 이어서 저장
+            st.session_state.autosave_tracker = store.WorkspaceTracker.from_loaded(
+                st.session_state.workspace_owner, selected_workspace["workspace_id"], saved_header, st.session_state.task_units
+            )
+            st.session_state.autosave_full_sync = True
+            st.session_state.exposure_summary = summary.ExposureSummary()
+            st.session_state.shared_unit_ids = set()
+            rerun()
+    else:
+        st.caption("이 주소(?ws=...)로 저장된 다른 작업이 없습니다.")
 
 # --- 이하 코드는 기존과 동일 ---
 
 # 회사 정보 입력
-new_group_name = st.text_input("회사명을 입력하세요", value=st.session_state.group_name, key="input_group_name")
-new_소속 = st.text_input("소속/팀/그룹", value=st.session_state.소속, key="input_affiliation")
-new_반 = st.text_input("반", value=st.session_state.반, key="input_class")
-
-# 회사 정보가 변경되면 모든 단위작업에 반영
-if (new_group_name != st.session_state.group_name or 
-    new_소속 != st.session_state.소속 or 
-    new_반 != st.session_state.반):
-    
-    st.session_state.group_name = new_group_name
-    st.session_state.소속 = new_소속
-    st.session_state.반 = new_반
-    
-    # 모든 기존 단위작업에 새 회사 정보 적용
-    for unit in st.session_state.task_units:
-        unit["회사명"] = st.session_state.group_name
-        unit["소속"] = st.session_state.소속
-        unit["반"] = st.session_state.반
+profile.lap("회사 정보")
+new_header = {
+    "회사명": st.text_input("회사명을 입력하세요", key="input_group_name"),
+    "소속": st.text_input("소속/팀/그룹", key="input_affiliation"),
+    "반": st.text_input("반", key="input_class")
+}
+
+# 회사 정보는 머리글에만 저장 (단위작업에는 복사하지 않고 내보낼 때 합침, 자동 저장은 머리글 변경을 따로 기록)
+if new_header != st.session_state.header:
+    st.session_state.header = new_header
 
 # 단위작업 추가 버튼
+profile.lap("단위작업 목록")
 col_unit_add_btn, _ = st.columns([0.2, 0.8])
 with col_unit_add_btn:
     if st.button("단위작업 추가", key="add_unit_button"):
         st.session_state.unit_count += 1
         new_unit = create_default_unit()
-        new_unit["회사명"] = st.session_state.group_name
-        new_unit["소속"] = st.session_state.소속
-        new_unit["반"] = st.session_state.반
         st.session_state.task_units.append(new_unit)
-        st.rerun()
+        st.session_state.exposure_summary.update(new_unit)
+        # 추가한 단위작업이 있는 마지막 페이지로 이동
+        st.session_state.unit_page = page_count_for(st.session_state.unit_count, st.session_state.units_per_page)
+        rerun()
+
+# 단위작업 목록 요약 (이름, 작업자 수, 부담작업 판정만 표시하는 가벼운 표)
+def unit_summary_row(i, unit):
+    header = st.session_state.header
+    summary_row = {"번호": i + 1, "소속": unit.get("소속", header["소속"]), "반": unit.get("반", header["반"]), "단위작업명": unit.get("단위작업명", ""), "작업자 수": unit.get("작업자 수", 1)}
+    for k in range(1, 13):
+        summary_row[f"{k}호"] = unit.get(f"부담작업_{k}호", "X")
+    return summary_row
+
+# 단위작업 목록 표와 부담작업 요약은 따로 조각(st.fragment)으로 그려서, 단위작업 입력에서 요약에 보이는 값을 바꾸면
+# 전체를 다시 실행하지 않고 입력한 조각과 이 조각만 다시 실행함 (rerun_with_summary)
+# 표에서 행을 고르면 입력 폼의 페이지를 바꿔야 하므로 전체를 다시 실행
+UNIT_SUMMARY_FRAGMENT = "unit_summary"
+
+def render_unit_summary():
+    started = time.perf_counter()
+    st.session_state.unit_summary_queued = False
+    st.subheader("단위작업 목록")
+    unit_summary_rows = []
+    unit_sources = set()
+    for i, unit in enumerate(st.session_state.task_units[:st.session_state.unit_count]):
+        summary_row = unit_summary_row(i, unit)
+        unit_summary_rows.append(summary_row)
+        unit_sources.add((summary_row["소속"], summary_row["반"]))
+
+    # 소속/반은 여러 파일을 합쳐 서로 다를 때만 표시
+    unit_summary_df = pd.DataFrame(unit_summary_rows)
+    if len(unit_sources) <= 1:
+        unit_summary_df = unit_summary_df.drop(columns=["소속", "반"], errors="ignore")
+
+    unit_summary_selection = st.dataframe(
+        unit_summary_df,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key="unit_summary_table"
+    )
+    selected_rows = unit_summary_selection.selection.rows
+    selected_unit = selected_rows[0] if selected_rows else None
+    if profiling.is_fragment_rerun() and selected_unit != st.session_state.last_selected_unit:
+        rerun()
+
+    # 부담작업 요약 (관리자 검토용, 호별 해당/의심 단위작업 수와 작업자 수)
+    profile.lap("부담작업 요약")
+    # 요약은 판정이 바뀐 단위작업의 기여분만 갱신하므로 여기서는 표시만 하고,
+    # 업로드/불러오기 직후처럼 요약에 없는 단위작업이 있을 때만 전체를 다시 계산
+    exposure_summary = st.session_state.exposure_summary
+    if len(exposure_summary) != st.session_state.unit_count:
+        exposure_summary.rebuild(st.session_state.task_units[:st.session_state.unit_count])
+
+    with st.expander("📊 부담작업 요약"):
+        burden_rows = exposure_summary.burden_rows(st.session_state.header)
+        any_burden_row = burden_rows[-1]
+        col_exposure_o, col_exposure_t = st.columns(2)
+        col_exposure_o.metric(
+            "부담작업 해당(O) 단위작업",
+            f"{any_burden_row['해당(O) 단위작업 수']}개",
+            f"작업자 {any_burden_row['해당(O) 작업자 수']}명",
+            delta_color="off"
+        )
+        col_exposure_t.metric(
+            "부담작업 의심(△) 단위작업",
+            f"{any_burden_row['의심(△) 단위작업 수']}개",
+            f"작업자 {any_burden_row['의심(△) 작업자 수']}명",
+            delta_color="off"
+        )
+        st.dataframe(pd.DataFrame(burden_rows, columns=summary.SUMMARY_COLUMNS), hide_index=True)
+        st.caption(f"'{summary.ANY_BURDEN}' 행은 1~12호 중 하나라도 해당/의심인 단위작업입니다. (해당(O)이 하나라도 있으면 해당으로 셈)")
+
+        # 피벗 파일 (호별 요약 + 소속/반별 요약 시트), 버튼을 눌렀을 때만 생성
+        summary_header = dict(st.session_state.header)
+
+        def build_summary_bytes():
+            return export.build_table_xlsx_bytes({
+                "부담작업 요약": (summary.SUMMARY_COLUMNS, exposure_summary.burden_rows(summary_header)),
+                "소속·반별 요약": (summary.GROUP_SUMMARY_COLUMNS, exposure_summary.group_rows(summary_header)),
+            })
+
+        st.download_button(
+            label="📥 부담작업 요약 다운로드",
+            data=build_summary_bytes,
+            file_name=export.make_file_name(summary_header["반"], "xlsx", prefix="부담작업요약"),
+            mime=export.XLSX_MIME,
+            on_click="ignore",
+            key="exposure_summary_download"
+        )
+
+    if profile.enabled and profiling.is_fragment_rerun():
+        profiling.log_fragment(profile.session_id, "단위작업 목록", time.perf_counter() - started)
+    return selected_unit
+
+selected_unit = st.fragment(render_unit_summary, key=UNIT_SUMMARY_FRAGMENT)()
+
+# 페이지 선택 (표에서 행을 선택하면 해당 단위작업이 있는 페이지로 이동)
+col_units_per_page, col_unit_page, _ = st.columns([0.2, 0.2, 0.6])
+with col_units_per_page:
+    units_per_page = st.selectbox("페이지당 단위작업 수", UNITS_PER_PAGE_OPTIONS, key="units_per_page")
+page_count = page_count_for(st.session_state.unit_count, units_per_page)
+
+if selected_unit is not None and selected_unit != st.session_state.last_selected_unit:
+    st.session_state.unit_page = selected_unit // units_per_page + 1
+st.session_state.last_selected_unit = selected_unit
+st.session_state.unit_page = min(max(st.session_state.unit_page, 1), page_count)
+
+with col_unit_page:
+    unit_page = st.number_input("페이지", min_value=1, max_value=page_count, step=1, key="unit_page", help=f"전체 {page_count} 페이지")
+
+page_start = (unit_page - 1) * units_per_page
+page_end = min(st.session_state.unit_count, page_start + units_per_page)
+
+# 단위작업 입력 폼 (현재 페이지의 단위작업만)
+# 단위작업 하나와 그 안의 유해요인 항목 하나가 각각 조각(st.fragment)이라, 입력을 바꾸면 해당 조각만 다시 실행된다.
+# 조각만 다시 실행된 경우 그 단위작업만 판정/자동 저장하고, 요약 표에 보이는 값을 바꾸는 입력칸은 요약 조각도 함께 다시 실행한다.
+# (다운로드 파일은 버튼을 누를 때 세션의 단위작업 목록으로 만들므로 항상 최신 내용)
+profile.lap("단위작업 입력")
+
+# 입력 양식 모드이면 입력칸을 모을 st.form, 아니면 st (입력칸을 바꿀 때마다 바로 반영)
+def field_form(form_key):
+    return st.form(form_key) if st.session_state.get("form_input_mode") else st
+
+# 유해요인 항목용: (바로 반영할 선택 항목 영역, 입력칸 영역), 입력 양식 모드에서는 선택 항목을 양식 위에 그림
+def field_containers(form_key):
+    if not st.session_state.get("form_input_mode"):
+        return st, st
+    return st.container(), field_form(form_key)
+
+def submit_fields(fields, label, fragment_key=None):
+    if fields is not st:
+        if fragment_key is None:
+            fields.form_submit_button(label)
+        else:
+            fields.form_submit_button(label, on_click=rerun_with_summary, args=(fragment_key,))
+
+# 단위작업/유해요인 항목 조각의 key (조각마다 달라야 rerun_with_summary에서 그 조각만 다시 실행)
+def unit_fragment_key(i):
+    return f"unit_editor_{i}"
+
+def hazard_fragment_key(i, k):
+    return f"hazard_editor_{i}_{k}"
+
+# 요약 표에 보이는 값(단위작업명, 작업자 수, 부담작업 판정)을 바꿀 수 있는 입력칸의 콜백
+# 입력한 조각을 먼저, 그다음 요약 조각을 다시 실행 (조각 key를 주는 st.rerun은 콜백에서만 가능)
+def rerun_with_summary(fragment_key):
+    st.session_state.unit_summary_queued = True
+    st.rerun([fragment_key, UNIT_SUMMARY_FRAGMENT])
+
+# 입력칸에 넘길 콜백 인자 (입력 양식(st.form) 안의 입력칸은 콜백을 둘 수 없으므로 '적용' 버튼에서 처리, submit_fields)
+def summary_callback(fragment_key, container=st):
+    if container is not st:
+        return {}
+    return {"on_change": rerun_with_summary, "args": (fragment_key,)}
+
+# 지금 입력 폼을 그리고 있는 단위작업 (유해요인 항목 조각이 단위작업 조각 안에서 실행되는지, 혼자 다시 실행되는지 구분)
+units_rendering = set()
+
+# 다운로드 파일을 작업 스레드에서 만들기 시작
+# 단위작업은 복사하지 않고 작업과 함께 쓰는 것으로 표시해 두어, 만드는 동안 고치는 단위작업만 복사됨 (own_unit)
+EXPORT_POLL_SECONDS = 0.5
+EXPORT_STALE_NOTICE = "작업목록 내용이나 다운로드 형식이 바뀌어 이전에 만든(만들던) 파일을 취소했습니다. 다시 만들어 주세요."
+
+def start_export_job(task_units, export_format, split=False):
+    discard_export_job(None)
+    header = dict(st.session_state.header)
+    st.session_state.shared_unit_ids.update(id(unit) for unit in task_units)
+    st.session_state.export_job = jobs.ExportJob(
+        list(task_units),
+        export_format,
+        header=header,
+        session_id=profile.session_id if profile.enabled else None,
+        split=split
+    )
+    st.session_state.export_job_source = (st.session_state.task_units, header)
+
+def discard_export_job(notice):
+    if st.session_state.export_job is not None:
+        st.session_state.export_job.cancel()
+    st.session_state.export_job = None
+    st.session_state.export_job_source = None
+    st.session_state.export_notice = notice
+
+# 내보내기 작업의 복사본이 지금 내용과 다른지 (목록/머리글/형식/나누기가 바뀌었거나 unit_indices의 단위작업 내용이 다르면 참)
+# 입력은 현재 페이지(또는 방금 다시 실행된 조각)의 단위작업만 바꿀 수 있으므로 그 단위작업만 비교
+def export_job_stale(unit_indices, export_format=None, split=None):
+    export_job = st.session_state.export_job
+    source_task_units, source_header = st.session_state.export_job_source
+    if (source_task_units is not st.session_state.task_units or source_header != st.session_state.header
+            or export_job.total_units != st.session_state.unit_count
+            or (export_format is not None and export_job.file_format != export_format)
+            or (split is not None and export_job.split != split)):
+        return True
+    return any(
+        st.session_state.task_units[i] != export_job.task_units[i]
+        for i in unit_indices if i < export_job.total_units
+    )
+
+# 내보내기 작업 상태 (만드는 동안에는 조각만 주기적으로 다시 실행해 진행률을 갱신)
+def render_export_job():
+    if st.session_state.export_notice:
+        st.info(st.session_state.export_notice)
+        st.session_state.export_notice = None
+    export_job = st.session_state.export_job
+    if export_job is None:
+        return
+    if export_job.running:
+        st.progress(
+            export_job.progress,
+            text=f"다운로드 파일 만드는 중... ({export_job.done_units} / {export_job.total_units} 단위작업)"
+        )
+        if st.button("취소", key="export_cancel_button"):
+            discard_export_job("다운로드 파일 만들기를 취소했습니다.")
+            rerun()
+        return
+    # 다 만들어졌으면 주기적인 다시 실행을 멈추도록 전체를 한 번 다시 실행
+    if profiling.is_fragment_rerun():
+        rerun()
+    if export_job.error() is not None:
+        st.error(f"다운로드 파일을 만들지 못했습니다: {export_job.error()}")
+        return
+    export_header = st.session_state.export_job_source[1]
+    st.download_button(
+        label="📥 작업목록표 다운로드 (소속/반별 zip)" if export_job.split else "📥 작업목록표 다운로드",
+        data=export_job.result(),
+        file_name=export.make_file_name(export_header["반"], export_job.file_format, split=export_job.split),
+        mime=export.ZIP_MIME if export_job.split else export.EXPORT_FORMATS[export_job.file_format][2],
+        on_click="ignore",
+        key="export_download_button"
+    )
+
+# 단위작업 판정을 갱신하고 부담작업 요약에서는 이 단위작업의 기여분만 바꿈
+def judge_unit(unit_data):
+    criteria.update_burden_criteria(unit_data)
+    st.session_state.exposure_summary.update(unit_data)
+
+# 혼자 다시 실행된 조각의 마무리: 자동 저장, 측정 로그
+# 요약 표 값이 바뀌었는데 요약 조각이 함께 다시 실행되지 않는 경우(콜백이 없는 입력칸)에만 전체 다시 실행
+def finish_fragment_run(i, unit_data, summary_before, started, fragment_name):
+    autosave_error = autosave([i])
+    if autosave_error:
+        st.warning(f"자동 저장 실패: {autosave_error}")
+    if st.session_state.export_job is not None and export_job_stale([i]):
+        discard_export_job(EXPORT_STALE_NOTICE)
+    if profile.enabled:
+        profiling.log_fragment(profile.session_id, fragment_name, time.perf_counter() - started, unit=i + 1)
+    if unit_summary_row(i, unit_data) != summary_before and not st.session_state.get("unit_summary_queued"):
+        rerun()
+
+def render_hazard_editor(i, k):
+    started = time.perf_counter()
+    fragment_key = hazard_fragment_key(i, k)
+    unit_data = own_unit(i)
+    current_hazard_analysis_data = unit_data.get("유해요인_원인분석", [])
+    hazard_entry = current_hazard_analysis_data[k]
+    summary_before = unit_summary_row(i, unit_data)
+
+    st.markdown(f"**유해요인 원인분석 항목 {k+1}**")
+    
+    hazard_type_options = ["", "반복동작", "부자연스러운 자세", "과도한 힘", "접촉스트레스 또는 기타(진동, 밀고 당기기 등)"]
+    selected_hazard_type_index = hazard_type_options.index(hazard_entry.get("유형", "")) if hazard_entry.get("유형", "") in hazard_type_options else 0
+    
+    hazard_entry["유형"] = st.selectbox(
+        f"[{i+1}-{k+1}] 유해요인 유형 선택", 
+        hazard_type_options, 
+        index=selected_hazard_type_index, 
+        key=f"hazard_type_{i}_{k}",
+        **summary_callback(fragment_key)
+    )
+
+    # 입력 양식 모드에서는 아래에 나올 입력칸을 정하는 선택 항목과 자동계산 입력은 controls에 두어 바로 반영하고,
+    # 나머지 입력칸은 fields(st.form)에 모아 '적용' 버튼을 누를 때 한 번에 반영
+    controls, fields = field_containers(f"hazard_form_{i}_{k}") if hazard_entry["유형"] else (st, st)
+
+    # 각 유해요인 유형별 세부 입력 필드들
+    if hazard_entry["유형"] == "반복동작":
+        burden_task_options = BURDEN_OPTIONS[HAZARD_TYPE_REPEAT]
+        selected_burden_task_index = burden_task_options.index(hazard_entry.get("부담작업", "")) if hazard_entry.get("부담작업", "") in burden_task_options else 0
+        hazard_entry["부담작업"] = controls.selectbox(f"[{i+1}-{k+1}] 부담작업", burden_task_options, index=selected_burden_task_index, key=f"burden_task_반복_{i}_{k}", **summary_callback(fragment_key))
+        
+        hazard_entry["수공구 종류"] = fields.text_input(f"[{i+1}-{k+1}] 수공구 종류", value=hazard_entry.get("수공구 종류", ""), key=f"수공구_종류_{i}_{k}")
+        hazard_entry["수공구 용도"] = fields.text_input(f"[{i+1}-{k+1}] 수공구 용도", value=hazard_entry.get("수공구 용도", ""), key=f"수공구_용도_{i}_{k}")
+        hazard_entry["수공구 무게(kg)"] = fields.number_input(f"[{i+1}-{k+1}] 수공구 무게(kg)", value=input_number(hazard_entry.get("수공구 무게(kg)", 0.0), 0.0, kind="kg"), key=f"수공구_무게_{i}_{k}")
+        hazard_entry["수공구 사용시간(분)"] = fields.text_input(f"[{i+1}-{k+1}] 수공구 사용시간(분)", value=hazard_entry.get("수공구 사용시간(분)", ""), key=f"수공구_사용시간_{i}_{k}")
+        hazard_entry["부담부위"] = fields.text_input(f"[{i+1}-{k+1}] 부담부위", value=hazard_entry.get("부담부위", ""), key=f"부담부위_{i}_{k}")
+        
+        # 이 작업시간 자동 계산을 위한 입력 필드
+        회당_반복시간_초_회 = controls.text_input(f"[{i+1}-{k+1}] 회당 반복시간(초/회)", value=hazard_entry.get("회당 반복시간(초/회)", ""), key=f"반복_회당시간_{i}_{k}", **summary_callback(fragment_key))
+        작업시간동안_반복횟수_회_일 = controls.text_input(f"[{i+1}-{k+1}] 작업시간동안 반복횟수(회/일)", value=hazard_entry.get("작업시간동안 반복횟수(회/일)", ""), key=f"반복_이횟수_{i}_{k}", **summary_callback(fragment_key))
+        
+        hazard_entry["회당 반복시간(초/회)"] = 회당_반복시간_초_회
+        hazard_entry["작업시간동안 반복횟수(회/일)"] = 작업시간동안_반복횟수_회_일
+
+        # 이 작업시간(분) 자동 계산 (회당 반복시간은 초 단위로 환산, 예: "1분" -> 60초)
+        calculated_total_work_time = 0.0
+        parsed_회당_반복시간, _ = parse_number(회당_반복시간_초_회, "초")
+        parsed_작업시간동안_반복횟수, _ = parse_number(작업시간동안_반복횟수_회_일, "회")
+        if parsed_회당_반복시간 > 0 and parsed_작업시간동안_반복횟수 > 0:
+            calculated_total_work_time = (parsed_회당_반복시간 * parsed_작업시간동안_반복횟수) / 60
+
+        # key가 있는 입력칸은 value를 바꿔도 이전 입력값이 유지되므로 계산값은 위젯 상태로 넣음
+        work_time_key = f"반복_이시간_{i}_{k}"
+        if calculated_total_work_time > 0:
+            st.session_state[work_time_key] = f"{calculated_total_work_time:.2f}"
+        elif work_time_key not in st.session_state:
+            st.session_state[work_time_key] = str(hazard_entry.get("이 작업시간(분)", ""))
+        hazard_entry["이 작업시간(분)"] = fields.text_input(
+            f"[{i+1}-{k+1}] 이 작업시간(분) (자동계산)",
+            key=work_time_key,
+            help="회당 반복시간과 반복횟수 입력 시 자동 계산됩니다.",
+            **summary_callback(fragment_key, fields)
+        )
+
+        # 10호 추가 필드
+        if "(10호)" in hazard_entry["부담작업"]:
+            hazard_entry["물체 무게(kg)_10호"] = fields.number_input(f"[{i+1}-{k+1}] (10호)물체 무게(kg)", value=input_number(hazard_entry.get("물체 무게(kg)_10호", 0.0), 0.0, kind="kg"), key=f"물체_무게_10호_{i}_{k}", **summary_callback(fragment_key, fields))
+            hazard_entry["분당 반복횟수(회/분)_10호"] = fields.text_input(f"[{i+1}-{k+1}] (10호)분당 반복횟수(회/분)", value=hazard_entry.get("분당 반복횟수(회/분)_10호", ""), key=f"분당_반복횟수_10호_{i}_{k}", **summary_callback(fragment_key, fields))
+        else:
+            hazard_entry.pop("물체 무게(kg)_10호", None)
+            hazard_entry.pop("분당 반복횟수(회/분)_10호", None)
+
+        # 12호 정적자세 관련 필드
+        if "(12호)정적자세" in hazard_entry["부담작업"]:
+            hazard_entry["작업내용_12호_정적"] = fields.text_input(f"[{i+1}-{k+1}] (정적자세)작업내용", value=hazard_entry.get("작업내용_12호_정적", ""), key=f"반복_작업내용_12호_정적_{i}_{k}")
+            hazard_entry["작업시간(분)_12호_정적"] = fields.number_input(f"[{i+1}-{k+1}] (정적자세)작업시간(분)", value=input_number(hazard_entry.get("작업시간(분)_12호_정적", 0), 0, kind="분"), key=f"반복_작업시간_12호_정적_{i}_{k}")
+            hazard_entry["휴식시간(분)_12호_정적"] = fields.number_input(f"[{i+1}-{k+1}] (정적자세)휴식시간(분)", value=input_number(hazard_entry.get("휴식시간(분)_12호_정적", 0), 0, kind="분"), key=f"반복_휴식시간_12호_정적_{i}_{k}")
+            hazard_entry["인체부담부위_12호_정적"] = fields.text_input(f"[{i+1}-{k+1}] (정적자세)인체부담부위", value=hazard_entry.get("인체부담부위_12호_정적", ""), key=f"반복_인체부담부위_12호_정적_{i}_{k}")
+        else:
+            hazard_entry.pop("작업내용_12호_정적", None)
+            hazard_entry.pop("작업시간(분)_12호_정적", None)
+            hazard_entry.pop("휴식시간(분)_12호_정적", None)
+            hazard_entry.pop("인체부담부위_12호_정적", None)
+
+    elif hazard_entry["유형"] == "부자연스러운 자세":
+        burden_pose_options = BURDEN_OPTIONS[HAZARD_TYPE_POSTURE]
+        selected_burden_pose_index = burden_pose_options.index(hazard_entry.get("부담작업자세", "")) if hazard_entry.get("부담작업자세", "") in burden_pose_options else 0
+        hazard_entry["부담작업자세"] = controls.selectbox(f"[{i+1}-{k+1}] 부담작업자세", burden_pose_options, index=selected_burden_pose_index, key=f"burden_pose_{i}_{k}", **summary_callback(fragment_key))
+        
+        hazard_entry["회당 반복시간(초/회)"] = fields.text_input(f"[{i+1}-{k+1}] 회당 반복시간(초/회)", value=hazard_entry.get("회당 반복시간(초/회)", ""), key=f"자세_회당시간_{i}_{k}")
+        hazard_entry["작업시간동안 반복횟수(회/일)"] = fields.text_input(f"[{i+1}-{k+1}] 작업시간동안 반복횟수(회/일)", value=hazard_entry.get("작업시간동안 반복횟수(회/일)", ""), key=f"자세_이횟수_{i}_{k}")
+        hazard_entry["이 작업시간(분)"] = fields.text_input(f"[{i+1}-{k+1}] 이 작업시간(분)", value=hazard_entry.get("이 작업시간(분)", ""), key=f"자세_이시간_{i}_{k}", **summary_callback(fragment_key, fields))
+
+    elif hazard_entry["유형"] == "과도한 힘":
+        burden_force_options = BURDEN_OPTIONS[HAZARD_TYPE_FORCE]
+        selected_burden_force_index = burden_force_options.index(hazard_entry.get("부담작업", "")) if hazard_entry.get("부담작업", "") in burden_force_options else 0
+        hazard_entry["부담작업"] = controls.selectbox(f"[{i+1}-{k+1}] 부담작업", burden_force_options, index=selected_burden_force_index, key=f"burden_force_{i}_{k}", **summary_callback(fragment_key))
+        
+        hazard_entry["중량물 명칭"] = fields.text_input(f"[{i+1}-{k+1}] 중량물 명칭", value=hazard_entry.get("중량물 명칭", ""), key=f"힘_중량물_명칭_{i}_{k}")
+        hazard_entry["중량물 용도"] = fields.text_input(f"[{i+1}-{k+1}] 중량물 용도", value=hazard_entry.get("중량물 용도", ""), key=f"힘_중량물_용도_{i}_{k}")
+        hazard_entry["중량물 무게(kg)"] = fields.number_input(f"[{i+1}-{k+1}] 중량물 무게(kg)", value=input_number(hazard_entry.get("중량물 무게(kg)", 0.0), 0.0, kind="kg"), key=f"중량물_무게_기본_{i}_{k}", **summary_callback(fragment_key, fields))
+        hazard_entry["하루 8시간동안 중량물을 드는 횟수(회)"] = fields.number_input(f"[{i+1}-{k+1}] 하루 8시간동안 중량물을 드는 횟수(회)", value=input_number(hazard_entry.get("하루 8시간동안 중량물을 드는 횟수(회)", 0), 0, min_value=0, kind="회"), min_value=0, step=1, key=f"중량물_횟수_{i}_{k}", **summary_callback(fragment_key, fields))
+        
+        취급방법_options = ["", "직접 취급", "크레인 사용"]
+        selected_취급방법_index = 취급방법_options.index(hazard_entry.get("취급방법", "")) if hazard_entry.get("취급방법", "") in 취급방법_options else 0
+        hazard_entry["취급방법"] = controls.selectbox(f"[{i+1}-{k+1}] 취급방법", 취급방법_options, index=selected_취급방법_index, key=f"힘_취급방법_{i}_{k}")
+
+        if hazard_entry["취급방법"] == "직접 취급":
+            이동방법_options = ["", "1인 직접이동", "2인1조 직접이동", "여러명 직접이동", "이동대차(인력이동)", "이동대차(전력이동)", "지게차"]
+            selected_이동방법_index = 이동방법_options.index(hazard_entry.get("중량물 이동방법", "")) if hazard_entry.get("중량물 이동방법", "") in 이동방법_options else 0
+            hazard_entry["중량물 이동방법"] = controls.selectbox(f"[{i+1}-{k+1}] 중량물 이동방법", 이동방법_options, index=selected_이동방법_index, key=f"힘_이동방법_{i}_{k}")
+            
+            if hazard_entry["중량물 이동방법"] == "이동대차(인력이동)":
+                직접_밀당_options = ["", "작업자가 직접 바퀴달린 이동대차를 밀고/당기기", "자동이동대차(AGV)", "기타"]
+                selected_직접_밀당_index = 직접_밀당_options.index(hazard_entry.get("작업자가 직접 밀고/당기기", "")) if hazard_entry.get("작업자가 직접 밀고/당기기", "") in 직접_밀당_options else 0
+                hazard_entry["작업자가 직접 밀고/당기기"] = controls.selectbox(f"[{i+1}-{k+1}] 작업자가 직접 밀고/당기기", 직접_밀당_options, index=selected_직접_밀당_index, key=f"힘_직접_밀당_{i}_{k}")
+                
+                if hazard_entry["작업자가 직접 밀고/당기기"] == "기타":
+                    hazard_entry["기타_밀당_설명"] = fields.text_input(f"[{i+1}-{k+1}] 기타 밀기/당기기 설명", value=hazard_entry.get("기타_밀당_설명", ""), key=f"힘_기타_밀당_설명_{i}_{k}")
+                else:
+                    hazard_entry.pop("기타_밀당_설명", None)
+            else:
+                hazard_entry.pop("작업자가 직접 밀고/당기기", None)
+                hazard_entry.pop("기타_밀당_설명", None)
+        else:
+            hazard_entry.pop("중량물 이동방법", None)
+            hazard_entry.pop("작업자가 직접 밀고/당기기", None)
+            hazard_entry.pop("기타_밀당_설명", None)
+        
+        # '밀기/당기기'가 포함된 경우 기존 필드값 초기화 불필요. 해당 작업도 중량물 정보를 가질 수 있음.
 
-# 단위작업 입력 폼
-for i in range(st.session_state.unit_count):
-    # 새로운 단위작업이 추가되었을 때 빈 데이터 구조로 초기화
-    if i >= len(st.session_state.task_units):
-        new_unit = create_default_unit()
-        new_unit["회사명"] = st.session_state.group_name
-        new_unit["소속"] = st.session_state.소속
-        new_unit["반"] = st.session_state.반
-        st.session_state.task_units.append(new_unit)
+    elif hazard_entry["유형"] == "접촉스트레스 또는 기타(진동, 밀고 당기기 등)":
+        burden_other_options = BURDEN_OPTIONS[HAZARD_TYPE_OTHER]
+        selected_burden_other_index = burden_other_options.index(hazard_entry.get("부담작업", "")) if hazard_entry.get("부담작업", "") in burden_other_options else 0
+        hazard_entry["부담작업"] = controls.selectbox(f"[{i+1}-{k+1}] 부담작업", burden_other_options, index=selected_burden_other_index, key=f"burden_other_{i}_{k}", **summary_callback(fragment_key))
+
+        if hazard_entry["부담작업"] == "(11호)하루에 이 2시간 이상 시간당 10회 이상 손 또는 무릎을 사용하여 반복적으로 충격을 가하는 작업":
+            hazard_entry["작업시간(분)"] = fields.text_input(f"[{i+1}-{k+1}] 작업시간(분)", value=hazard_entry.get("작업시간(분)", ""), key=f"기타_작업시간_{i}_{k}", **summary_callback(fragment_key, fields))
+        else:
+            hazard_entry.pop("작업시간(분)", None)
+
+        if hazard_entry["부담작업"] == "(12호)진동작업(그라인더, 임팩터 등)":
+            fields.markdown("**(12호) 세부 유형에 대한 추가 정보 (선택적 입력)**")
+            hazard_entry["진동수공구명"] = fields.text_input(f"[{i+1}-{k+1}] 진동수공구명", value=hazard_entry.get("진동수공구명", ""), key=f"기타_진동수공구명_{i}_{k}")
+            hazard_entry["진동수공구 용도"] = fields.text_input(f"[{i+1}-{k+1}] 진동수공구 용도", value=hazard_entry.get("진동수공구 용도", ""), key=f"기타_진동수공구_용도_{i}_{k}")
+            hazard_entry["작업시간(분)_진동"] = fields.text_input(f"[{i+1}-{k+1}] 작업시간(분)", value=hazard_entry.get("작업시간(분)_진동", ""), key=f"기타_작업시간_진동_{i}_{k}")
+            hazard_entry["작업빈도(초/회)_진동"] = fields.text_input(f"[{i+1}-{k+1}] 작업빈도(초/회)", value=hazard_entry.get("작업빈도(초/회)_진동", ""), key=f"기타_작업빈도_진동_{i}_{k}")
+            hazard_entry["작업량(회/일)_진동"] = fields.text_input(f"[{i+1}-{k+1}] 작업량(회/일)", value=hazard_entry.get("작업량(회/일)_진동", ""), key=f"기타_작업량_진동_{i}_{k}")
+            
+            지지대_options = ["", "예", "아니오"]
+            selected_지지대_index = 지지대_options.index(hazard_entry.get("수공구사용시 지지대가 있는가?", "")) if hazard_entry.get("수공구사용시 지지대가 있는가?", "") in 지지대_options else 0
+            hazard_entry["수공구사용시 지지대가 있는가?"] = fields.selectbox(f"[{i+1}-{k+1}] 수공구사용시 지지대가 있는가?", 지지대_options, index=selected_지지대_index, key=f"기타_지지대_여부_{i}_{k}")
+        else:
+            hazard_entry.pop("진동수공구명", None)
+            hazard_entry.pop("진동수공구 용도", None)
+            hazard_entry.pop("작업시간(분)_진동", None)
+            hazard_entry.pop("작업빈도(초/회)_진동", None)
+            hazard_entry.pop("작업량(회/일)_진동", None)
+            hazard_entry.pop("수공구사용시 지지대가 있는가?", None)
+
+
+    submit_fields(fields, f"[{i+1}-{k+1}] 항목 적용", fragment_key)
+
+    # 현재 항목의 변경사항을 unit_data에 반영
+    unit_data["유해요인_원인분석"][k] = hazard_entry
+
+    # 삭제 버튼 (첫 번째 항목은 삭제 불가)
+    if k > 0 or len(current_hazard_analysis_data) > 1:
+        col_delete_btn, _ = st.columns([0.2, 0.8])
+        with col_delete_btn:
+            if st.button(f"[{i+1}-{k+1}] 항목 삭제", key=f"delete_hazard_analysis_{i}_{k}"):
+                unit_data["유해요인_원인분석"].pop(k)
+                rerun()
+
+
+    # 이 항목만 다시 실행된 경우 단위작업 판정도 여기서 갱신
+    if i not in units_rendering:
+        judge_unit(unit_data)
+        finish_fragment_run(i, unit_data, summary_before, started, "유해요인 항목")
 
-    unit_data = st.session_state.task_units[i]
+def render_unit_editor(i):
+    started = time.perf_counter()
+    fragment_key = unit_fragment_key(i)
+    unit_data = own_unit(i)
+    summary_before = unit_summary_row(i, unit_data)
 
     with st.expander(f"단위작업공정 {i+1} 입력", expanded=True):
         # 단위작업 삭제 버튼 (첫 번째 작업은 삭제 불가)
@@ -312,29 +946,24 @@ for i in range(st.session_state.unit_count):
             col_delete, _ = st.columns([0.2, 0.8])
             with col_delete:
                 if st.button(f"작업 {i+1} 삭제", key=f"delete_unit_{i}"):
-                    st.session_state.task_units.pop(i)
+                    st.session_state.exposure_summary.remove(st.session_state.task_units.pop(i))
                     st.session_state.unit_count -= 1
-                    st.rerun()
+                    # 뒤쪽 단위작업의 위치가 모두 바뀌고 삭제한 단위작업도 저장소에서 지워야 하므로 전체 비교
+                    st.session_state.autosave_full_sync = True
+                    rerun()
         
-        # 기본 정보 입력 (회사 정보 자동 업데이트)
-        unit_data["회사명"] = st.session_state.group_name
-        unit_data["소속"] = st.session_state.소속
-        unit_data["반"] = st.session_state.반
-        
-        unit_data["단위작업명"] = st.text_input(f"[{i+1}] 단위작업명", value=unit_data.get("단위작업명", ""), key=f"작업명_{i}")
-        unit_data["작업내용(상세설명)"] = st.text_area(f"[{i+1}] 작업내용(상세설명)", value=unit_data.get("작업내용(상세설명)", ""), key=f"작업내용_{i}")
-        unit_data["작업자 수"] = st.number_input(f"[{i+1}] 단위작업별 작업근로자수", min_value=1, step=1, value=unit_data.get("작업자 수", 1), key=f"작업자수_{i}")
-        unit_data["작업자 이름"] = st.text_input(f"[{i+1}] 작업근로자 이름", value=unit_data.get("작업자 이름", ""), key=f"작업자이름_{i}")
+        # 입력 양식 모드에서는 기본 정보와 보호구/작성자 입력칸을 하나의 양식으로 모아 '적용' 버튼으로 반영
+        unit_fields = field_form(f"unit_form_{i}")
+
+        # 기본 정보 입력
+        unit_data["단위작업명"] = unit_fields.text_input(f"[{i+1}] 단위작업명", value=unit_data.get("단위작업명", ""), key=f"작업명_{i}", **summary_callback(fragment_key, unit_fields))
+        unit_data["작업내용(상세설명)"] = unit_fields.text_area(f"[{i+1}] 작업내용(상세설명)", value=unit_data.get("작업내용(상세설명)", ""), key=f"작업내용_{i}")
+        unit_data["작업자 수"] = unit_fields.number_input(f"[{i+1}] 단위작업별 작업근로자수", min_value=1, step=1, value=input_number(unit_data.get("작업자 수", 1), 1, min_value=1, kind="명"), key=f"작업자수_{i}", **summary_callback(fragment_key, unit_fields))
+        unit_data["작업자 이름"] = unit_fields.text_input(f"[{i+1}] 작업근로자 이름", value=unit_data.get("작업자 이름", ""), key=f"작업자이름_{i}")
         
         작업형태_options = ["주간", "교대"]
         current_작업형태_index = 작업형태_options.index(unit_data.get("작업형태", "주간")) if unit_data.get("작업형태", "주간") in 작업형태_options else 0
-        unit_data["작업형태"] = st.selectbox(f"[{i+1}] 작업형태", 작업형태_options, index=current_작업형태_index, key=f"작업형태_{i}")
-        
-        # 데이터 구조 유지
-        unit_data["1일 작업시간"] = 0
-        unit_data["자세"] = {}
-        unit_data["중량물"] = []
-        unit_data["도구"] = []
+        unit_data["작업형태"] = unit_fields.selectbox(f"[{i+1}] 작업형태", 작업형태_options, index=current_작업형태_index, key=f"작업형태_{i}")
 
         st.markdown("---")
         
@@ -344,416 +973,119 @@ for i in range(st.session_state.unit_count):
             st.subheader("작업별 유해요인에 대한 원인분석")
         with col_hazard_add_btn:
             if st.button(f"[{i+1}] 항목 추가", key=f"add_hazard_analysis_{i}"):
-                unit_data["유해요인_원인분석"].append({"유형": "", "부담작업": "", "부담작업자세": ""})
-                st.rerun()
+                unit_data["유해요인_원인분석"].append(new_hazard_entry())
+                rerun(scope="fragment")
         
         current_hazard_analysis_data = unit_data.get("유해요인_원인분석", [])
         
-        # 유해요인 원인분석 항목들 처리
-        for k, hazard_entry in enumerate(current_hazard_analysis_data):
-            st.markdown(f"**유해요인 원인분석 항목 {k+1}**")
-            
-            hazard_type_options = ["", "반복동작", "부자연스러운 자세", "과도한 힘", "접촉스트레스 또는 기타(진동, 밀고 당기기 등)"]
-            selected_hazard_type_index = hazard_type_options.index(hazard_entry.get("유형", "")) if hazard_entry.get("유형", "") in hazard_type_options else 0
-            
-            hazard_entry["유형"] = st.selectbox(
-                f"[{i+1}-{k+1}] 유해요인 유형 선택", 
-                hazard_type_options, 
-                index=selected_hazard_type_index, 
-                key=f"hazard_type_{i}_{k}"
-            )
-
-            # 각 유해요인 유형별 세부 입력 필드들
-            if hazard_entry["유형"] == "반복동작":
-                burden_task_options = [
-                    "",
-                    "(1호)하루에 4시간 이상 집중적으로 자료입력 등을 위해 키보드 또는 마우스를 조작하는 작업",
-                    "(2호)하루에 이 2시간 이상 목, 어깨, 팔꿈치, 손목 또는 손을 사용하여 같은 동작을 반복하는 작업",
-                    "(6호)하루에 이 2시간 이상 지지되지 않은 상태에서 1kg 이상의 물건을 한손의 손가락으로 집어 옮기거나, 2kg 이상에 상당하는 힘을 가하여 한손의 손가락으로 물건을 쥐는 작업",
-                    "(7호)하루에 이 2시간 이상 지지되지 않은 상태에서 4.5kg 이상의 물건을 한 손으로 들거나 동일한 힘으로 쥐는 작업",
-                    "(10호)하루에 이 2시간 이상, 분당 2회 이상 4.5kg 이상의 물체를 드는 작업",
-                    "(1호)하루에 4시간 이상 집중적으로 자료입력 등을 위해 키보드 또는 마우스를 조작하는 작업+(12호)정적자세(장시간 서서 작업, 또는 장시간 앉아서 작업)",
-                    "(2호)하루에 이 2시간 이상 목, 어깨, 팔꿈치, 손목 또는 손을 사용하여 같은 동작을 반복하는 작업+(12호)정적자세(장시간 서서 작업, 또는 장시간 앉아서 작업)",
-                    "(6호)하루에 이 2시간 이상 지지되지 않은 상태에서 1kg 이상의 물건을 한손의 손가락으로 집어 옮기거나, 2kg 이상에 상당하는 힘을 가하여 한손의 손가락으로 물건을 쥐는 작업+(12호)정적자세(장시간 서서 작업, 또는 장시간 앉아서 작업)",
-                    "(7호)하루에 이 2시간 이상 지지되지 않은 상태에서 4.5kg 이상의 물건을 한 손으로 들거나 동일한 힘으로 쥐는 작업+(12호)정적자세(장시간 서서 작업, 또는 장시간 앉아서 작업)",
-                    "(10호)하루에 이 2시간 이상, 분당 2회 이상 4.5kg 이상의 물체를 드는 작업+(12호)정적자세(장시간 서서 작업, 또는 장시간 앉아서 작업)"
-                ]
-                selected_burden_task_index = burden_task_options.index(hazard_entry.get("부담작업", "")) if hazard_entry.get("부담작업", "") in burden_task_options else 0
-                hazard_entry["부담작업"] = st.selectbox(f"[{i+1}-{k+1}] 부담작업", burden_task_options, index=selected_burden_task_index, key=f"burden_task_반복_{i}_{k}")
-                
-                hazard_entry["수공구 종류"] = st.text_input(f"[{i+1}-{k+1}] 수공구 종류", value=hazard_entry.get("수공구 종류", ""), key=f"수공구_종류_{i}_{k}")
-                hazard_entry["수공구 용도"] = st.text_input(f"[{i+1}-{k+1}] 수공구 용도", value=hazard_entry.get("수공구 용도", ""), key=f"수공구_용도_{i}_{k}")
-                hazard_entry["수공구 무게(kg)"] = st.number_input(f"[{i+1}-{k+1}] 수공구 무게(kg)", value=hazard_entry.get("수공구 무게(kg)", 0.0), key=f"수공구_무게_{i}_{k}")
-                hazard_entry["수공구 사용시간(분)"] = st.text_input(f"[{i+1}-{k+1}] 수공구 사용시간(분)", value=hazard_entry.get("수공구 사용시간(분)", ""), key=f"수공구_사용시간_{i}_{k}")
-                hazard_entry["부담부위"] = st.text_input(f"[{i+1}-{k+1}] 부담부위", value=hazard_entry.get("부담부위", ""), key=f"부담부위_{i}_{k}")
-                
-                # 이 작업시간 자동 계산을 위한 입력 필드
-                회당_반복시간_초_회 = st.text_input(f"[{i+1}-{k+1}] 회당 반복시간(초/회)", value=hazard_entry.get("회당 반복시간(초/회)", ""), key=f"반복_회당시간_{i}_{k}")
-                작업시간동안_반복횟수_회_일 = st.text_input(f"[{i+1}-{k+1}] 작업시간동안 반복횟수(회/일)", value=hazard_entry.get("작업시간동안 반복횟수(회/일)", ""), key=f"반복_이횟수_{i}_{k}")
-                
-                hazard_entry["회당 반복시간(초/회)"] = 회당_반복시간_초_회
-                hazard_entry["작업시간동안 반복횟수(회/일)"] = 작업시간동안_반복횟수_회_일
-
-                # 이 작업시간(분) 자동 계산
-                calculated_total_work_time = 0.0
-                try:
-                    parsed_회당_반복시간 = parse_value(회당_반복시간_초_회, val_type=float)
-                    parsed_작업시간동안_반복횟수 = parse_value(작업시간동안_반복횟수_회_일, val_type=float)
-                    
-                    if parsed_회당_반복시간 > 0 and parsed_작업시간동안_반복횟수 > 0:
-                        calculated_total_work_time = (parsed_회당_반복시간 * parsed_작업시간동안_반복횟수) / 60
-                except Exception:
-                    pass
-
-                hazard_entry["이 작업시간(분)"] = st.text_input(
-                    f"[{i+1}-{k+1}] 이 작업시간(분) (자동계산)",
-                    value=f"{calculated_total_work_time:.2f}" if calculated_total_work_time > 0 else hazard_entry.get("이 작업시간(분)", ""),
-                    key=f"반복_이시간_{i}_{k}",
-                    help="회당 반복시간과 반복횟수 입력 시 자동 계산됩니다."
-                )
-
-                # 10호 추가 필드
-                if "(10호)" in hazard_entry["부담작업"]:
-                    hazard_entry["물체 무게(kg)_10호"] = st.number_input(f"[{i+1}-{k+1}] (10호)물체 무게(kg)", value=hazard_entry.get("물체 무게(kg)_10호", 0.0), key=f"물체_무게_10호_{i}_{k}")
-                    hazard_entry["분당 반복횟수(회/분)_10호"] = st.text_input(f"[{i+1}-{k+1}] (10호)분당 반복횟수(회/분)", value=hazard_entry.get("분당 반복횟수(회/분)_10호", ""), key=f"분당_반복횟수_10호_{i}_{k}")
-                else:
-                    hazard_entry.pop("물체 무게(kg)_10호", None)
-                    hazard_entry.pop("분당 반복횟수(회/분)_10호", None)
-
-                # 12호 정적자세 관련 필드
-                if "(12호)정적자세" in hazard_entry["부담작업"]:
-                    hazard_entry["작업내용_12호_정적"] = st.text_input(f"[{i+1}-{k+1}] (정적자세)작업내용", value=hazard_entry.get("작업내용_12호_정적", ""), key=f"반복_작업내용_12호_정적_{i}_{k}")
-                    hazard_entry["작업시간(분)_12호_정적"] = st.number_input(f"[{i+1}-{k+1}] (정적자세)작업시간(분)", value=hazard_entry.get("작업시간(분)_12호_정적", 0), key=f"반복_작업시간_12호_정적_{i}_{k}")
-                    hazard_entry["휴식시간(분)_12호_정적"] = st.number_input(f"[{i+1}-{k+1}] (정적자세)휴식시간(분)", value=hazard_entry.get("휴식시간(분)_12호_정적", 0), key=f"반복_휴식시간_12호_정적_{i}_{k}")
-                    hazard_entry["인체부담부위_12호_정적"] = st.text_input(f"[{i+1}-{k+1}] (정적자세)인체부담부위", value=hazard_entry.get("인체부담부위_12호_정적", ""), key=f"반복_인체부담부위_12호_정적_{i}_{k}")
-                else:
-                    hazard_entry.pop("작업내용_12호_정적", None)
-                    hazard_entry.pop("작업시간(분)_12호_정적", None)
-                    hazard_entry.pop("휴식시간(분)_12호_정적", None)
-                    hazard_entry.pop("인체부담부위_12호_정적", None)
-
-            elif hazard_entry["유형"] == "부자연스러운 자세":
-                burden_pose_options = [
-                    "",
-                    "(3호)하루에 이 2시간 이상 머리 위에 손이 있거나, 팔꿈치가 어깨위에 있거나, 팔꿈치를 몸통으로부터 들거나, 팔꿈치를 몸통뒤쪽에 위치하도록 하는 상태에서 이루어지는 작업",
-                    "(4호)지지되지 않은 상태이거나 임의로 자세를 바꿀 수 없는 조건에서, 하루에 이 2시간 이상 목이나 허리를 구부리거나 트는 상태에서 이루어지는 작업",
-                    "(5호)하루에 이 2시간 이상 쪼그리고 앉거나 무릎을 굽힌 자세에서 이루어지는 작업"
-                ]
-                selected_burden_pose_index = burden_pose_options.index(hazard_entry.get("부담작업자세", "")) if hazard_entry.get("부담작업자세", "") in burden_pose_options else 0
-                hazard_entry["부담작업자세"] = st.selectbox(f"[{i+1}-{k+1}] 부담작업자세", burden_pose_options, index=selected_burden_pose_index, key=f"burden_pose_{i}_{k}")
-                
-                hazard_entry["회당 반복시간(초/회)"] = st.text_input(f"[{i+1}-{k+1}] 회당 반복시간(초/회)", value=hazard_entry.get("회당 반복시간(초/회)", ""), key=f"자세_회당시간_{i}_{k}")
-                hazard_entry["작업시간동안 반복횟수(회/일)"] = st.text_input(f"[{i+1}-{k+1}] 작업시간동안 반복횟수(회/일)", value=hazard_entry.get("작업시간동안 반복횟수(회/일)", ""), key=f"자세_이횟수_{i}_{k}")
-                hazard_entry["이 작업시간(분)"] = st.text_input(f"[{i+1}-{k+1}] 이 작업시간(분)", value=hazard_entry.get("이 작업시간(분)", ""), key=f"자세_이시간_{i}_{k}")
-
-            elif hazard_entry["유형"] == "과도한 힘":
-                burden_force_options = [
-                    "",
-                    "(8호)하루에 10회 이상 25kg 이상의 물체를 드는 작업",
-                    "(9호)하루에 25회 이상 10kg 이상의 물체를 무릎 아래에서 들거나, 어깨 위에서 들거나, 팔을 뻗은 상태에서 드는 작업",
-                    "(12호)밀기/당기기 작업",
-                    "(8호)하루에 10회 이상 25kg 이상의 물체를 드는 작업+(12호)밀기/당기기 작업",
-                    "(9호)하루에 25회 이상 10kg 이상의 물체를 무릎 아래에서 들거나, 어깨 위에서 들거나, 팔을 뻗은 상태에서 드는 작업+(12호)밀기/당기기 작업"
-                ]
-                selected_burden_force_index = burden_force_options.index(hazard_entry.get("부담작업", "")) if hazard_entry.get("부담작업", "") in burden_force_options else 0
-                hazard_entry["부담작업"] = st.selectbox(f"[{i+1}-{k+1}] 부담작업", burden_force_options, index=selected_burden_force_index, key=f"burden_force_{i}_{k}")
-                
-                hazard_entry["중량물 명칭"] = st.text_input(f"[{i+1}-{k+1}] 중량물 명칭", value=hazard_entry.get("중량물 명칭", ""), key=f"힘_중량물_명칭_{i}_{k}")
-                hazard_entry["중량물 용도"] = st.text_input(f"[{i+1}-{k+1}] 중량물 용도", value=hazard_entry.get("중량물 용도", ""), key=f"힘_중량물_용도_{i}_{k}")
-                hazard_entry["중량물 무게(kg)"] = st.number_input(f"[{i+1}-{k+1}] 중량물 무게(kg)", value=hazard_entry.get("중량물 무게(kg)", 0.0), key=f"중량물_무게_기본_{i}_{k}")
-                hazard_entry["하루 8시간동안 중량물을 드는 횟수(회)"] = st.number_input(f"[{i+1}-{k+1}] 하루 8시간동안 중량물을 드는 횟수(회)", value=hazard_entry.get("하루 8시간동안 중량물을 드는 횟수(회)", 0), min_value=0, step=1, key=f"중량물_횟수_{i}_{k}")
-                
-                취급방법_options = ["", "직접 취급", "크레인 사용"]
-                selected_취급방법_index = 취급방법_options.index(hazard_entry.get("취급방법", "")) if hazard_entry.get("취급방법", "") in 취급방법_options else 0
-                hazard_entry["취급방법"] = st.selectbox(f"[{i+1}-{k+1}] 취급방법", 취급방법_options, index=selected_취급방법_index, key=f"힘_취급방법_{i}_{k}")
-
-                if hazard_entry["취급방법"] == "직접 취급":
-                    이동방법_options = ["", "1인 직접이동", "2인1조 직접이동", "여러명 직접이동", "이동대차(인력이동)", "이동대차(전력이동)", "지게차"]
-                    selected_이동방법_index = 이동방법_options.index(hazard_entry.get("중량물 이동방법", "")) if hazard_entry.get("중량물 이동방법", "") in 이동방법_options else 0
-                    hazard_entry["중량물 이동방법"] = st.selectbox(f"[{i+1}-{k+1}] 중량물 이동방법", 이동방법_options, index=selected_이동방법_index, key=f"힘_이동방법_{i}_{k}")
-                    
-                    if hazard_entry["중량물 이동방법"] == "이동대차(인력이동)":
-                        직접_밀당_options = ["", "작업자가 직접 바퀴달린 이동대차를 밀고/당기기", "자동이동대차(AGV)", "기타"]
-                        selected_직접_밀당_index = 직접_밀당_options.index(hazard_entry.get("작업자가 직접 밀고/당기기", "")) if hazard_entry.get("작업자가 직접 밀고/당기기", "") in 직접_밀당_options else 0
-                        hazard_entry["작업자가 직접 밀고/당기기"] = st.selectbox(f"[{i+1}-{k+1}] 작업자가 직접 밀고/당기기", 직접_밀당_options, index=selected_직접_밀당_index, key=f"힘_직접_밀당_{i}_{k}")
-                        
-                        if hazard_entry["작업자가 직접 밀고/당기기"] == "기타":
-                            hazard_entry["기타_밀당_설명"] = st.text_input(f"[{i+1}-{k+1}] 기타 밀기/당기기 설명", value=hazard_entry.get("기타_밀당_설명", ""), key=f"힘_기타_밀당_설명_{i}_{k}")
-                        else:
-                            hazard_entry.pop("기타_밀당_설명", None)
-                    else:
-                        hazard_entry.pop("작업자가 직접 밀고/당기기", None)
-                        hazard_entry.pop("기타_밀당_설명", None)
-                else:
-                    hazard_entry.pop("중량물 이동방법", None)
-                    hazard_entry.pop("작업자가 직접 밀고/당기기", None)
-                    hazard_entry.pop("기타_밀당_설명", None)
-                
-                # '밀기/당기기'가 포함된 경우 기존 필드값 초기화 불필요. 해당 작업도 중량물 정보를 가질 수 있음.
-
-            elif hazard_entry["유형"] == "접촉스트레스 또는 기타(진동, 밀고 당기기 등)":
-                burden_other_options = [
-                    "",
-                    "(11호)하루에 이 2시간 이상 시간당 10회 이상 손 또는 무릎을 사용하여 반복적으로 충격을 가하는 작업",
-                    "(12호)진동작업(그라인더, 임팩터 등)"
-                ]
-                selected_burden_other_index = burden_other_options.index(hazard_entry.get("부담작업", "")) if hazard_entry.get("부담작업", "") in burden_other_options else 0
-                hazard_entry["부담작업"] = st.selectbox(f"[{i+1}-{k+1}] 부담작업", burden_other_options, index=selected_burden_other_index, key=f"burden_other_{i}_{k}")
-
-                if hazard_entry["부담작업"] == "(11호)하루에 이 2시간 이상 시간당 10회 이상 손 또는 무릎을 사용하여 반복적으로 충격을 가하는 작업":
-                    hazard_entry["작업시간(분)"] = st.text_input(f"[{i+1}-{k+1}] 작업시간(분)", value=hazard_entry.get("작업시간(분)", ""), key=f"기타_작업시간_{i}_{k}")
-                else:
-                    hazard_entry.pop("작업시간(분)", None)
-
-                if hazard_entry["부담작업"] == "(12호)진동작업(그라인더, 임팩터 등)":
-                    st.markdown("**(12호) 세부 유형에 대한 추가 정보 (선택적 입력)**")
-                    hazard_entry["진동수공구명"] = st.text_input(f"[{i+1}-{k+1}] 진동수공구명", value=hazard_entry.get("진동수공구명", ""), key=f"기타_진동수공구명_{i}_{k}")
-                    hazard_entry["진동수공구 용도"] = st.text_input(f"[{i+1}-{k+1}] 진동수공구 용도", value=hazard_entry.get("진동수공구 용도", ""), key=f"기타_진동수공구_용도_{i}_{k}")
-                    hazard_entry["작업시간(분)_진동"] = st.text_input(f"[{i+1}-{k+1}] 작업시간(분)", value=hazard_entry.get("작업시간(분)_진동", ""), key=f"기타_작업시간_진동_{i}_{k}")
-                    hazard_entry["작업빈도(초/회)_진동"] = st.text_input(f"[{i+1}-{k+1}] 작업빈도(초/회)", value=hazard_entry.get("작업빈도(초/회)_진동", ""), key=f"기타_작업빈도_진동_{i}_{k}")
-                    hazard_entry["작업량(회/일)_진동"] = st.text_input(f"[{i+1}-{k+1}] 작업량(회/일)", value=hazard_entry.get("작업량(회/일)_진동", ""), key=f"기타_작업량_진동_{i}_{k}")
-                    
-                    지지대_options = ["", "예", "아니오"]
-                    selected_지지대_index = 지지대_options.index(hazard_entry.get("수공구사용시 지지대가 있는가?", "")) if hazard_entry.get("수공구사용시 지지대가 있는가?", "") in 지지대_options else 0
-                    hazard_entry["수공구사용시 지지대가 있는가?"] = st.selectbox(f"[{i+1}-{k+1}] 수공구사용시 지지대가 있는가?", 지지대_options, index=selected_지지대_index, key=f"기타_지지대_여부_{i}_{k}")
-                else:
-                    hazard_entry.pop("진동수공구명", None)
-                    hazard_entry.pop("진동수공구 용도", None)
-                    hazard_entry.pop("작업시간(분)_진동", None)
-                    hazard_entry.pop("작업빈도(초/회)_진동", None)
-                    hazard_entry.pop("작업량(회/일)_진동", None)
-                    hazard_entry.pop("수공구사용시 지지대가 있는가?", None)
-
-
-            # 현재 항목의 변경사항을 unit_data에 반영
-            unit_data["유해요인_원인분석"][k] = hazard_entry
-
-            # 삭제 버튼 (첫 번째 항목은 삭제 불가)
-            if k > 0 or len(current_hazard_analysis_data) > 1:
-                col_delete_btn, _ = st.columns([0.2, 0.8])
-                with col_delete_btn:
-                    if st.button(f"[{i+1}-{k+1}] 항목 삭제", key=f"delete_hazard_analysis_{i}_{k}"):
-                        unit_data["유해요인_원인분석"].pop(k)
-                        st.rerun()
+        # 유해요인 원인분석 항목들 처리 (항목마다 별도 조각)
+        units_rendering.add(i)
+        try:
+            for k in range(len(current_hazard_analysis_data)):
+                st.fragment(render_hazard_editor, key=hazard_fragment_key(i, k))(i, k)
+        finally:
+            units_rendering.discard(i)
 
         # 보호구 및 작성자 정보
-        unit_data["보호구"] = st.multiselect(f"[{i+1}] 착용 보호구", ["무릎보호대", "손목보호대", "허리보호대", "감반", "기타"], default=unit_data.get("보호구", []), key=f"protection_gear_{i}")
-        unit_data["작성자"] = st.text_input(f"[{i+1}] 작성자 이름", value=unit_data.get("작성자", ""), key=f"author_name_{i}")
-        unit_data["연락처"] = st.text_input(f"[{i+1}] 작성자 연락처", value=unit_data.get("연락처", ""), key=f"author_contact_{i}")
+        unit_data["보호구"] = unit_fields.multiselect(f"[{i+1}] 착용 보호구", ["무릎보호대", "손목보호대", "허리보호대", "감반", "기타"], default=unit_data.get("보호구", []), key=f"protection_gear_{i}")
+        unit_data["작성자"] = unit_fields.text_input(f"[{i+1}] 작성자 이름", value=unit_data.get("작성자", ""), key=f"author_name_{i}")
+        unit_data["연락처"] = unit_fields.text_input(f"[{i+1}] 작성자 연락처", value=unit_data.get("연락처", ""), key=f"author_contact_{i}")
+        submit_fields(unit_fields, f"[{i+1}] 단위작업 적용", fragment_key)
 
         # 근골격계 부담작업 판단 기준 계산 및 업데이트
-        burden_criteria = {f"부담작업_{k}호": "X" for k in range(1, 13)}
+        judge_started = time.perf_counter()
+        judge_unit(unit_data)
+        profile.add("부담작업 판정", time.perf_counter() - judge_started)
 
-        for hazard_entry in unit_data.get("유해요인_원인분석", []):
-            hazard_type = hazard_entry.get("유형")
-            burden_detail_option = hazard_entry.get("부담작업") or hazard_entry.get("부담작업자세")
+    if profiling.is_fragment_rerun():
+        finish_fragment_run(i, unit_data, summary_before, started, "단위작업")
 
-            if not burden_detail_option: continue
+for i in range(page_start, page_end):
+    profile.start_unit(i)
+    # 새로운 단위작업이 추가되었을 때 빈 데이터 구조로 초기화
+    if i >= len(st.session_state.task_units):
+        st.session_state.task_units.append(create_default_unit())
 
-            if hazard_type == "반복동작":
-                total_work_time_min = parse_value(hazard_entry.get("이 작업시간(분)"), val_type=float)
-                
-                if "(1호)" in burden_detail_option:
-                    burden_criteria["부담작업_1호"] = "O" if total_work_time_min >= 240 else "△"
-                    if "(12호)정적자세" in burden_detail_option: burden_criteria["부담작업_12호"] = "△"
-                        
-                elif "(2호)" in burden_detail_option:
-                    burden_criteria["부담작업_2호"] = "O" if total_work_time_min >= 120 else "△"
-                    if "(12호)정적자세" in burden_detail_option: burden_criteria["부담작업_12호"] = "△"
-                        
-                elif "(6호)" in burden_detail_option:
-                    burden_criteria["부담작업_6호"] = "O" if total_work_time_min >= 120 else "△"
-                    if "(12호)정적자세" in burden_detail_option: burden_criteria["부담작업_12호"] = "△"
-                        
-                elif "(7호)" in burden_detail_option:
-                    burden_criteria["부담작업_7호"] = "O" if total_work_time_min >= 120 else "△"
-                    if "(12호)정적자세" in burden_detail_option: burden_criteria["부담작업_12호"] = "△"
-                        
-                elif "(10호)" in burden_detail_option:
-                    min_repeat_count = parse_value(hazard_entry.get("분당 반복횟수(회/분)_10호"), val_type=float)
-                    object_weight_10 = hazard_entry.get("물체 무게(kg)_10호", 0.0)
-
-                    if total_work_time_min >= 120 and min_repeat_count >= 2 and object_weight_10 >= 4.5:
-                        burden_criteria["부담작업_10호"] = "O"
-                    else:
-                        burden_criteria["부담작업_10호"] = "△"
-                    if "(12호)정적자세" in burden_detail_option: burden_criteria["부담작업_12호"] = "△"
-
-            elif hazard_type == "부자연스러운 자세":
-                total_work_time_min = parse_value(hazard_entry.get("이 작업시간(분)"), val_type=float)
-
-                if "(3호)" in burden_detail_option:
-                    burden_criteria["부담작업_3호"] = "O" if total_work_time_min >= 120 else "△"
-                elif "(4호)" in burden_detail_option:
-                    burden_criteria["부담작업_4호"] = "O" if total_work_time_min >= 120 else "△"
-                elif "(5호)" in burden_detail_option:
-                    burden_criteria["부담작업_5호"] = "O" if total_work_time_min >= 120 else "△"
-
-            elif hazard_type == "과도한 힘":
-                work_count_per_day = hazard_entry.get("하루 8시간동안 중량물을 드는 횟수(회)", 0)
-                object_weight = hazard_entry.get("중량물 무게(kg)", 0.0)
-
-                is_8_selected = "(8호)" in burden_detail_option
-                is_9_selected = "(9호)" in burden_detail_option
-                is_12_selected = "(12호)밀기/당기기" in burden_detail_option
-
-                if is_8_selected:
-                    burden_criteria["부담작업_8호"] = "O" if work_count_per_day >= 10 and object_weight >= 25 else "△"
-                if is_9_selected:
-                    burden_criteria["부담작업_9호"] = "O" if work_count_per_day >= 25 and object_weight >= 10 else "△"
-                if is_12_selected:
-                    burden_criteria["부담작업_12호"] = "△"
-
-            elif hazard_type == "접촉스트레스 또는 기타(진동, 밀고 당기기 등)":
-                if "(11호)" in burden_detail_option:
-                    work_time_min = parse_value(hazard_entry.get("작업시간(분)"), val_type=float)
-                    burden_criteria["부담작업_11호"] = "O" if work_time_min >= 120 else "△"
-                elif "(12호)진동작업" in burden_detail_option:
-                    burden_criteria["부담작업_12호"] = "△"
-        
-        # O, △, X 순서로 병합하여 업데이트
-        for k in range(1, 13):
-            key = f"부담작업_{k}호"
-            if burden_criteria[key] == "O":
-                unit_data[key] = "O"
-            elif burden_criteria[key] == "△" and unit_data.get(key) != "O":
-                unit_data[key] = "△"
-            elif unit_data.get(key, "X") not in ["O", "△"]:
-                unit_data[key] = "X"
+    st.fragment(render_unit_editor, key=unit_fragment_key(i))(i)
+    profile.end_unit()
 
 # 엑셀 다운로드 섹션
+# 파일은 '파일 만들기'를 눌렀을 때 작업 스레드에서 만들고(작업목록 내용 해시로 캐시), 그동안에도 계속 입력할 수 있다.
+# 만드는 중에 내용이 바뀌면 그 작업은 취소하고, 다 만든 파일도 내용이 바뀌면 버린다.
+profile.lap("다운로드")
 if st.session_state.task_units:
-    output = io.BytesIO()
-    rows = []
-    
-    ordered_columns_prefix = [
-        "회사명", "소속", "반", "단위작업명", "작업내용(상세설명)",
-        "작업자 수", "작업자 이름", 
-        "작업형태", "1일 작업시간"
-    ]
-
-    ordered_columns_burden = [f"부담작업_{k}호" for k in range(1, 13)]
-
-    FIXED_MAX_HAZARD_ANALYTICS = 5
-
-    ordered_columns_hazard_analysis = []
-    for j in range(FIXED_MAX_HAZARD_ANALYTICS):
-        ordered_columns_hazard_analysis.extend([
-            f"유해요인_원인분석_유형_{j+1}", 
-            f"유해요인_원인분석_부담작업_{j+1}_반복",
-            f"유해요인_원인분석_수공구_종류_{j+1}", f"유해요인_원인분석_수공구_용도_{j+1}", 
-            f"유해요인_원인분석_수공구_무게(kg)_{j+1}", f"유해요인_원인분석_수공구_사용시간(분)_{j+1}",
-            f"유해요인_원인분석_부담부위_{j+1}", f"유해요인_원인분석_반복_회당시간(초/회)_{j+1}", 
-            f"유해요인_원인분석_반복_이횟수(회/일)_{j+1}", f"유해요인_원인분석_반복_이시간(분)_{j+1}",
-            f"유해요인_원인분석_반복_물체무게_10호(kg)_{j+1}", f"유해요인_원인분석_반복_분당반복횟수_10호(회/분)_{j+1}",
-            f"유해요인_원인분석_반복_작업내용_12호_정적_{j+1}", f"유해요인_원인분석_반복_작업시간_12호_정적_{j+1}", 
-            f"유해요인_원인분석_반복_휴식시간_12호_정적_{j+1}", f"유해요인_원인분석_반복_인체부담부위_12호_정적_{j+1}",
-            f"유해요인_원인분석_부담작업자세_{j+1}",
-            f"유해요인_원인분석_자세_회당시간(초/회)_{j+1}", f"유해요인_원인분석_자세_이횟수(회/일)_{j+1}", 
-            f"유해요인_원인분석_자세_이시간(분)_{j+1}",
-            f"유해요인_원인분석_부담작업_{j+1}_힘",
-            f"유해요인_원인분석_힘_중량물_명칭_{j+1}", f"유해요인_원인분석_힘_중량물_용도_{j+1}", 
-            f"유해요인_원인분석_중량물_무게(kg)_{j+1}", f"유해요인_원인분석_하루8시간_중량물_횟수(회)_{j+1}",
-            f"유해요인_원인분석_힘_취급방법_{j+1}", f"유해요인_원인분석_힘_이동방법_{j+1}", 
-            f"유해요인_원인분석_힘_직접_밀당_{j+1}", f"유해요인_원인분석_힘_기타_밀당_설명_{j+1}",
-            f"유해요인_원인분석_힘_이횟수(회/일)_{j+1}",
-            f"유해요인_원인분석_부담작업_{j+1}_기타",
-            f"유해요인_원인분석_기타_작업시간(분)_{j+1}",
-            f"유해요인_원인분석_기타_진동수공구명_{j+1}", f"유해요인_원인분석_기타_진동수공구_용도_{j+1}",
-            f"유해요인_원인분석_기타_작업시간_진동_{j+1}", f"유해요인_원인분석_기타_작업빈도_진동_{j+1}",
-            f"유해요인_원인분석_기타_작업량_진동_{j+1}", f"유해요인_원인분석_기타_지지대_여부_{j+1}"
-        ])
-
-    ordered_columns_suffix = ["보호구", "작성자", "연락처"]
-    ordered_columns = ordered_columns_prefix + ordered_columns_burden + ordered_columns_hazard_analysis + ordered_columns_suffix
-
-    for unit in st.session_state.task_units:
-        base_row = {col: None for col in ordered_columns} # 모든 컬럼을 None으로 초기화
-
-        base_row.update({
-            "회사명": unit["회사명"], "소속": unit["소속"], "반": unit["반"],
-            "단위작업명": unit["단위작업명"], "작업내용(상세설명)": unit["작업내용(상세설명)"],
-            "작업자 수": unit["작업자 수"], "작업자 이름": unit["작업자 이름"],
-            "작업형태": unit["작업형태"], "1일 작업시간": unit["1일 작업시간"],
-            "보호구": ", ".join(unit["보호구"]), "작성자": unit["작성자"], "연락처": unit["연락처"]
-        })
-        
-        for k_crit in range(1, 13):
-            base_row[f"부담작업_{k_crit}호"] = unit.get(f"부담작업_{k_crit}호", "X")
-
-        # 유해요인 원인분석 데이터 평면화
-        for j, hazard_entry in enumerate(unit.get("유해요인_원인분석", [])):
-            if j >= FIXED_MAX_HAZARD_ANALYTICS: break
+    export_task_units = st.session_state.task_units[:st.session_state.unit_count]
+
+    col_export_format, col_export_split = st.columns([0.4, 0.6])
+    with col_export_format:
+        export_format = st.selectbox(
+            "다운로드 형식",
+            list(export.EXPORT_FORMATS),
+            format_func=lambda file_format: export.EXPORT_FORMATS[file_format][0],
+            key="export_format"
+        )
+    with col_export_split:
+        export_split = st.checkbox(
+            "소속/반별로 나누어 zip으로 받기",
+            key="export_split",
+            help="소속/반이 같은 단위작업끼리 파일을 따로 만들어(동시에 처리) zip 파일 하나로 묶습니다."
+        )
+        if export_split:
+            export_header = st.session_state.header
+            export_groups = {
+                (unit.get("소속", export_header["소속"]), unit.get("반", export_header["반"])) for unit in export_task_units
+            }
+            st.caption(f"소속/반 {len(export_groups)}개 파일")
+
+    # 기존(가로형) 양식은 단위작업당 유해요인 슬롯이 고정되어 있으므로 넘치는 항목을 알림
+    if export_format != "xlsx_long":
+        overflow_units = export.count_truncated_units(export_task_units)
+        if overflow_units:
+            st.warning(
+                f"유해요인 원인분석 항목이 {FIXED_MAX_HAZARD_ANALYTICS}개를 넘는 단위작업이 {overflow_units}개 있습니다. "
+                f"이 형식에는 앞의 {FIXED_MAX_HAZARD_ANALYTICS}개만 저장되므로 'Excel 정규화 양식'을 사용하세요."
+            )
 
-            base_row[f"유해요인_원인분석_유형_{j+1}"] = hazard_entry.get("유형", "")
-            
-            if hazard_entry.get("유형") == "반복동작":
-                base_row[f"유해요인_원인분석_부담작업_{j+1}_반복"] = hazard_entry.get("부담작업")
-                base_row[f"유해요인_원인분석_수공구_종류_{j+1}"] = hazard_entry.get("수공구 종류")
-                base_row[f"유해요인_원인분석_수공구_용도_{j+1}"] = hazard_entry.get("수공구 용도")
-                base_row[f"유해요인_원인분석_수공구_무게(kg)_{j+1}"] = hazard_entry.get("수공구 무게(kg)")
-                base_row[f"유해요인_원인분석_수공구_사용시간(분)_{j+1}"] = hazard_entry.get("수공구 사용시간(분)")
-                base_row[f"유해요인_원인분석_부담부위_{j+1}"] = hazard_entry.get("부담부위")
-                base_row[f"유해요인_원인분석_반복_회당시간(초/회)_{j+1}"] = hazard_entry.get("회당 반복시간(초/회)")
-                base_row[f"유해요인_원인분석_반복_이횟수(회/일)_{j+1}"] = hazard_entry.get("작업시간동안 반복횟수(회/일)")
-                base_row[f"유해요인_원인분석_반복_이시간(분)_{j+1}"] = hazard_entry.get("이 작업시간(분)")
-                base_row[f"유해요인_원인분석_반복_물체무게_10호(kg)_{j+1}"] = hazard_entry.get("물체 무게(kg)_10호")
-                base_row[f"유해요인_원인분석_반복_분당반복횟수_10호(회/분)_{j+1}"] = hazard_entry.get("분당 반복횟수(회/분)_10호")
-                base_row[f"유해요인_원인분석_반복_작업내용_12호_정적_{j+1}"] = hazard_entry.get("작업내용_12호_정적")
-                base_row[f"유해요인_원인분석_반복_작업시간_12호_정적_{j+1}"] = hazard_entry.get("작업시간(분)_12호_정적")
-                base_row[f"유해요인_원인분석_반복_휴식시간_12호_정적_{j+1}"] = hazard_entry.get("휴식시간(분)_12호_정적")
-                base_row[f"유해요인_원인분석_반복_인체부담부위_12호_정적_{j+1}"] = hazard_entry.get("인체부담부위_12호_정적")
-
-            elif hazard_entry.get("유형") == "부자연스러운 자세":
-                base_row[f"유해요인_원인분석_부담작업자세_{j+1}"] = hazard_entry.get("부담작업자세")
-                base_row[f"유해요인_원인분석_자세_회당시간(초/회)_{j+1}"] = hazard_entry.get("회당 반복시간(초/회)")
-                base_row[f"유해요인_원인분석_자세_이횟수(회/일)_{j+1}"] = hazard_entry.get("작업시간동안 반복횟수(회/일)")
-                base_row[f"유해요인_원인분석_자세_이시간(분)_{j+1}"] = hazard_entry.get("이 작업시간(분)")
-                
-            elif hazard_entry.get("유형") == "과도한 힘":
-                base_row[f"유해요인_원인분석_부담작업_{j+1}_힘"] = hazard_entry.get("부담작업")
-                base_row[f"유해요인_원인분석_힘_중량물_명칭_{j+1}"] = hazard_entry.get("중량물 명칭")
-                base_row[f"유해요인_원인분석_힘_중량물_용도_{j+1}"] = hazard_entry.get("중량물 용도")
-                base_row[f"유해요인_원인분석_중량물_무게(kg)_{j+1}"] = hazard_entry.get("중량물 무게(kg)")
-                base_row[f"유해요인_원인분석_하루8시간_중량물_횟수(회)_{j+1}"] = hazard_entry.get("하루 8시간동안 중량물을 드는 횟수(회)")
-                base_row[f"유해요인_원인분석_힘_취급방법_{j+1}"] = hazard_entry.get("취급방법")
-                base_row[f"유해요인_원인분석_힘_이동방법_{j+1}"] = hazard_entry.get("중량물 이동방법")
-                base_row[f"유해요인_원인분석_힘_직접_밀당_{j+1}"] = hazard_entry.get("작업자가 직접 밀고/당기기")
-                base_row[f"유해요인_원인분석_힘_기타_밀당_설명_{j+1}"] = hazard_entry.get("기타_밀당_설명")
-                base_row[f"유해요인_원인분석_힘_이횟수(회/일)_{j+1}"] = hazard_entry.get("작업시간동안 작업횟수(회/일)")
-                
-            elif hazard_entry.get("유형") == "접촉스트레스 또는 기타(진동, 밀고 당기기 등)":
-                base_row[f"유해요인_원인분석_부담작업_{j+1}_기타"] = hazard_entry.get("부담작업")
-                if "(11호)" in hazard_entry.get("부담작업", ""):
-                    base_row[f"유해요인_원인분석_기타_작업시간(분)_{j+1}"] = hazard_entry.get("작업시간(분)")
-                elif "(12호)진동작업" in hazard_entry.get("부담작업", ""):
-                    base_row[f"유해요인_원인분석_기타_진동수공구명_{j+1}"] = hazard_entry.get("진동수공구명")
-                    base_row[f"유해요인_원인분석_기타_진동수공구_용도_{j+1}"] = hazard_entry.get("진동수공구 용도")
-                    base_row[f"유해요인_원인분석_기타_작업시간_진동_{j+1}"] = hazard_entry.get("작업시간(분)_진동")
-                    base_row[f"유해요인_원인분석_기타_작업빈도_진동_{j+1}"] = hazard_entry.get("작업빈도(초/회)_진동")
-                    base_row[f"유해요인_원인분석_기타_작업량_진동_{j+1}"] = hazard_entry.get("작업량(회/일)_진동")
-                    base_row[f"유해요인_원인분석_기타_지지대_여부_{j+1}"] = hazard_entry.get("수공구사용시 지지대가 있는가?")
-        rows.append(base_row)
-
-    if rows:
-      df = pd.DataFrame(rows)
-      df = df[ordered_columns] # 최종 컬럼 순서 정리
-
-      # 파일명 생성
-      if st.session_state.반:
-          file_name_base = st.session_state.반
-      else:
-          file_name_base = "미정반" 
-      
-      current_date = datetime.now().strftime("%y%m%d")
-      file_name = f"작업목록표_{file_name_base}_{current_date}.xlsx"
-
-      with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-          df.to_excel(writer, index=False, sheet_name='작업목록')
-          
-      st.download_button(
-          label="📥 작업목록표 다운로드",
-          data=output.getvalue(),
-          file_name=file_name,
-          mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-      )
+    if st.session_state.export_job is not None and export_job_stale(range(page_start, page_end), export_format, export_split):
+        discard_export_job(EXPORT_STALE_NOTICE)
+
+    if st.session_state.export_job is None:
+        if st.button("📦 다운로드 파일 만들기", key="export_build_button"):
+            start_export_job(export_task_units, export_format, export_split)
+
+    export_job = st.session_state.export_job
+    st.fragment(render_export_job, run_every=EXPORT_POLL_SECONDS if export_job is not None and export_job.running else None)()
+
+# 자동 저장 (처음 실행, 업로드/불러오기, 회사 정보 변경 후에는 전체를, 그 외에는 현재 페이지의 단위작업만 비교)
+profile.lap("자동 저장")
+autosave_tracker = st.session_state.autosave_tracker
+autosave_error = autosave(None if st.session_state.autosave_full_sync else range(page_start, page_end))
+if autosave_error:
+    st.sidebar.warning(f"자동 저장 실패: {autosave_error}")
+elif autosave_tracker.started:
+    st.session_state.autosave_full_sync = False
+if autosave_enabled and autosave_tracker.started:
+    st.sidebar.caption(f"💾 마지막 자동 저장: {time.strftime('%H:%M:%S', time.localtime(autosave_tracker.saved_at))}")
+
+# 성능 진단 (측정이 켜져 있을 때만 사이드바에 표시)
+if profile.finish() is not None:
+    remember_profile(profile.record)
+    with st.sidebar.expander("🛠 성능 진단", expanded=True):
+        record = profile.record
+        st.metric("이번 실행 시간", f"{record['total_ms']:.0f} ms")
+        st.caption(
+            f"세션 {record['session']} · {record['run']}번째 실행 · "
+            f"입력 폼 단위작업 {record['units_rendered']}개 · "
+            f"위젯 {record['widgets_total']}개 (단위작업당 {record['widgets_per_unit']}개)"
+        )
+        st.dataframe(pd.DataFrame(profile.phase_rows()), hide_index=True)
+        if profile.units:
+            st.dataframe(pd.DataFrame(profile.unit_rows()), hide_index=True)
+        st.caption(f"업로드 캐시 (서버 공용) · 이 세션이 함께 쓰는 단위작업 {len(st.session_state.shared_unit_ids)}개")
+        st.dataframe(pd.DataFrame([cache.workbook_cache.stats()]), hide_index=True)
+        if len(st.session_state.profile_history) > 1:
+            st.caption("최근 실행 시간(ms)")
+            st.line_chart(pd.DataFrame(
+                {"시간(ms)": [past_record["total_ms"] for past_record in st.session_state.profile_history]},
+                index=[past_record["run"] for past_record in st.session_state.profile_history]
+            ))
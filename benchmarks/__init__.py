@@ -0,0 +1 @@
+# 업로드 읽기, 부담작업 판정, 내보내기 단계별 성능 측정
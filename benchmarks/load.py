@@ -0,0 +1,239 @@
+# 여러 세션이 동시에 앱을 쓰는 상황의 다시 실행(rerun) 지연 시간과 메모리 측정
+#
+#   python -m benchmarks.load                          # 세션 1, 5, 10개
+#   python -m benchmarks.load --sessions 1 20 --units 500
+#   python -m benchmarks.load --json load_result.json  # 결과를 JSON으로도 저장
+#
+# Streamlit 앱 테스트 API(AppTest)로 app.py를 화면 없이 실행한다. 세션마다 스레드 하나가
+# 가상 작업목록 파일 업로드 -> 단위작업 추가 -> 유해요인 항목 입력 -> 다운로드 파일 만들기를 차례로 하고,
+# 동작 하나(위젯 입력 + 다시 실행)의 시간을 모아 세션 수별 p50/p95와 프로세스 상주 메모리(RSS)를 보고한다.
+# (한 프로세스 안에서 세션을 돌리므로 서버 1대가 세션 N개를 맡은 경우와 같다. 시간에는 AppTest의 처리 시간도 포함)
+#
+# AppTest는 실행할 때마다 프로세스 전역 상태(Runtime 인스턴스 등)를 바꿨다가 지우므로 두 세션의 실행이 겹치면 안 된다.
+# 그래서 다시 실행은 한 번에 하나씩 하고, 앞 세션의 실행을 기다린 시간도 동작 시간에 넣는다
+# (스크립트 실행은 대부분 GIL을 잡고 도는 파이썬 코드라 실제 서버에서도 세션끼리 CPU를 나눠 쓰는 것과 비슷함).
+# 다운로드 파일을 만드는 작업 스레드/프로세스는 그대로 동시에 돈다.
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 측정 세션이 사용자의 자동 저장 파일(~/.worklist/autosave.sqlite3)을 건드리지 않도록 자동 저장을 끄고,
+# 저장된 작업 목록도 임시 폴더의 빈 저장소에서 읽음 (프로세스가 끝나면 지워짐)
+# (worklist.store가 가져올 때 설정을 읽으므로 앱/worklist 모듈보다 먼저 지정)
+_autosave_dir = tempfile.TemporaryDirectory(prefix="worklist-load-")
+os.environ["WORKLIST_AUTOSAVE"] = "0"
+os.environ["WORKLIST_AUTOSAVE_PATH"] = os.path.join(_autosave_dir.name, "autosave.sqlite3")
+
+import numpy as np
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+
+from worklist import synthetic
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+DEFAULT_SESSIONS = [1, 5, 10]
+APP_TIMEOUT_SECONDS = 300
+EXPORT_POLL_SECONDS = 0.1
+
+
+# 세션들의 다시 실행을 한 번에 하나씩 하기 위한 잠금
+_run_lock = threading.Lock()
+
+# AppTest는 실행할 때마다 app.py를 새로 컴파일하지만 실제 서버는 한 번 컴파일한 코드를 모든 세션이 함께 씀
+# 서버와 같게 컴파일 결과를 공유하도록 ScriptCache를 바꿈 (컴파일 시간이 동작 시간에 들어가지 않음)
+_original_get_bytecode = ScriptCache.get_bytecode
+_shared_bytecode = {}
+
+
+def _shared_get_bytecode(script_cache, script_path):
+    script_path = os.path.abspath(script_path)
+    if script_path not in _shared_bytecode:
+        _shared_bytecode[script_path] = _original_get_bytecode(script_cache, script_path)
+    return _shared_bytecode[script_path]
+
+
+def share_script_bytecode():
+    ScriptCache.get_bytecode = _shared_get_bytecode
+
+
+# 프로세스 상주 메모리(MB), 리눅스가 아니면 최대 상주 메모리, 둘 다 읽을 수 없으면 None
+def resident_mb():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# 세션 1개의 동작 순서 (동작 이름, AppTest에 하는 입력)
+def scenario_steps(at, upload_bytes, unit_count, rounds):
+    steps = [("업로드", lambda: at.file_uploader(key="file_uploader").upload("작업목록.xlsx", upload_bytes))]
+    for round_index in range(rounds):
+        i = unit_count + round_index # 추가한 단위작업 (추가하면 마지막 페이지로 이동)
+        steps += [
+            ("단위작업 추가", lambda: at.button(key="add_unit_button").click()),
+            ("단위작업명 입력", lambda i=i: at.text_input(key=f"작업명_{i}").input(f"부하 시험 작업 {i}")),
+            ("유형 선택", lambda i=i: at.selectbox(key=f"hazard_type_{i}_0").select("반복동작")),
+            ("부담작업 선택", lambda i=i: at.selectbox(key=f"burden_task_반복_{i}_0").select_index(2)),
+            ("회당 반복시간 입력", lambda i=i: at.text_input(key=f"반복_회당시간_{i}_0").input("5")),
+            ("반복횟수 입력", lambda i=i: at.text_input(key=f"반복_이횟수_{i}_0").input("2000")),
+            ("항목 추가", lambda i=i: at.button(key=f"add_hazard_analysis_{i}").click()),
+            ("유형 선택", lambda i=i: at.selectbox(key=f"hazard_type_{i}_1").select("부자연스러운 자세")),
+            ("부담작업 선택", lambda i=i: at.selectbox(key=f"burden_pose_{i}_1").select_index(1)),
+            ("작업시간 입력", lambda i=i: at.text_input(key=f"자세_이시간_{i}_1").input("150")),
+        ]
+    steps.append(("다운로드 파일 만들기", lambda: at.button(key="export_build_button").click()))
+    return steps
+
+
+# 세션 1개 실행, result에 기록: {"timings": [(동작 이름, 초)], "waits": [초], "export_seconds", "errors", "app"}
+# (동작 시간 = 위젯 입력 + 다른 세션의 실행을 기다린 시간 + 다시 실행)
+# (메모리를 잴 때까지 세션이 살아 있도록 AppTest도 함께 넣어 둠)
+def run_session(unit_count, rounds, upload_bytes, start_barrier, result):
+    timings = []
+    waits = []
+    errors = []
+    at = AppTest.from_file(str(APP_PATH), default_timeout=APP_TIMEOUT_SECONDS)
+    result.update({"timings": timings, "waits": waits, "errors": errors, "export_seconds": None, "app": at})
+
+    def timed(name, action):
+        started = time.perf_counter()
+        action()
+        waiting = time.perf_counter()
+        with _run_lock:
+            waits.append(time.perf_counter() - waiting)
+            at.run()
+        timings.append((name, time.perf_counter() - started))
+        errors.extend(f"{name}: {exception.message}" for exception in at.exception)
+
+    step_name = "처음 실행"
+    try:
+        start_barrier.wait()
+        timed(step_name, lambda: None)
+        for step_name, action in scenario_steps(at, upload_bytes, unit_count, rounds):
+            timed(step_name, action)
+
+        # 다운로드 파일은 작업 스레드에서 만들므로 끝날 때까지 기다린 뒤 다운로드 버튼이 보이는 실행을 잼
+        export_job = at.session_state.export_job
+        export_started = time.perf_counter()
+        while export_job is not None and export_job.running:
+            time.sleep(EXPORT_POLL_SECONDS)
+        result["export_seconds"] = time.perf_counter() - export_started
+        step_name = "다운로드 버튼 표시"
+        timed(step_name, lambda: None)
+        if not [button for button in at.get("download_button") if "작업목록표" in button.proto.label]:
+            errors.append("다운로드 버튼이 보이지 않음")
+    except Exception as e:
+        errors.append(f"{step_name}: {type(e).__name__}: {e}")
+
+
+def _percentile_ms(seconds, q):
+    return round(float(np.percentile(seconds, q)) * 1000, 1) if seconds else None
+
+
+# 세션 sessions개를 동시에 실행하고 지연 시간/메모리 요약
+def run_level(sessions, unit_count=200, rounds=2, shared_file=False, seed=0):
+    share_script_bytecode()
+    uploads = [
+        synthetic.make_workbook_bytes(unit_count, seed=seed if shared_file else seed + session_index)
+        for session_index in range(sessions)
+    ]
+    gc.collect()
+    rss_before = resident_mb()
+
+    start_barrier = threading.Barrier(sessions)
+    results = [{} for _ in range(sessions)]
+    threads = [
+        threading.Thread(
+            target=run_session,
+            args=(unit_count, rounds, uploads[session_index], start_barrier, results[session_index]),
+            name=f"load-session-{session_index}",
+        )
+        for session_index in range(sessions)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_seconds = time.perf_counter() - started
+
+    # 세션을 모두 살려 둔 상태의 메모리 (세션 상태, 업로드 캐시, 내보내기 캐시 포함)
+    rss_after = resident_mb()
+    seconds = [value for result in results for _, value in result.get("timings", [])]
+    by_step = {}
+    for result in results:
+        for name, value in result.get("timings", []):
+            by_step.setdefault(name, []).append(value)
+    waits = [value for result in results for value in result.get("waits", [])]
+    export_seconds = [result["export_seconds"] for result in results if result.get("export_seconds") is not None]
+    errors = [f"세션 {index + 1} {error}" for index, result in enumerate(results) for error in result.get("errors", [])]
+    results.clear()
+    gc.collect()
+
+    return {
+        "sessions": sessions,
+        "reruns": len(seconds),
+        "p50_ms": _percentile_ms(seconds, 50),
+        "p95_ms": _percentile_ms(seconds, 95),
+        "max_ms": round(max(seconds) * 1000, 1) if seconds else None,
+        "wait_p95_ms": _percentile_ms(waits, 95),
+        "export_p50_ms": _percentile_ms(export_seconds, 50),
+        "wall_seconds": round(wall_seconds, 2),
+        "rss_mb": None if rss_after is None else round(rss_after, 1),
+        "rss_per_session_mb": None if rss_after is None or rss_before is None else round((rss_after - rss_before) / sessions, 1),
+        "steps_p95_ms": {name: _percentile_ms(values, 95) for name, values in by_step.items()},
+        "errors": errors,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description="동시 세션 수별 다시 실행 지연 시간과 메모리를 측정합니다.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS, help="동시에 실행할 세션 수 (기본값: %(default)s)")
+    parser.add_argument("--units", type=int, default=200, help="세션마다 업로드하는 가상 작업목록의 단위작업 수 (기본값: %(default)s)")
+    parser.add_argument("--rounds", type=int, default=2, help="세션마다 단위작업을 추가하고 항목을 입력하는 횟수 (기본값: %(default)s)")
+    parser.add_argument("--shared-file", action="store_true", help="모든 세션이 같은 파일을 업로드 (업로드 캐시를 함께 쓰는 경우)")
+    parser.add_argument("--seed", type=int, default=0, help="가상 작업목록 난수 시드 (기본값: %(default)s)")
+    parser.add_argument("--steps", action="store_true", help="동작별 p95도 출력")
+    parser.add_argument("--json", type=Path, default=None, help="결과를 저장할 JSON 파일 경로")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    levels = []
+    print(f"{'세션':>4}  {'실행 수':>6}  {'p50(ms)':>9}  {'p95(ms)':>9}  {'최대(ms)':>9}  {'대기 p95(ms)':>11}  {'파일 생성 p50(ms)':>16}  {'RSS(MB)':>8}  {'세션당(MB)':>10}")
+    for sessions in args.sessions:
+        level = run_level(sessions, args.units, args.rounds, args.shared_file, args.seed)
+        levels.append(level)
+        print(
+            f"{sessions:>4}  {level['reruns']:>6}  {level['p50_ms']:>9}  {level['p95_ms']:>9}  {level['max_ms']:>9}  {level['wait_p95_ms']!s:>11}  "
+            f"{level['export_p50_ms']!s:>16}  {level['rss_mb']!s:>8}  {level['rss_per_session_mb']!s:>10}"
+        )
+        if args.steps:
+            for name, p95 in level["steps_p95_ms"].items():
+                print(f"        {name:<20} p95 {p95}ms")
+        for error in level["errors"]:
+            print(f"  오류: {error}")
+
+    if args.json is not None:
+        payload = {"units": args.units, "rounds": args.rounds, "shared_file": args.shared_file, "levels": levels}
+        args.json.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"결과 저장: {args.json}")
+    return 1 if any(level["errors"] for level in levels) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
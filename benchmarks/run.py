@@ -0,0 +1,161 @@
+# 업로드 읽기, 부담작업 판정, 내보내기 단계별 시간과 최대 메모리 측정
+#
+#   python -m benchmarks.run                      # 기준값(benchmarks/baseline.json)과 비교
+#   python -m benchmarks.run --sizes 10 1000      # 일부 규모만 측정
+#   python -m benchmarks.run --save               # 현재 결과를 기준값으로 저장
+#
+# 가상 작업목록(worklist.synthetic)을 규모별로 만든 뒤 각 단계를 repeat번 실행해 가장 빠른 시간을,
+# tracemalloc으로 한 번 더 실행해 최대 메모리를 기록한다. pandas/openpyxl 등을 올린 뒤
+# 기준값보다 tolerance배 이상 느려지거나 메모리를 더 쓰는 단계가 있으면 종료 코드 1.
+import argparse
+import copy
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from worklist import criteria, export, importer, synthetic
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = [10, 1000, 10000]
+DEPENDENCIES = ["pandas", "numpy", "openpyxl", "xlsxwriter", "pyarrow", "streamlit"]
+
+# 기준값과 비교할 때 무시하는 작은 차이 (짧은 단계의 시간 흔들림)
+MIN_SECONDS_DIFF = 0.05
+MIN_PEAK_MB_DIFF = 1.0
+
+
+def _update_each(task_units):
+    for unit in task_units:
+        criteria.update_burden_criteria(unit)
+
+
+# 측정 단계 (이름, 준비 함수(규모별 입력) -> 인자, 측정 함수)
+# 준비 함수는 측정 시간에 포함되지 않으며, 판정 단계는 매번 새 복사본을 판정
+STAGES = [
+    ("읽기_xlsx", lambda data: (data["xlsx"],), importer.load_task_units),
+    ("읽기_xlsx_스트리밍", lambda data: (data["xlsx"],), importer.stream_task_units),
+    ("읽기_xlsx_정규화", lambda data: (data["xlsx_long"],), importer.load_task_units),
+    ("판정_일괄", lambda data: (copy.deepcopy(data["task_units"]),), criteria.apply_burden_criteria),
+    ("판정_단위작업별", lambda data: (copy.deepcopy(data["task_units"]),), _update_each),
+    ("내보내기_xlsx", lambda data: (data["task_units"], "xlsx"), export.build_export_bytes),
+    ("내보내기_xlsx_정규화", lambda data: (data["task_units"], "xlsx_long"), export.build_export_bytes),
+    ("내보내기_csv", lambda data: (data["task_units"], "csv"), export.build_export_bytes),
+    ("내보내기_parquet", lambda data: (data["task_units"], "parquet"), export.build_export_bytes),
+    ("내보내기_xlsx_소속반별_zip", lambda data: (data["task_units"], "xlsx", None, None, True), export.build_export_bytes),
+]
+
+
+def environment_info():
+    info = {"python": platform.python_version(), "platform": platform.platform()}
+    for name in DEPENDENCIES:
+        try:
+            info[name] = version(name)
+        except PackageNotFoundError:
+            info[name] = None
+    return info
+
+
+def prepare_inputs(unit_count, seed=0):
+    task_units = synthetic.make_task_units(unit_count, seed=seed)
+    return {
+        "task_units": task_units,
+        "xlsx": export.build_export_bytes(task_units, "xlsx"),
+        "xlsx_long": export.build_export_bytes(task_units, "xlsx_long"),
+    }
+
+
+def measure_stage(prepare, func, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        args = prepare(data)
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    args = prepare(data)
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(min(timings), 4), "peak_mb": round(peak / (1024 * 1024), 2)}
+
+
+# 반환값: {단위작업 수(문자열): {단계 이름: {"seconds", "peak_mb"}}}
+def run_benchmarks(sizes, repeat=3, stages=None, seed=0, log=print):
+    results = {}
+    for unit_count in sizes:
+        data = prepare_inputs(unit_count, seed=seed)
+        results[str(unit_count)] = {}
+        for name, prepare, func in STAGES:
+            if stages and name not in stages:
+                continue
+            result = measure_stage(prepare, func, data, repeat)
+            results[str(unit_count)][name] = result
+            log(f"{unit_count:>6}개  {name:<24} {result['seconds']:>9.4f}초  {result['peak_mb']:>8.2f}MB")
+    return results
+
+
+# 기준값보다 tolerance배 넘게 느리거나 메모리를 더 쓰는 단계 목록
+def find_regressions(results, baseline_results, tolerance):
+    regressions = []
+    for size, stage_results in results.items():
+        for name, result in stage_results.items():
+            base = baseline_results.get(size, {}).get(name)
+            if base is None:
+                continue
+            if result["seconds"] > base["seconds"] * tolerance and result["seconds"] - base["seconds"] > MIN_SECONDS_DIFF:
+                regressions.append((size, name, "시간", base["seconds"], result["seconds"]))
+            if result["peak_mb"] > base["peak_mb"] * tolerance and result["peak_mb"] - base["peak_mb"] > MIN_PEAK_MB_DIFF:
+                regressions.append((size, name, "메모리", base["peak_mb"], result["peak_mb"]))
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="업로드 읽기, 부담작업 판정, 내보내기 성능을 측정합니다.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="측정할 단위작업 수 (기본값: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="단계별 반복 횟수, 가장 빠른 시간을 사용 (기본값: %(default)s)")
+    parser.add_argument("--stages", nargs="+", default=None, help=f"측정할 단계 이름 (기본값: 전체 - {', '.join(name for name, _, _ in STAGES)})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="기준값 파일 (기본값: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="측정 결과를 기준값 파일에 저장 (이미 있는 다른 규모의 결과는 유지)")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="회귀로 판단하는 배율 (기본값: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="가상 작업목록 난수 시드 (기본값: %(default)s)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    results = run_benchmarks(args.sizes, repeat=args.repeat, stages=args.stages, seed=args.seed)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else None
+
+    if args.save:
+        saved_results = baseline["results"] if baseline else {}
+        for size, stage_results in results.items():
+            saved_results.setdefault(size, {}).update(stage_results)
+        payload = {"environment": environment_info(), "repeat": args.repeat, "seed": args.seed, "results": saved_results}
+        args.baseline.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"기준값 파일이 없습니다: {args.baseline} (--save로 저장)")
+        return 0
+
+    print(f"기준값 환경: {json.dumps(baseline['environment'], ensure_ascii=False)}")
+    print(f"현재 환경:   {json.dumps(environment_info(), ensure_ascii=False)}")
+    regressions = find_regressions(results, baseline["results"], args.tolerance)
+    for size, name, kind, base_value, value in regressions:
+        print(f"회귀: {size}개 {name} {kind} {base_value} -> {value}")
+    if not regressions:
+        print(f"기준값 대비 {args.tolerance}배를 넘는 회귀 없음")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# 업로드 캐시(WorkbookCache)의 용량/보관 시간 제한과 세션 간 copy-on-write 확인
+#
+#   python -m pytest tests
+import io
+
+import pytest
+
+from worklist import cache, export, synthetic
+from worklist.importer import load_task_units
+from worklist.records import unit_to_dict
+
+
+# 시각을 직접 정하는 시계 (time.monotonic 대신)
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", fake_clock)
+    return fake_clock
+
+
+def payload(size):
+    return b"x" * (size - cache.estimate_size(b""))
+
+
+def test_evicts_least_recently_used_first(clock):
+    workbook_cache = cache.WorkbookCache(max_bytes=3000, max_age_seconds=3600)
+    for key in "abc":
+        assert workbook_cache.put(key, payload(1000))
+    assert workbook_cache.total_bytes == 3000
+
+    assert workbook_cache.get("a") is not None # a를 최근 사용으로
+    workbook_cache.put("d", payload(1000))
+    assert workbook_cache.get("b") is None
+    assert [key for key in "acd" if workbook_cache.get(key) is not None] == ["a", "c", "d"]
+
+    # 큰 항목 하나가 들어오면 필요한 만큼 오래된 순서로 제거
+    workbook_cache.put("e", payload(2000))
+    assert [key for key in "acde" if workbook_cache.get(key) is not None] == ["d", "e"]
+    assert workbook_cache.total_bytes == 3000
+    assert workbook_cache.evictions == 3
+
+
+def test_rejects_value_larger_than_budget(clock):
+    workbook_cache = cache.WorkbookCache(max_bytes=3000, max_age_seconds=3600)
+    workbook_cache.put("a", payload(1000))
+    assert not workbook_cache.put("big", payload(4000))
+    assert workbook_cache.get("a") is not None
+    assert workbook_cache.get("big") is None
+
+
+def test_replacing_key_keeps_size(clock):
+    workbook_cache = cache.WorkbookCache(max_bytes=3000, max_age_seconds=3600)
+    workbook_cache.put("a", payload(1000))
+    workbook_cache.put("a", payload(1500))
+    assert len(workbook_cache) == 1
+    assert workbook_cache.total_bytes == 1500
+
+
+def test_expires_after_max_age(clock):
+    workbook_cache = cache.WorkbookCache(max_bytes=10000, max_age_seconds=60)
+    workbook_cache.put("a", payload(1000))
+    clock.now += 30
+    workbook_cache.put("b", payload(1000))
+    clock.now += 30
+    assert workbook_cache.get("a") is not None # 보관 시간과 같은 시점까지는 유지
+    clock.now += 1
+    assert workbook_cache.get("a") is None # 조회해도 보관 시간은 늘어나지 않음
+    assert workbook_cache.get("b") is not None
+    assert workbook_cache.expirations == 1
+    assert workbook_cache.total_bytes == 1000
+    assert workbook_cache.stats()["만료 제거"] == 1
+
+
+@pytest.fixture
+def cached_units():
+    task_units, _ = load_task_units(io.BytesIO(export.build_export_bytes(synthetic.make_task_units(20, seed=4))))
+    workbook_cache = cache.WorkbookCache(max_bytes=64 * 1024 * 1024, max_age_seconds=3600)
+    workbook_cache.put("key", (task_units, {}, "", []))
+    return workbook_cache, [unit_to_dict(unit) for unit in task_units]
+
+
+# 같은 파일을 올린 두 세션: 한 세션에서 고친 내용이 다른 세션이나 캐시에 보이지 않아야 함
+def test_copy_on_write_between_sessions(cached_units):
+    workbook_cache, original = cached_units
+    units_a, shared_a = cache.share_units(workbook_cache.get("key")[0])
+    units_b, shared_b = cache.share_units(workbook_cache.get("key")[0])
+    assert all(unit_a is unit_b for unit_a, unit_b in zip(units_a, units_b))
+
+    unit = cache.own_unit(units_a, shared_a, 3)
+    unit["단위작업명"] = "A 세션에서 수정"
+    unit["보호구"].append("허리보호대")
+    unit["유해요인_원인분석"][0]["유형"] = "과도한 힘"
+    unit["유해요인_원인분석"].append({"유형": ""})
+    units_a.pop(0)
+    assert cache.own_unit(units_a, shared_a, 2) is unit # 한 번 복사한 단위작업은 다시 복사하지 않음
+
+    cached = workbook_cache.get("key")[0]
+    assert [unit_to_dict(unit) for unit in cached] == original
+    assert [unit_to_dict(unit) for unit in units_b] == original
+    assert units_b[3] is cached[3]
+    assert len(shared_a) == len(original) - 1 and len(shared_b) == len(original)
@@ -0,0 +1,119 @@
+# 부담작업 일괄 판정(criteria.apply_burden_criteria / evaluate_task_units)이
+# 입력 화면의 단위작업별 판정(criteria.update_burden_criteria)과 같은 결과를 내는지 확인
+#
+#   python -m pytest tests
+import io
+import random
+
+import pytest
+
+from worklist import criteria, export, synthetic
+from worklist.importer import load_task_units
+from worklist.records import HazardRecord, UnitRecord, clone_unit
+from worklist.schema import (
+    BURDEN_COLUMNS,
+    HAZARD_TYPE_FORCE,
+    HAZARD_TYPE_OTHER,
+    HAZARD_TYPE_POSTURE,
+    HAZARD_TYPE_REPEAT,
+)
+
+
+# 가상 작업목록 파일을 내보냈다가 다시 읽은 단위작업 (업로드와 같은 값: 빈 셀 NaN, 단위가 붙은 문자열 등)
+@pytest.fixture(scope="module")
+def uploaded_units():
+    workbook = export.build_export_bytes(synthetic.make_task_units(1000, seed=11), "xlsx")
+    task_units, _ = load_task_units(io.BytesIO(workbook))
+    return task_units
+
+
+# 파일에 저장되어 있던 판정 (병합 규칙을 확인하도록 O, △, X, 빈 값을 섞음)
+def with_existing_flags(task_units, seed):
+    rng = random.Random(seed)
+    copies = [clone_unit(unit) for unit in task_units]
+    for unit in copies:
+        for col in BURDEN_COLUMNS:
+            flag = rng.choice(["O", "△", "X", "X", None])
+            if flag is None:
+                unit.pop(col, None)
+            else:
+                unit[col] = flag
+    return copies
+
+
+def per_unit_flags(task_units):
+    flags = []
+    for unit in task_units:
+        unit = clone_unit(unit)
+        criteria.update_burden_criteria(unit)
+        flags.append([unit[col] for col in BURDEN_COLUMNS])
+    return flags
+
+
+def test_every_rule_is_exercised(uploaded_units):
+    seen = set()
+    for unit in uploaded_units:
+        for hazard_entry in unit["유해요인_원인분석"]:
+            for burden_no, flag in criteria.evaluate_hazard_entry(hazard_entry).items():
+                seen.add((hazard_entry["유형"], burden_no, flag))
+    for rule in criteria.BURDEN_RULES:
+        assert (rule.hazard_type, rule.burden_no, "△") in seen, rule
+        if rule.conditions:
+            assert (rule.hazard_type, rule.burden_no, "O") in seen, rule
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_apply_matches_per_unit(uploaded_units, seed):
+    task_units = with_existing_flags(uploaded_units, seed)
+    expected = per_unit_flags(task_units)
+    criteria.apply_burden_criteria(task_units)
+    assert [[unit.get(col) for col in BURDEN_COLUMNS] for unit in task_units] == expected
+
+
+def test_evaluate_task_units_matches_per_unit(uploaded_units):
+    task_units = with_existing_flags(uploaded_units, 3)
+    matrix = criteria.evaluate_task_units(task_units)
+    assert matrix[BURDEN_COLUMNS].values.tolist() == per_unit_flags(task_units)
+
+
+# merge_existing=False는 저장된 판정 없이(모두 X) 단위작업별로 판정한 것과 같음
+def test_without_existing_flags(uploaded_units):
+    task_units = with_existing_flags(uploaded_units, 4)
+    cleared = [clone_unit(unit) for unit in task_units]
+    for unit in cleared:
+        for col in BURDEN_COLUMNS:
+            unit[col] = "X"
+    matrix = criteria.evaluate_task_units(task_units, merge_existing=False)
+    assert matrix[BURDEN_COLUMNS].values.tolist() == per_unit_flags(cleared)
+
+
+# 선택지에 없는 부담작업 문자열 (같은 그룹의 규칙 여러 개, 그룹 없이 12호만, 유형과 맞지 않는 표시, 단위 표기)
+HAND_WRITTEN_HAZARDS = [
+    {"유형": HAZARD_TYPE_REPEAT, "부담작업": "(2호)반복+(7호)들기", "이 작업시간(분)": "3시간"},
+    {"유형": HAZARD_TYPE_REPEAT, "부담작업": "(10호)들기+(1호)입력", "이 작업시간(분)": 100},
+    {"유형": HAZARD_TYPE_REPEAT, "부담작업": "(12호)정적자세", "이 작업시간(분)": 300},
+    {"유형": HAZARD_TYPE_REPEAT, "부담작업": "(10호)들기", "이 작업시간(분)": "150분", "분당 반복횟수(회/분)_10호": "3회", "물체 무게(kg)_10호": "5000g"},
+    {"유형": HAZARD_TYPE_POSTURE, "부담작업": "", "부담작업자세": "(3호)+(5호)", "이 작업시간(분)": "2시간"},
+    {"유형": HAZARD_TYPE_FORCE, "부담작업": "(9호)+(8호)+(12호)밀기/당기기", "중량물 무게(kg)": "30kg", "하루 8시간동안 중량물을 드는 횟수(회)": "12회"},
+    {"유형": HAZARD_TYPE_OTHER, "부담작업": "(11호)+(12호)진동작업", "작업시간(분)": "잘못된 값"},
+    {"유형": HAZARD_TYPE_OTHER, "부담작업": "(3호)자세"},
+]
+
+
+def test_hand_written_options():
+    task_units = [
+        UnitRecord({"단위작업명": f"작업{i}", "유해요인_원인분석": [HazardRecord(hazard_entry)]})
+        for i, hazard_entry in enumerate(HAND_WRITTEN_HAZARDS)
+    ]
+    task_units.append(UnitRecord({"단위작업명": "전부", "유해요인_원인분석": [HazardRecord(hazard_entry) for hazard_entry in HAND_WRITTEN_HAZARDS]}))
+    expected = per_unit_flags(task_units)
+    assert expected[0][1] == "O" and expected[0][6] == "X" # 같은 그룹은 먼저 일치한 규칙만
+    assert expected[2][11] == "X" # 12호 정적자세는 반복 그룹 규칙이 적용된 항목만
+    criteria.apply_burden_criteria(task_units)
+    assert [[unit.get(col) for col in BURDEN_COLUMNS] for unit in task_units] == expected
+
+
+def test_dict_units_and_empty_list(uploaded_units):
+    dict_units = [dict(unit, 유해요인_원인분석=[dict(hazard) for hazard in unit["유해요인_원인분석"]]) for unit in uploaded_units[:50]]
+    assert criteria.evaluate_task_units(dict_units).values.tolist() == per_unit_flags(uploaded_units[:50])
+    assert criteria.evaluate_task_units([]).shape == (0, len(BURDEN_COLUMNS))
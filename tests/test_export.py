@@ -0,0 +1,95 @@
+# 내보내기 캐시 키(작업목록 내용 해시)와 캐시 크기 제한, 소속/반별 나눠 내보내기 확인
+#
+#   python -m pytest tests
+import io
+import zipfile
+
+import pytest
+
+from worklist import export, store, synthetic
+from worklist.cache import WorkbookCache
+from worklist.importer import read_worklist_tables
+from worklist.records import clone_unit
+from worklist.schema import UNIT_UID_KEY
+
+
+@pytest.fixture
+def task_units():
+    return synthetic.make_task_units(40, seed=5)
+
+
+# 다른 세션/업로드에서 만든 같은 내용의 목록 (고유ID만 다름)
+def other_session_copy(task_units):
+    copies = [clone_unit(unit) for unit in task_units]
+    for unit in copies:
+        unit.pop(UNIT_UID_KEY, None)
+        store.ensure_uid(unit)
+    return copies
+
+
+def test_hash_ignores_session_uid(task_units):
+    for unit in task_units:
+        store.ensure_uid(unit)
+    copies = other_session_copy(task_units)
+    assert [unit[UNIT_UID_KEY] for unit in copies] != [unit[UNIT_UID_KEY] for unit in task_units]
+    assert export.task_units_hash(copies) == export.task_units_hash(task_units)
+
+
+def test_hash_changes_with_content(task_units):
+    before = export.task_units_hash(task_units)
+    copies = other_session_copy(task_units)
+    copies[7]["유해요인_원인분석"][0]["부담부위"] = "허리"
+    assert export.task_units_hash(copies) != before
+    copies = other_session_copy(task_units)
+    copies[0]["단위작업명"] += " (수정)"
+    assert export.task_units_hash(copies) != before
+
+
+def test_export_cache_reuses_file_across_sessions(task_units, monkeypatch):
+    monkeypatch.setattr(export, "export_cache", WorkbookCache(max_bytes=64 * 1024 * 1024, max_age_seconds=3600))
+    data = export.get_export_bytes(task_units, "csv")
+    assert export.get_export_bytes(other_session_copy(task_units), "csv") is data
+    assert export.export_cache.hits == 1
+
+
+def test_export_cache_bounded_by_bytes(task_units, monkeypatch):
+    file_size = len(export.build_export_bytes(task_units, "xlsx"))
+    monkeypatch.setattr(export, "export_cache", WorkbookCache(max_bytes=int(file_size * 2.5), max_age_seconds=3600))
+    for name in ["가", "나", "다", "라"]:
+        copies = other_session_copy(task_units)
+        copies[0]["단위작업명"] = name
+        export.get_export_bytes(copies, "xlsx")
+    assert len(export.export_cache) == 2
+    assert export.export_cache.total_bytes <= export.export_cache.max_bytes
+    assert export.export_cache.evictions == 2
+
+
+# 소속/반별 나눠 내보내기: 묶음마다 zip 안에 파일 1개, 파일마다 그 묶음의 단위작업만 원래 순서대로
+@pytest.mark.parametrize("workers", [1, 2])
+def test_split_zip_one_file_per_group(task_units, workers):
+    task_units = [clone_unit(unit) for unit in task_units]
+    task_units[0].update({"소속": "", "반": ""}) # 빈 소속/반은 미정소속/미정반
+    task_units[1].update({"소속": "생산 1팀", "반": "A"}) # 파일 이름이 같아지는 묶음은 뒤에 번호
+    task_units[2].update({"소속": "생산/1팀", "반": "A"})
+    groups = export.group_units(task_units)
+    assert len(groups) > 3
+
+    target = io.BytesIO()
+    progress = []
+    export.write_split_zip(task_units, target, "xlsx", progress=lambda done, total: progress.append((done, total)), workers=workers)
+    assert progress[0] == (0, len(task_units)) and progress[-1] == (len(task_units), len(task_units))
+
+    with zipfile.ZipFile(target) as archive:
+        members = {name: archive.read(name) for name in archive.namelist()}
+    assert len(members) == len(groups)
+    assert any("_미정소속_미정반_" in name for name in members)
+    assert sum("_생산_1팀_A_" in name for name in members) == 2
+    assert any("(2).xlsx" in name for name in members)
+
+    expected_names = sorted(tuple(unit["단위작업명"] for unit in units) for units in groups.values())
+    member_names = []
+    for name, data in members.items():
+        assert name.startswith("작업목록표_") and name.endswith(".xlsx")
+        df, _, _ = read_worklist_tables(data)
+        member_names.append(tuple(df["단위작업명"].tolist()))
+    assert sorted(member_names) == expected_names
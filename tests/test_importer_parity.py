@@ -0,0 +1,177 @@
+# 업로드 변환(importer.decode_task_units)이 기존 화면 코드의 행 단위(iterrows) 변환과 같은 결과를 내는지 확인
+#
+#   python -m pytest tests
+#
+# 기준 변환(decode_rows_baseline)은 기존 app.py의 업로드 코드를 그대로 옮긴 것이고, 다음만 다름
+# - 접촉스트레스/기타 11호 작업시간은 부담작업 값에 "(11호)"가 들어 있으면 읽음 (내보내기와 같은 기준)
+# - 쓰이지 않던 "자세", "중량물", "도구" 빈 항목은 만들지 않음
+# - 비어 있는 1일 작업시간은 NaN 대신 0 (화면에서 고치지 않는 값이므로 업로드할 때 한 번만 정리)
+import io
+import math
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from worklist import export, synthetic
+from worklist.importer import decode_task_units, read_worklist_tables
+from worklist.schema import HAZARD_TYPE_FORCE, HAZARD_TYPE_OTHER, HAZARD_TYPE_POSTURE, HAZARD_TYPE_REPEAT
+
+
+def decode_rows_baseline(df_uploaded):
+    loaded_task_units = []
+    for index, row in df_uploaded.iterrows():
+        unit = {
+            "회사명": str(row.get("회사명", "")).strip(),
+            "소속": str(row.get("소속", "")).strip(),
+            "반": str(row.get("반", "")).strip(),
+            "단위작업명": str(row.get("단위작업명", "")).strip(),
+            "작업내용(상세설명)": str(row.get("작업내용(상세설명)", "")).strip(),
+            "작업자 수": int(row.get("작업자 수", 1)) if pd.notna(row.get("작업자 수")) else 1,
+            "작업자 이름": str(row.get("작업자 이름", "")).strip(),
+            "작업형태": str(row.get("작업형태", "주간")).strip(),
+            "1일 작업시간": row.get("1일 작업시간", 0) if pd.notna(row.get("1일 작업시간")) else 0,
+            "유해요인_원인분석": [],
+            "보호구": [],
+            "작성자": str(row.get("작성자", "")).strip(),
+            "연락처": str(row.get("연락처", "")).strip()
+        }
+
+        protection_gear_str = row.get("보호구", "")
+        if pd.notna(protection_gear_str) and str(protection_gear_str).strip():
+            unit["보호구"] = [item.strip() for item in str(protection_gear_str).split(",") if item.strip()]
+
+        for k_crit in range(1, 13):
+            col_name = f"부담작업_{k_crit}호"
+            value = row.get(col_name, "X")
+            unit[col_name] = str(value).strip() if pd.notna(value) else "X"
+
+        for j_hazard in range(5):
+            n = j_hazard + 1
+            hazard_type = row.get(f"유해요인_원인분석_유형_{n}")
+            if pd.notna(hazard_type) and str(hazard_type).strip() != "":
+                hazard_entry = {"유형": hazard_type}
+
+                if hazard_type == "반복동작":
+                    hazard_entry["부담작업"] = row.get(f"유해요인_원인분석_부담작업_{n}_반복", "")
+                    hazard_entry["수공구 종류"] = row.get(f"유해요인_원인분석_수공구_종류_{n}", "")
+                    hazard_entry["수공구 용도"] = row.get(f"유해요인_원인분석_수공구_용도_{n}", "")
+                    hazard_entry["수공구 무게(kg)"] = row.get(f"유해요인_원인분석_수공구_무게(kg)_{n}", 0.0)
+                    hazard_entry["수공구 사용시간(분)"] = row.get(f"유해요인_원인분석_수공구_사용시간(분)_{n}", "")
+                    hazard_entry["부담부위"] = row.get(f"유해요인_원인분석_부담부위_{n}", "")
+                    hazard_entry["회당 반복시간(초/회)"] = row.get(f"유해요인_원인분석_반복_회당시간(초/회)_{n}", "")
+                    hazard_entry["작업시간동안 반복횟수(회/일)"] = row.get(f"유해요인_원인분석_반복_이횟수(회/일)_{n}", "")
+                    hazard_entry["이 작업시간(분)"] = row.get(f"유해요인_원인분석_반복_이시간(분)_{n}", "")
+                    hazard_entry["물체 무게(kg)_10호"] = row.get(f"유해요인_원인분석_반복_물체무게_10호(kg)_{n}", 0.0)
+                    hazard_entry["분당 반복횟수(회/분)_10호"] = row.get(f"유해요인_원인분석_반복_분당반복횟수_10호(회/분)_{n}", "")
+                    hazard_entry["작업내용_12호_정적"] = row.get(f"유해요인_원인분석_반복_작업내용_12호_정적_{n}", "")
+                    hazard_entry["작업시간(분)_12호_정적"] = row.get(f"유해요인_원인분석_반복_작업시간_12호_정적_{n}", "")
+                    hazard_entry["휴식시간(분)_12호_정적"] = row.get(f"유해요인_원인분석_반복_휴식시간_12호_정적_{n}", "")
+                    hazard_entry["인체부담부위_12호_정적"] = row.get(f"유해요인_원인분석_반복_인체부담부위_12호_정적_{n}", "")
+
+                elif hazard_type == "부자연스러운 자세":
+                    hazard_entry["부담작업자세"] = row.get(f"유해요인_원인분석_부담작업자세_{n}", "")
+                    hazard_entry["회당 반복시간(초/회)"] = row.get(f"유해요인_원인분석_자세_회당시간(초/회)_{n}", "")
+                    hazard_entry["작업시간동안 반복횟수(회/일)"] = row.get(f"유해요인_원인분석_자세_이횟수(회/일)_{n}", "")
+                    hazard_entry["이 작업시간(분)"] = row.get(f"유해요인_원인분석_자세_이시간(분)_{n}", "")
+
+                elif hazard_type == "과도한 힘":
+                    hazard_entry["부담작업"] = row.get(f"유해요인_원인분석_부담작업_{n}_힘", "")
+                    hazard_entry["중량물 명칭"] = row.get(f"유해요인_원인분석_힘_중량물_명칭_{n}", "")
+                    hazard_entry["중량물 용도"] = row.get(f"유해요인_원인분석_힘_중량물_용도_{n}", "")
+                    hazard_entry["중량물 무게(kg)"] = row.get(f"유해요인_원인분석_중량물_무게(kg)_{n}", 0.0)
+                    hazard_entry["하루 8시간동안 중량물을 드는 횟수(회)"] = row.get(f"유해요인_원인분석_하루8시간_중량물_횟수(회)_{n}", 0)
+                    hazard_entry["취급방법"] = row.get(f"유해요인_원인분석_힘_취급방법_{n}", "")
+                    hazard_entry["중량물 이동방법"] = row.get(f"유해요인_원인분석_힘_이동방법_{n}", "")
+                    hazard_entry["작업자가 직접 밀고/당기기"] = row.get(f"유해요인_원인분석_힘_직접_밀당_{n}", "")
+                    hazard_entry["기타_밀당_설명"] = row.get(f"유해요인_원인분석_힘_기타_밀당_설명_{n}", "")
+                    hazard_entry["작업시간동안 작업횟수(회/일)"] = row.get(f"유해요인_원인분석_힘_이횟수(회/일)_{n}", "")
+
+                elif hazard_type == "접촉스트레스 또는 기타(진동, 밀고 당기기 등)":
+                    hazard_entry["부담작업"] = row.get(f"유해요인_원인분석_부담작업_{n}_기타", "")
+                    if "(11호)" in str(hazard_entry["부담작업"]):
+                        hazard_entry["작업시간(분)"] = row.get(f"유해요인_원인분석_기타_작업시간(분)_{n}", "")
+                    elif hazard_entry["부담작업"] == "(12호)진동작업(그라인더, 임팩터 등)":
+                        hazard_entry["진동수공구명"] = row.get(f"유해요인_원인분석_기타_진동수공구명_{n}", "")
+                        hazard_entry["진동수공구 용도"] = row.get(f"유해요인_원인분석_기타_진동수공구_용도_{n}", "")
+                        hazard_entry["작업시간(분)_진동"] = row.get(f"유해요인_원인분석_기타_작업시간_진동_{n}", "")
+                        hazard_entry["작업빈도(초/회)_진동"] = row.get(f"유해요인_원인분석_기타_작업빈도_진동_{n}", "")
+                        hazard_entry["작업량(회/일)_진동"] = row.get(f"유해요인_원인분석_기타_작업량_진동_{n}", "")
+                        hazard_entry["수공구사용시 지지대가 있는가?"] = row.get(f"유해요인_원인분석_기타_지지대_여부_{n}", "")
+
+                unit["유해요인_원인분석"].append(hazard_entry)
+
+        if not any([unit["회사명"], unit["단위작업명"], unit["작업내용(상세설명)"]]):
+            continue
+
+        if not unit["유해요인_원인분석"]:
+            unit["유해요인_원인분석"].append({"유형": "", "부담작업": "", "부담작업자세": ""})
+
+        loaded_task_units.append(unit)
+    return loaded_task_units
+
+
+# 비교용 값 (NaN끼리 같게, numpy 숫자는 파이썬 숫자로, 레코드는 dict로)
+def normalize(value):
+    if isinstance(value, float) and math.isnan(value):
+        return "<NaN>"
+    if isinstance(value, Mapping):
+        return {key: normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [normalize(item) for item in value]
+    if isinstance(value, np.generic):
+        return normalize(value.item())
+    return value
+
+
+def assert_same_units(df):
+    expected = normalize(decode_rows_baseline(df))
+    actual = normalize(decode_task_units(df))
+    assert len(actual) == len(expected)
+    for row, (expected_unit, actual_unit) in enumerate(zip(expected, actual)):
+        assert actual_unit == expected_unit, f"{row}번째 단위작업"
+
+
+def read_workbook(task_units):
+    df, _, _ = read_worklist_tables(io.BytesIO(export.build_export_bytes(task_units, "xlsx")))
+    return df
+
+
+@pytest.fixture(scope="module")
+def mixed_df():
+    return read_workbook(synthetic.make_task_units(300, seed=7))
+
+
+def test_all_hazard_types(mixed_df):
+    assert set(mixed_df["유해요인_원인분석_유형_1"].dropna()) == {
+        HAZARD_TYPE_REPEAT, HAZARD_TYPE_POSTURE, HAZARD_TYPE_FORCE, HAZARD_TYPE_OTHER
+    }
+    assert_same_units(mixed_df)
+
+
+# 접촉스트레스/기타만 (11호 작업시간, 12호 진동작업 세부 항목)
+def test_other_sub_fields():
+    df = read_workbook(synthetic.make_task_units(200, hazard_mix={HAZARD_TYPE_OTHER: 1}, seed=3))
+    burden_tasks = df["유해요인_원인분석_부담작업_1_기타"].astype(str)
+    assert burden_tasks.str.contains("(11호)", regex=False).any()
+    assert burden_tasks.str.contains("(12호)진동작업", regex=False).any()
+    assert df["유해요인_원인분석_기타_작업시간(분)_1"].notna().any()
+    assert_same_units(df)
+
+
+# 빈 셀(NaN), 빠진 컬럼, 공백만 있는 유형/기본 정보 행
+def test_blank_cells_and_missing_columns(mixed_df):
+    df = mixed_df.copy()
+    df.loc[0:30, ["작업자 수", "보호구", "부담작업_2호", "1일 작업시간", "작성자"]] = np.nan
+    df.loc[31:60, "유해요인_원인분석_부담작업_1_반복"] = np.nan
+    df.loc[61:80, "유해요인_원인분석_유형_1"] = "  "
+    df.loc[81:90, "유해요인_원인분석_유형_2"] = " 반복동작"
+    df.loc[91:100, ["회사명", "단위작업명", "작업내용(상세설명)"]] = " "
+    df.loc[101:110, ["회사명", "단위작업명", "작업내용(상세설명)"]] = np.nan
+    df = df.drop(columns=["보호구", "부담작업_3호", "유해요인_원인분석_수공구_무게(kg)_2", "유해요인_원인분석_유형_5"])
+    assert_same_units(df)
+
+
+def test_empty_sheet(mixed_df):
+    assert_same_units(mixed_df.iloc[0:0])
@@ -0,0 +1,120 @@
+# 숫자 입력값 변환(parse_numbers / parse_number): 단위 환산, 잘못된 값 표시, 컬럼 변환과 값 1개 변환의 일치
+#
+#   python -m pytest tests
+import math
+
+import numpy as np
+import pytest
+
+from worklist.numeric import UNIT_SCALES, input_number, parse_number, parse_numbers
+
+# (입력값, 단위 종류, 기준 단위 값 또는 None(NaN), 잘못된 값인지)
+CASES = [
+    # 숫자와 숫자 문자열
+    (12, "분", 12.0, False),
+    (12.5, "kg", 12.5, False),
+    (np.int64(3), "회", 3.0, False),
+    ("7", "명", 7.0, False),
+    (" 7.5 ", "분", 7.5, False),
+    ("1,200", "회", 1200.0, False),
+    (".5", "시간", 0.5, False),
+    ("-3", "분", -3.0, False),
+    ("1e2", "초", 100.0, False),
+    # 단위 표기 (기준 단위로 환산, 대소문자와 공백 무시)
+    ("2시간", "분", 120.0, False),
+    ("90초", "분", 1.5, False),
+    ("1.5 분", "초", 90.0, False),
+    ("480분", "시간", 8.0, False),
+    ("2시간", "초", 7200.0, False),
+    ("5000g", "kg", 5.0, False),
+    ("25KG", "kg", 25.0, False),
+    ("3번", "회", 3.0, False),
+    ("4명", "명", 4.0, False),
+    ("10회/분", "회", 10.0, False),
+    ("3초/회", "초", 3.0, False),
+    ("1,500회/일", "회", 1500.0, False),
+    # 단위 종류를 정하지 않으면 알려진 단위는 모두 허용하고 환산하지 않음
+    ("2시간", None, 2.0, False),
+    ("500g", None, 500.0, False),
+    # 빈 값 (NaN, 잘못된 값 아님)
+    (None, "분", None, False),
+    (float("nan"), "분", None, False),
+    ("", "분", None, False),
+    ("   ", "kg", None, False),
+    ("nan", "회", None, False),
+    ("None", "명", None, False),
+    # 잘못된 값 (NaN, 잘못된 값)
+    ("약 3시간", "분", None, True),
+    ("두 시간", "분", None, True),
+    ("3kg", "분", None, True),
+    ("2일", "시간", None, True),
+    ("3시간", "명", None, True),
+    ("12호", None, None, True),
+    ("1-2", "분", None, True),
+]
+
+
+def assert_number(actual, expected):
+    if expected is None:
+        assert math.isnan(actual)
+    else:
+        assert actual == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("value,kind,expected,invalid", CASES)
+def test_parse_number(value, kind, expected, invalid):
+    number, is_invalid = parse_number(value, kind)
+    assert_number(number, expected)
+    assert is_invalid == invalid
+
+
+# 컬럼 전체 변환은 같은 단위 종류의 값 1개 변환과 같은 결과
+@pytest.mark.parametrize("kind", sorted({kind for _, kind, _, _ in CASES if kind is not None}) + [None])
+def test_parse_numbers_matches_scalar(kind):
+    values = [value for value, case_kind, _, _ in CASES] # 다른 단위 종류의 값도 함께 섞어서 변환
+    numbers, invalid = parse_numbers(values, kind)
+    assert numbers.dtype == float and invalid.dtype == bool
+    assert len(numbers) == len(invalid) == len(values)
+    for value, number, is_invalid in zip(values, numbers, invalid):
+        expected, expected_invalid = parse_number(value, kind)
+        assert (math.isnan(number) and math.isnan(expected)) or number == pytest.approx(expected), value
+        assert is_invalid == expected_invalid, value
+
+
+@pytest.mark.parametrize("value,kind,expected,invalid", CASES)
+def test_parse_numbers_cases(value, kind, expected, invalid):
+    numbers, invalid_mask = parse_numbers([value], kind)
+    assert_number(numbers[0], expected)
+    assert invalid_mask.tolist() == [invalid]
+
+
+# 단위 종류마다 모든 단위 표기가 배수대로 환산됨
+@pytest.mark.parametrize("kind", sorted(UNIT_SCALES))
+def test_every_unit_scale(kind):
+    units = list(UNIT_SCALES[kind])
+    numbers, invalid = parse_numbers([f"3{unit}" for unit in units], kind)
+    assert not invalid.any()
+    assert numbers.tolist() == pytest.approx([3 * UNIT_SCALES[kind][unit] for unit in units])
+    for unit in units:
+        assert parse_number(f"3{unit}", kind) == (pytest.approx(3 * UNIT_SCALES[kind][unit]), False)
+
+
+def test_empty_column():
+    numbers, invalid = parse_numbers([], "분")
+    assert numbers.shape == invalid.shape == (0,)
+
+
+# 숫자 입력칸 값: default 타입으로 맞추고, 빈 값/잘못된 값은 default, min_value보다 작으면 min_value
+@pytest.mark.parametrize("value,default,min_value,kind,expected", [
+    (12.0, 1, None, "명", 12),
+    ("3명", 1, 1, "명", 3),
+    (float("nan"), 1, 1, "명", 1),
+    ("모름", 0.0, None, "kg", 0.0),
+    ("5000g", 0.0, None, "kg", 5.0),
+    (0, 1, 1, "명", 1),
+    ("inf", 0, None, "회", 0),
+])
+def test_input_number(value, default, min_value, kind, expected):
+    number = input_number(value, default, min_value=min_value, kind=kind)
+    assert number == expected
+    assert type(number) is type(default)
@@ -0,0 +1,29 @@
+# Streamlit 내부 상태를 읽는 측정 함수가 읽지 못할 때 None/False로 물러나는지 확인
+#
+#   python -m pytest tests
+from worklist import profiling
+
+
+class BrokenContext:
+    @property
+    def shared(self):
+        raise RuntimeError("내부 구조가 바뀐 경우")
+
+    @property
+    def fragment_ids_this_run(self):
+        raise RuntimeError("내부 구조가 바뀐 경우")
+
+
+def test_outside_script_run():
+    assert profiling.count_rendered_widgets() is None
+    assert profiling.is_fragment_rerun() is False
+
+
+def test_changed_internals(monkeypatch):
+    monkeypatch.setattr(profiling, "_script_run_ctx", BrokenContext)
+    assert profiling.count_rendered_widgets() is None
+    assert profiling.is_fragment_rerun() is False
+    profile = profiling.RerunProfile("세션", 1, widget_counter=profiling.count_rendered_widgets)
+    profile.start_unit(0)
+    profile.end_unit()
+    assert profile.unit_rows() == [{"번호": 1, "시간(ms)": profile.unit_rows()[0]["시간(ms)"], "위젯 수": None}]
@@ -0,0 +1,127 @@
+# 자동 저장소(AutosaveStore)와 WorkspaceTracker: 바뀐 내용만 저장, 불러와서 이어서 저장, 삭제, 브라우저 토큰별 구분
+#
+#   python -m pytest tests
+import sqlite3
+
+import pytest
+
+from worklist import store, synthetic
+from worklist.records import clone_unit, unit_to_dict
+from worklist.schema import HAZARD_KEY
+
+HEADER = {"회사명": "가나산업", "소속": "생산1팀", "반": "조립반"}
+
+
+@pytest.fixture
+def autosave_store(tmp_path):
+    return store.AutosaveStore(str(tmp_path / "autosave.sqlite3"))
+
+
+@pytest.fixture
+def task_units():
+    task_units = synthetic.make_task_units(12, seed=9)
+    for unit in task_units:
+        unit.setdefault(HAZARD_KEY, []).append({"유형": "기타", "부담작업": "", "기타(진동)": "추가 항목"})
+    return task_units
+
+
+def test_owner_token():
+    token = store.owner_token()
+    assert store.owner_token(token) == token
+    assert store.owner_token([token]) == token
+    assert store.owner_token("짧음") != "짧음"
+    assert store.owner_token("a' OR '1'='1' --------") != "a' OR '1'='1' --------"
+
+
+def test_saves_only_changed_units_and_hazards(autosave_store, task_units):
+    tracker = store.WorkspaceTracker("owner-a")
+    hazard_count = sum(len(unit[HAZARD_KEY]) for unit in task_units)
+    assert tracker.save(autosave_store, HEADER, task_units) == (len(task_units), hazard_count)
+    assert tracker.started
+    assert tracker.save(autosave_store, HEADER, task_units) == (0, 0)
+
+    task_units[3]["단위작업명"] = "수정한 작업"
+    task_units[5][HAZARD_KEY][0]["부담부위"] = "허리"
+    assert tracker.save(autosave_store, HEADER, task_units) == (1, 1)
+    # 페이지의 단위작업만 비교하면 다른 페이지의 변경은 다음 전체 비교까지 미룸
+    task_units[8]["단위작업명"] = "다른 페이지"
+    assert tracker.save(autosave_store, HEADER, task_units, unit_indices=range(0, 5)) == (0, 0)
+    assert tracker.save(autosave_store, HEADER, task_units) == (1, 0)
+
+    # 유해요인 항목을 줄이거나 단위작업을 지우면 남은 행도 정리
+    task_units[2][HAZARD_KEY].pop()
+    del task_units[0]
+    units_written, _ = tracker.save(autosave_store, HEADER, task_units, unit_indices=[1])
+    assert units_written == len(task_units) # 위치가 밀린 단위작업 전체
+    _, loaded = autosave_store.load_workspace(tracker.workspace_id, "owner-a")
+    assert [unit_to_dict(unit) for unit in loaded] == [unit_to_dict(unit) for unit in task_units]
+
+
+def test_header_change_is_saved(autosave_store, task_units):
+    tracker = store.WorkspaceTracker("owner-a")
+    tracker.save(autosave_store, HEADER, task_units)
+    assert tracker.save(autosave_store, dict(HEADER, 반="검사반"), task_units) == (0, 0)
+    assert autosave_store.list_workspaces("owner-a")[0]["반"] == "검사반"
+
+
+def test_resume_round_trip(autosave_store, task_units):
+    tracker = store.WorkspaceTracker("owner-a")
+    tracker.save(autosave_store, HEADER, task_units)
+
+    header, loaded = autosave_store.load_workspace(tracker.workspace_id, "owner-a")
+    assert header == HEADER
+    assert [unit_to_dict(unit) for unit in loaded] == [unit_to_dict(unit) for unit in task_units]
+
+    # 불러온 작업에 이어서 저장: 바뀌지 않은 내용은 다시 쓰지 않고 같은 작업으로 저장
+    resumed = store.WorkspaceTracker.from_loaded("owner-a", tracker.workspace_id, header, loaded)
+    assert resumed.save(autosave_store, header, loaded) == (0, 0)
+    loaded[1][HAZARD_KEY].append({"유형": "기타", "부담작업": ""})
+    assert resumed.save(autosave_store, header, loaded) == (0, 1)
+    assert len(autosave_store.list_workspaces("owner-a")) == 1
+    _, reloaded = autosave_store.load_workspace(tracker.workspace_id, "owner-a")
+    assert len(reloaded[1][HAZARD_KEY]) == len(task_units[1][HAZARD_KEY]) + 1
+
+
+def test_delete(autosave_store, task_units):
+    kept = store.WorkspaceTracker("owner-a")
+    kept.save(autosave_store, HEADER, task_units)
+    deleted = store.WorkspaceTracker("owner-a")
+    deleted.save(autosave_store, dict(HEADER, 반="검사반"), [clone_unit(unit) for unit in task_units[:3]])
+
+    assert autosave_store.delete_workspace(deleted.workspace_id, "owner-a")
+    assert [workspace["workspace_id"] for workspace in autosave_store.list_workspaces("owner-a")] == [kept.workspace_id]
+    with pytest.raises(KeyError):
+        autosave_store.load_workspace(deleted.workspace_id, "owner-a")
+    assert not autosave_store.delete_workspace(deleted.workspace_id, "owner-a")
+    connection = sqlite3.connect(autosave_store.path)
+    for table in ["units", "hazards"]:
+        assert connection.execute(f"SELECT COUNT(*) FROM {table} WHERE workspace_id = ?", (deleted.workspace_id,)).fetchone()[0] == 0
+    connection.close()
+
+
+def test_other_owner_cannot_list_load_or_delete(autosave_store, task_units):
+    tracker = store.WorkspaceTracker("owner-a")
+    tracker.save(autosave_store, HEADER, task_units)
+
+    assert autosave_store.list_workspaces("owner-b") == []
+    with pytest.raises(KeyError):
+        autosave_store.load_workspace(tracker.workspace_id, "owner-b")
+    assert not autosave_store.delete_workspace(tracker.workspace_id, "owner-b")
+    assert len(autosave_store.list_workspaces("owner-a")) == 1
+
+
+# 토큰 컬럼이 없던 예전 저장소도 열 수 있고, 예전 작업은 어느 토큰으로도 보이지 않음
+def test_old_store_without_owner_column(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        "CREATE TABLE workspaces (workspace_id TEXT PRIMARY KEY, company TEXT, department TEXT, team TEXT, unit_count INTEGER, updated_at REAL);"
+        "INSERT INTO workspaces VALUES ('old', '가나산업', '', '', 0, 0);"
+    )
+    connection.close()
+
+    autosave_store = store.AutosaveStore(path)
+    assert autosave_store.list_workspaces("owner-a") == []
+    tracker = store.WorkspaceTracker("owner-a")
+    tracker.save(autosave_store, HEADER, synthetic.make_task_units(2, seed=1))
+    assert [workspace["workspace_id"] for workspace in autosave_store.list_workspaces("owner-a")] == [tracker.workspace_id]
@@ -0,0 +1,212 @@
+# 업로드 검증(validate_tables / validate_chunk)이 잘못된 셀마다 ISSUE_COLUMNS 행 1개를 내는지 확인
+# 가상 작업목록 파일(문제 없음)을 내보냈다가 읽은 표에 알려진 잘못된 셀을 넣고, 나와야 하는 행과 정확히 비교
+#
+#   python -m pytest tests
+import numpy as np
+import pandas as pd
+import pytest
+
+from worklist import export, synthetic, validation
+from worklist.importer import read_worklist_tables
+from worklist.schema import (
+    BURDEN_OPTIONS,
+    HAZARD_SHEET_NAME,
+    HAZARD_TYPE_COLUMN,
+    HAZARD_TYPE_FORCE,
+    HAZARD_TYPE_OTHER,
+    HAZARD_TYPE_POSTURE,
+    HAZARD_TYPE_REPEAT,
+    UNIT_ID_COLUMN,
+    WORKLIST_SHEET_NAME,
+)
+
+SKIPPED = "회사명, 단위작업명, 작업내용(상세설명)이 모두 비어 있어 읽지 않음"
+UNKNOWN_TYPE = "알 수 없는 유형 (항목 내용을 읽지 않음)"
+UNKNOWN_OPTION = "선택지에 없는 부담작업 (입력 화면에서 선택되지 않음)"
+
+
+def option(hazard_type, marker):
+    return next(value for value in BURDEN_OPTIONS[hazard_type] if value.startswith(marker))
+
+
+def slot_column(hazard_type, key, slot=1):
+    return validation.SLOT_COLUMN_TEMPLATES[hazard_type][key].format(n=slot)
+
+
+def not_number(kind, note):
+    return f"숫자로 읽을 수 없음 (단위: {kind}, {note})"
+
+
+TYPE_1 = HAZARD_TYPE_COLUMN.format(n=1)
+CONDITION = "판정에서 조건을 만족하지 않음"
+
+# 가로형 양식 작업목록 시트: (행에 넣을 셀 값, 나와야 하는 문제 [(컬럼, 값, 오류)])
+# 사례마다 한 행을 쓰고(사례 순서 = 행 순서), 문제가 없어야 하는 값은 빈 목록
+WORKLIST_CASES = [
+    # 읽지 않는 행은 다른 셀을 검사하지 않음
+    ({"회사명": " ", "단위작업명": "", "작업내용(상세설명)": "  ", "작업자 수": "많음"}, [("회사명", " ", SKIPPED)]),
+    ({"작업자 수": "세 명"}, [("작업자 수", "세 명", "숫자로 읽을 수 없음 (1명으로 읽음)")]),
+    ({"작업자 수": 0}, [("작업자 수", "0", "1명 이상이어야 함")]),
+    ({"작업자 수": "3명"}, []),
+    ({"1일 작업시간": "하루종일"}, [("1일 작업시간", "하루종일", not_number("시간", "그대로 읽음"))]),
+    ({"1일 작업시간": "480분"}, []),
+    ({"부담작업_3호": "예"}, [("부담작업_3호", "예", "O, △, X 중 하나가 아님 (X로 판정)")]),
+    ({"부담작업_4호": " △ ", "부담작업_5호": np.nan}, []),
+    ({TYPE_1: "반복"}, [(TYPE_1, "반복", UNKNOWN_TYPE)]),
+    (
+        {TYPE_1: HAZARD_TYPE_REPEAT, slot_column(HAZARD_TYPE_REPEAT, "부담작업"): "(1호)직접 입력"},
+        [(slot_column(HAZARD_TYPE_REPEAT, "부담작업"), "(1호)직접 입력", UNKNOWN_OPTION)],
+    ),
+    (
+        {
+            TYPE_1: HAZARD_TYPE_REPEAT,
+            slot_column(HAZARD_TYPE_REPEAT, "부담작업"): option(HAZARD_TYPE_REPEAT, "(10호)"),
+            slot_column(HAZARD_TYPE_REPEAT, "이 작업시간(분)"): "두 시간",
+            slot_column(HAZARD_TYPE_REPEAT, "물체 무게(kg)_10호"): "무거움",
+            slot_column(HAZARD_TYPE_REPEAT, "분당 반복횟수(회/분)_10호"): "3회/분",
+        },
+        [
+            (slot_column(HAZARD_TYPE_REPEAT, "이 작업시간(분)"), "두 시간", not_number("분", CONDITION)),
+            (slot_column(HAZARD_TYPE_REPEAT, "물체 무게(kg)_10호"), "무거움", not_number("kg", CONDITION)),
+        ],
+    ),
+    (
+        {TYPE_1: HAZARD_TYPE_REPEAT, slot_column(HAZARD_TYPE_REPEAT, "수공구 무게(kg)"): "가벼움"},
+        [(slot_column(HAZARD_TYPE_REPEAT, "수공구 무게(kg)"), "가벼움", not_number("kg", "0으로 표시"))],
+    ),
+    # 다른 유형의 컬럼은 검사하지 않음
+    ({TYPE_1: HAZARD_TYPE_POSTURE, slot_column(HAZARD_TYPE_REPEAT, "이 작업시간(분)"): "두 시간"}, []),
+    (
+        {
+            TYPE_1: HAZARD_TYPE_POSTURE,
+            slot_column(HAZARD_TYPE_POSTURE, "부담작업자세"): "(3호)쪼그려 앉기",
+            slot_column(HAZARD_TYPE_POSTURE, "이 작업시간(분)"): "반나절",
+        },
+        [
+            (slot_column(HAZARD_TYPE_POSTURE, "부담작업자세"), "(3호)쪼그려 앉기", UNKNOWN_OPTION),
+            (slot_column(HAZARD_TYPE_POSTURE, "이 작업시간(분)"), "반나절", not_number("분", CONDITION)),
+        ],
+    ),
+    (
+        {
+            TYPE_1: HAZARD_TYPE_FORCE,
+            slot_column(HAZARD_TYPE_FORCE, "부담작업"): option(HAZARD_TYPE_FORCE, "(8호)"),
+            slot_column(HAZARD_TYPE_FORCE, "중량물 무게(kg)"): "25kg",
+            slot_column(HAZARD_TYPE_FORCE, "하루 8시간동안 중량물을 드는 횟수(회)"): "자주",
+        },
+        [(slot_column(HAZARD_TYPE_FORCE, "하루 8시간동안 중량물을 드는 횟수(회)"), "자주", not_number("회", CONDITION))],
+    ),
+    # 11호 작업시간은 부담작업에 (11호)가 있을 때만 읽음
+    (
+        {
+            TYPE_1: HAZARD_TYPE_OTHER,
+            slot_column(HAZARD_TYPE_OTHER, "부담작업"): option(HAZARD_TYPE_OTHER, "(11호)"),
+            slot_column(HAZARD_TYPE_OTHER, "작업시간(분)"): "오래",
+        },
+        [(slot_column(HAZARD_TYPE_OTHER, "작업시간(분)"), "오래", not_number("분", CONDITION))],
+    ),
+    (
+        {
+            TYPE_1: HAZARD_TYPE_OTHER,
+            slot_column(HAZARD_TYPE_OTHER, "부담작업"): option(HAZARD_TYPE_OTHER, "(12호)"),
+            slot_column(HAZARD_TYPE_OTHER, "작업시간(분)"): "오래",
+        },
+        [],
+    ),
+    # 두 번째 슬롯도 같은 기준
+    ({HAZARD_TYPE_COLUMN.format(n=2): "모름"}, [(HAZARD_TYPE_COLUMN.format(n=2), "모름", UNKNOWN_TYPE)]),
+]
+
+# 정규화 양식 유해요인 시트: (넣을 셀 값, 나와야 하는 문제), 단위작업ID가 비어 있는 행은 읽지 않음
+HAZARD_SHEET_CASES = [
+    ({UNIT_ID_COLUMN: 9999}, [(UNIT_ID_COLUMN, "9999", "작업목록 시트에 없는 단위작업ID (항목을 읽지 않음)")]),
+    ({UNIT_ID_COLUMN: np.nan, "유형": "반복"}, []),
+    ({"유형": "반복"}, [("유형", "반복", UNKNOWN_TYPE)]),
+    (
+        {"유형": HAZARD_TYPE_REPEAT, "부담작업": option(HAZARD_TYPE_REPEAT, "(2호)"), "이 작업시간(분)": "두 시간"},
+        [("이 작업시간(분)", "두 시간", not_number("분", CONDITION))],
+    ),
+    (
+        {"유형": HAZARD_TYPE_FORCE, "부담작업": "(9호)임의", "중량물 무게(kg)": "10근"},
+        [("부담작업", "(9호)임의", UNKNOWN_OPTION), ("중량물 무게(kg)", "10근", not_number("kg", CONDITION))],
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def task_units():
+    return synthetic.make_task_units(40, seed=7)
+
+
+@pytest.fixture(scope="module")
+def wide_tables(task_units):
+    df, hazard_df, _ = read_worklist_tables(export.build_export_bytes(task_units, "xlsx"))
+    return df, hazard_df
+
+
+@pytest.fixture(scope="module")
+def long_tables(task_units):
+    df, hazard_df, _ = read_worklist_tables(export.build_export_bytes(task_units, "xlsx_long"))
+    return df, hazard_df
+
+
+# 사례 i의 셀을 i번째 행에 넣은 표와, 나와야 하는 문제 행 (ISSUE_COLUMNS dict)
+def with_bad_cells(df, cases, sheet):
+    df = df.astype(object)
+    expected = []
+    for position, (cells, issues) in enumerate(cases):
+        index = df.index[position]
+        for column, value in cells.items():
+            df.at[index, column] = value
+        for column, value, message in issues:
+            expected.append({"시트": sheet, "행": int(index) + 2, "컬럼": column, "값": value, "오류": message})
+    return df, expected
+
+
+def issue_key(issue):
+    return (issue["시트"], issue["행"], issue["컬럼"], issue["오류"])
+
+
+def assert_issues(actual, expected):
+    assert all(list(issue) == validation.ISSUE_COLUMNS for issue in actual)
+    assert sorted(actual, key=issue_key) == sorted(expected, key=issue_key)
+
+
+def test_clean_files_have_no_issues(wide_tables, long_tables):
+    assert validation.validate_tables(*wide_tables) == []
+    assert validation.validate_tables(*long_tables) == []
+
+
+def test_worklist_sheet(wide_tables):
+    df, expected = with_bad_cells(wide_tables[0], WORKLIST_CASES, WORKLIST_SHEET_NAME)
+    issues = validation.validate_tables(df)
+    assert_issues(issues, expected)
+    assert [issue["행"] for issue in issues] == sorted(issue["행"] for issue in issues)
+
+
+def test_hazard_sheet(long_tables):
+    df, hazard_df = long_tables
+    hazard_df, expected = with_bad_cells(hazard_df, HAZARD_SHEET_CASES, HAZARD_SHEET_NAME)
+    assert_issues(validation.validate_tables(df, hazard_df), expected)
+
+
+# 대용량 파일 모드: 행 묶음별 결과를 모으면 파일 전체 검사와 같음 (유해요인 시트의 단위작업ID 연결은 검사하지 않음)
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_chunks_match_whole_file(wide_tables, long_tables, chunk_size):
+    df, expected = with_bad_cells(wide_tables[0], WORKLIST_CASES, WORKLIST_SHEET_NAME)
+    issues = []
+    for start in range(0, len(df), chunk_size):
+        issues += validation.validate_chunk(WORKLIST_SHEET_NAME, df.iloc[start:start + chunk_size])
+    assert_issues(issues, expected)
+
+    hazard_df, expected = with_bad_cells(long_tables[1], HAZARD_SHEET_CASES, HAZARD_SHEET_NAME)
+    issues = []
+    for start in range(0, len(hazard_df), chunk_size):
+        issues += validation.validate_chunk(HAZARD_SHEET_NAME, hazard_df.iloc[start:start + chunk_size])
+    assert_issues(issues, [issue for issue in expected if issue["컬럼"] != UNIT_ID_COLUMN])
+
+
+def test_tag_file():
+    issues = [{"시트": WORKLIST_SHEET_NAME, "행": 2, "컬럼": "작업자 수", "값": "x", "오류": "..."}]
+    assert list(validation.tag_file(issues, "a.xlsx")[0]) == ["파일"] + validation.ISSUE_COLUMNS
+    assert pd.DataFrame(validation.tag_file([], "a.xlsx")).empty
@@ -0,0 +1 @@
+# 작업목록표 입력 시스템의 Streamlit 비의존 로직 (내보내기 등)
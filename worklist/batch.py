@@ -0,0 +1,195 @@
+# 작업목록 엑셀 파일이 모인 폴더를 화면 없이 일괄 처리
+#
+#   python -m worklist.batch 제출파일폴더 -o 작업목록_통합.xlsx
+#
+# 각 파일을 프로세스 풀에서 병렬로 읽어 부담작업_1~12호를 다시 판정하고,
+# 전체를 하나의 작업목록 파일(xlsx, csv, parquet)로 합친 뒤 파일별 처리 결과를 CSV로 남긴다.
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pandas as pd
+
+from worklist import criteria, export, importer, validation
+from worklist.pools import process_pool
+from worklist.records import unit_content
+from worklist.schema import FIXED_MAX_HAZARD_ANALYTICS, SOURCE_KEY
+
+EXCEL_SUFFIXES = {".xlsx", ".xls"}
+
+
+def find_workbooks(directory):
+    return sorted(
+        path for path in Path(directory).iterdir()
+        if path.is_file() and path.suffix.lower() in EXCEL_SUFFIXES and not path.name.startswith("~$")
+    )
+
+
+def process_workbook(path, merge_existing=False):
+    return process_workbook_content(Path(path).name, Path(path).read_bytes(), merge_existing)
+
+
+# 파일별 처리 결과 표에 넣지 않는 값 (단위작업 목록, 업로드 검증 결과)
+RESULT_DETAIL_KEYS = ("task_units", "issues")
+
+
+# 파일 1개 처리 (프로세스 풀에서 실행되므로 결과는 dict로만 주고받음)
+# issues: 업로드 검증 결과 (validation.ISSUE_COLUMNS 행 목록)
+def process_workbook_content(name, content, merge_existing=False):
+    result = {"파일": name, "상태": "성공", "단위작업 수": 0, "검증 오류": 0, "읽기 방법": "", "오류": "", "task_units": [], "issues": []}
+    try:
+        df, hazard_df, success_method = importer.read_worklist_tables(content)
+        issues = validation.validate_tables(df, hazard_df)
+        hazards_by_unit = importer.decode_hazard_rows(hazard_df) if hazard_df is not None else None
+        task_units = importer.decode_task_units(df, hazards_by_unit=hazards_by_unit)
+        criteria.apply_burden_criteria(task_units, merge_existing=merge_existing)
+        result.update({
+            "읽기 방법": success_method, "단위작업 수": len(task_units), "task_units": task_units,
+            "검증 오류": len(issues), "issues": issues,
+        })
+        if not task_units:
+            result.update({"상태": "경고", "오류": "유효한 작업 데이터가 없습니다."})
+    except Exception as e:
+        result.update({"상태": "실패", "오류": f"{type(e).__name__}: {e}"})
+    return result
+
+
+def run_batch(paths, workers=None, merge_existing=False):
+    if workers == 1:
+        return [process_workbook(path, merge_existing) for path in paths]
+    with process_pool(workers) as executor:
+        return list(executor.map(process_workbook, paths, [merge_existing] * len(paths)))
+
+
+# 업로드된 파일 내용 [(파일 이름, bytes)]을 병렬로 처리 (파일이 하나면 현재 프로세스에서 처리)
+def run_batch_contents(named_contents, workers=None, merge_existing=False):
+    names = [name for name, _ in named_contents]
+    contents = [content for _, content in named_contents]
+    if workers == 1 or len(named_contents) <= 1:
+        return [process_workbook_content(name, content, merge_existing) for name, content in named_contents]
+    workers = min(workers or os.cpu_count() or 1, len(named_contents))
+    try:
+        with process_pool(workers) as executor:
+            return list(executor.map(process_workbook_content, names, contents, [merge_existing] * len(names)))
+    except (OSError, BrokenProcessPool):
+        # 프로세스를 만들 수 없는 환경이면 현재 프로세스에서 차례로 처리
+        return [process_workbook_content(name, content, merge_existing) for name, content in named_contents]
+
+
+# 파일별 처리 결과 표의 행 (단위작업 목록과 검증 결과는 뺌)
+def report_row(result):
+    return {key: value for key, value in result.items() if key not in RESULT_DETAIL_KEYS}
+
+
+# 단위작업에 원본 파일 이름을 붙이고, 비어 있는 소속/반은 그 파일에서 가장 많이 쓰인 값으로 채움
+def tag_source(task_units, name):
+    for column in ["소속", "반"]:
+        values = Counter(unit.get(column) for unit in task_units if unit.get(column))
+        if not values:
+            continue
+        most_common = values.most_common(1)[0][0]
+        for unit in task_units:
+            if not unit.get(column):
+                unit[column] = most_common
+    for unit in task_units:
+        unit[SOURCE_KEY] = name
+    return task_units
+
+
+# 같은 내용의 단위작업인지 비교하는 값 (원본 파일 이름과 고유ID는 제외)
+def unit_identity(unit):
+    return json.dumps(unit_content(unit), ensure_ascii=False, sort_keys=True, default=str)
+
+
+# 파일별 처리 결과를 파일 순서대로 하나의 단위작업 목록으로 합침
+# dedupe=True이면 앞에서 나온 것과 내용이 같은 단위작업은 빼고, 파일별 결과에 "중복 제거" 수를 기록
+def merge_results(results, dedupe=True):
+    merged_task_units = []
+    seen = set()
+    for result in results:
+        duplicates = 0
+        for unit in tag_source(result["task_units"], result["파일"]):
+            if dedupe:
+                identity = unit_identity(unit)
+                if identity in seen:
+                    duplicates += 1
+                    continue
+                seen.add(identity)
+            merged_task_units.append(unit)
+        result["중복 제거"] = duplicates
+    return merged_task_units
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m worklist.batch",
+        description="작업목록 엑셀 파일 폴더를 병렬로 읽어 부담작업을 다시 판정하고 하나의 파일로 합칩니다."
+    )
+    parser.add_argument("directory", help="작업목록 엑셀 파일(.xlsx, .xls)이 들어 있는 폴더")
+    parser.add_argument("-o", "--output", default="작업목록_통합.xlsx", help="합친 작업목록 파일 경로, 확장자로 형식 결정 (.xlsx, .csv, .parquet / 기본값: %(default)s)")
+    parser.add_argument("--report", default=None, help="파일별 처리 결과 CSV 경로 (기본값: 출력 파일명_처리결과.csv)")
+    parser.add_argument("--issues", default=None, help="업로드 검증 결과(셀별 오류) CSV 경로 (기본값: 출력 파일명_검증결과.csv, 오류가 있을 때만 저장)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="동시에 처리할 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--long", action="store_true", help="xlsx 출력 시 유해요인을 별도 시트에 한 행씩 저장하는 정규화 양식 사용 (유해요인 개수 제한 없음)")
+    parser.add_argument("--dedupe", action="store_true", help="여러 파일에서 내용이 같은 단위작업은 하나만 남김")
+    parser.add_argument("--merge-existing", action="store_true", help="파일에 저장된 부담작업 판정을 유지하고 새 판정과 병합 (입력 화면과 같은 방식)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    paths = find_workbooks(args.directory)
+    if not paths:
+        print(f"'{args.directory}' 폴더에 작업목록 엑셀 파일이 없습니다.", file=sys.stderr)
+        return 1
+
+    results = run_batch(paths, workers=args.workers, merge_existing=args.merge_existing)
+
+    output_format = export.format_for_path(args.output)
+    if args.long and output_format == "xlsx":
+        output_format = "xlsx_long"
+
+    # 가로형 양식은 단위작업당 유해요인 슬롯이 고정되어 있으므로 넘치는 항목이 있는 파일을 알리고 처리 결과에 기록
+    truncated_units = 0
+    for result in results:
+        result["유해요인 잘림"] = 0 if output_format == "xlsx_long" else export.count_truncated_units(result["task_units"])
+        if result["유해요인 잘림"]:
+            truncated_units += result["유해요인 잘림"]
+            print(
+                f"경고: {result['파일']}: 유해요인 원인분석 항목이 {FIXED_MAX_HAZARD_ANALYTICS}개를 넘는 단위작업 {result['유해요인 잘림']}개는 "
+                f"앞의 {FIXED_MAX_HAZARD_ANALYTICS}개만 저장됩니다. (모두 저장하려면 --long)",
+                file=sys.stderr
+            )
+
+    merged_task_units = merge_results(results, dedupe=args.dedupe)
+    if merged_task_units:
+        export.write_export(merged_task_units, args.output, output_format)
+
+    report_path = args.report or f"{os.path.splitext(args.output)[0]}_처리결과.csv"
+    report = pd.DataFrame([report_row(result) for result in results])
+    report.to_csv(report_path, index=False, encoding="utf-8-sig")
+
+    issues = [issue for result in results for issue in validation.tag_file(result["issues"], result["파일"])]
+    issues_path = args.issues or f"{os.path.splitext(args.output)[0]}_검증결과.csv"
+    if issues:
+        pd.DataFrame(issues, columns=["파일"] + validation.ISSUE_COLUMNS).to_csv(issues_path, index=False, encoding="utf-8-sig")
+
+    failed = [result for result in results if result["상태"] == "실패"]
+    print(f"파일 {len(results)}개 처리 (실패 {len(failed)}개), 단위작업 {len(merged_task_units)}개")
+    if truncated_units:
+        print(f"유해요인 항목이 잘린 단위작업: {truncated_units}개 (파일별 수는 처리 결과의 '유해요인 잘림' 컬럼)")
+    if merged_task_units:
+        print(f"통합 파일: {args.output}")
+    print(f"처리 결과: {report_path}")
+    if issues:
+        print(f"검증 결과: {issues_path} (셀 {len(issues)}개)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
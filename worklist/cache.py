@@ -0,0 +1,153 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from worklist.records import clone_unit
+
+# 업로드 파싱 결과 캐시 설정 (환경 변수로 변경 가능)
+PARSE_CACHE_MAX_MB = float(os.environ.get("WORKLIST_PARSE_CACHE_MAX_MB", "256"))
+PARSE_CACHE_TTL_MINUTES = float(os.environ.get("WORKLIST_PARSE_CACHE_TTL_MINUTES", "60"))
+
+
+# 업로드 파일 내용의 SHA-256 (읽기 옵션이 다르면 결과가 다르므로 함께 키에 포함)
+def content_key(file_content, *options):
+    digest = hashlib.sha256(file_content).hexdigest()
+    return ":".join([digest] + [str(option) for option in options])
+
+
+# 메모리 추정에서 더 따라가지 않는 값 / 긴 목록은 일부 항목만 재서 항목 수만큼 늘림
+_SCALAR_TYPES = (str, bytes, int, float, bool, type(None))
+SIZE_SAMPLE_COUNT = 200
+
+
+# 값이 차지하는 메모리 추정 (list/tuple/dict/레코드를 따라가며 sys.getsizeof 합산, 같은 객체는 한 번만 셈)
+def estimate_size(value):
+    seen = set()
+
+    def walk(item):
+        if id(item) in seen:
+            return 0
+        seen.add(id(item))
+        size = sys.getsizeof(item)
+        if isinstance(item, _SCALAR_TYPES):
+            return size
+        if isinstance(item, (list, tuple, set, frozenset)):
+            items = list(item)
+            if len(items) > SIZE_SAMPLE_COUNT:
+                step = len(items) / SIZE_SAMPLE_COUNT
+                sample = [items[int(j * step)] for j in range(SIZE_SAMPLE_COUNT)]
+                return size + int(sum(walk(child) for child in sample) * len(items) / len(sample))
+            return size + sum(walk(child) for child in items)
+        if isinstance(item, Mapping):
+            return size + sum(walk(child) for child in item.values())
+        return size
+
+    return walk(value)
+
+
+# 파싱된 작업목록을 내용 해시로 보관하는 프로세스 공용 캐시 (여러 세션이 같은 파일을 올리면 한 번만 파싱)
+# - 값은 복사하지 않고 그대로 보관/반환하므로 세션끼리 같은 단위작업 객체를 함께 씀
+#   (꺼낸 쪽은 값을 고치지 말고, 고칠 단위작업만 복사해서 사용: copy-on-write)
+# - 전체 크기(estimate_size 추정값)가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 제거,
+#   max_age_seconds가 지난 항목은 조회 시 제거
+# - 적중/실패/제거 횟수를 stats()로 확인
+class WorkbookCache:
+    def __init__(self, max_bytes, max_age_seconds):
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._entries = OrderedDict() # key -> (저장 시각, 크기, 값)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0 # 용량 초과로 제거
+        self.expirations = 0 # 보관 시간 초과로 제거
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def _expire(self, now):
+        expired = [key for key, (stored_at, _, _) in self._entries.items() if now - stored_at > self.max_age_seconds]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+
+    def get(self, key):
+        with self._lock:
+            self._expire(time.monotonic())
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][2]
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return False # 캐시 전체 크기보다 큰 결과는 보관하지 않음
+
+        with self._lock:
+            now = time.monotonic()
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (now, size, value)
+            self._total_bytes += size
+
+            self._expire(now)
+            while self._total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    # 진단 화면용 상태
+    def stats(self):
+        with self._lock:
+            return {
+                "항목 수": len(self._entries),
+                "사용량(MB)": round(self._total_bytes / (1024 * 1024), 1),
+                "최대(MB)": round(self.max_bytes / (1024 * 1024), 1),
+                "적중": self.hits,
+                "실패": self.misses,
+                "용량 초과 제거": self.evictions,
+                "만료 제거": self.expirations,
+            }
+
+
+# 캐시에서 꺼낸 단위작업 목록을 세션에 넘김 (목록만 새로 만들고 단위작업 객체는 캐시와 함께 씀)
+# 반환값: (세션용 단위작업 목록, 함께 쓰는 단위작업의 id 집합)
+def share_units(task_units):
+    return list(task_units), {id(unit) for unit in task_units}
+
+
+# 세션 목록의 i번째 단위작업을 고치기 전에 호출 (함께 쓰는 단위작업이면 이 세션용 복사본으로 바꿈, copy-on-write)
+# 반환값: 고쳐도 되는 단위작업
+def own_unit(task_units, shared_unit_ids, i):
+    unit = task_units[i]
+    if id(unit) in shared_unit_ids:
+        shared_unit_ids.discard(id(unit))
+        unit = task_units[i] = clone_unit(unit)
+    return unit
+
+
+workbook_cache = WorkbookCache(
+    max_bytes=int(PARSE_CACHE_MAX_MB * 1024 * 1024),
+    max_age_seconds=PARSE_CACHE_TTL_MINUTES * 60,
+)
@@ -0,0 +1,269 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from worklist.importer import load_task_units
+from worklist.numeric import parse_number, parse_numbers
+from worklist.records import UnitRecord, attribute_name, hazard_from_dict
+from worklist.schema import (
+    BURDEN_COLUMNS,
+    HAZARD_KEY,
+    HAZARD_TYPE_FORCE,
+    HAZARD_TYPE_OTHER,
+    HAZARD_TYPE_POSTURE,
+    HAZARD_TYPE_REPEAT,
+)
+
+# 근골격계 부담작업 판단 규칙
+# - hazard_type: 유해요인 유형, burden_no: 판정하는 부담작업 호수
+# - marker: 선택한 부담작업 문자열에 포함되어야 하는 표시
+# - conditions: 모두 만족하면 "O", 아니면 "△" ((항목 키, 기준 최소값, 단위 종류))
+#   값은 단위 종류의 기준 단위로 환산해서 비교 (예: 이 작업시간(분)의 "2시간" -> 120분),
+#   비어 있거나 숫자로 읽을 수 없는 값은 조건을 만족하지 않음
+#   조건이 없는 규칙은 항상 "△"
+# - group: 같은 그룹 안에서는 먼저 일치한 규칙 하나만 적용 (if/elif 순서)
+# - requires: 지정한 그룹의 규칙이 적용된 항목에만 적용
+BurdenRule = namedtuple("BurdenRule", ["hazard_type", "burden_no", "marker", "conditions", "group", "requires"])
+
+WORK_TIME_MIN = "이 작업시간(분)"
+
+BURDEN_RULES = [
+    BurdenRule(HAZARD_TYPE_REPEAT, 1, "(1호)", [(WORK_TIME_MIN, 240, "분")], "반복", None),
+    BurdenRule(HAZARD_TYPE_REPEAT, 2, "(2호)", [(WORK_TIME_MIN, 120, "분")], "반복", None),
+    BurdenRule(HAZARD_TYPE_REPEAT, 6, "(6호)", [(WORK_TIME_MIN, 120, "분")], "반복", None),
+    BurdenRule(HAZARD_TYPE_REPEAT, 7, "(7호)", [(WORK_TIME_MIN, 120, "분")], "반복", None),
+    BurdenRule(HAZARD_TYPE_REPEAT, 10, "(10호)", [
+        (WORK_TIME_MIN, 120, "분"),
+        ("분당 반복횟수(회/분)_10호", 2, "회"),
+        ("물체 무게(kg)_10호", 4.5, "kg"),
+    ], "반복", None),
+    BurdenRule(HAZARD_TYPE_REPEAT, 12, "(12호)정적자세", [], None, "반복"),
+
+    BurdenRule(HAZARD_TYPE_POSTURE, 3, "(3호)", [(WORK_TIME_MIN, 120, "분")], "자세", None),
+    BurdenRule(HAZARD_TYPE_POSTURE, 4, "(4호)", [(WORK_TIME_MIN, 120, "분")], "자세", None),
+    BurdenRule(HAZARD_TYPE_POSTURE, 5, "(5호)", [(WORK_TIME_MIN, 120, "분")], "자세", None),
+
+    BurdenRule(HAZARD_TYPE_FORCE, 8, "(8호)", [
+        ("하루 8시간동안 중량물을 드는 횟수(회)", 10, "회"),
+        ("중량물 무게(kg)", 25, "kg"),
+    ], None, None),
+    BurdenRule(HAZARD_TYPE_FORCE, 9, "(9호)", [
+        ("하루 8시간동안 중량물을 드는 횟수(회)", 25, "회"),
+        ("중량물 무게(kg)", 10, "kg"),
+    ], None, None),
+    BurdenRule(HAZARD_TYPE_FORCE, 12, "(12호)밀기/당기기", [], None, None),
+
+    BurdenRule(HAZARD_TYPE_OTHER, 11, "(11호)", [("작업시간(분)", 120, "분")], "기타", None),
+    BurdenRule(HAZARD_TYPE_OTHER, 12, "(12호)진동작업", [], "기타", None),
+]
+
+# 판정에 필요한 항목 키와 단위 종류 (배치 판정 시 이 컬럼만 모음)
+CONDITION_UNITS = {field: kind for rule in BURDEN_RULES for field, _, kind in rule.conditions}
+CONDITION_FIELDS = sorted(CONDITION_UNITS)
+
+# 항목 1개씩 판정할 때는 레코드 슬롯을 직접 읽음 (항목 키 -> 슬롯 이름)
+_CONDITION_ATTRIBUTES = {field: attribute_name(field) for field in CONDITION_FIELDS}
+
+# 조건 항목을 쓰는 유해요인 유형 (배치 판정 시 해당 유형의 항목에서만 읽음)
+_CONDITION_TYPES = {
+    field: sorted({rule.hazard_type for rule in BURDEN_RULES if field in [key for key, _, _ in rule.conditions]})
+    for field in CONDITION_FIELDS
+}
+
+
+# 판정 대상 부담작업 문자열 (부담작업이 비어 있으면 부담작업자세)
+def _record_option(hazard_entry):
+    option = getattr(hazard_entry, "부담작업", None) or getattr(hazard_entry, "부담작업자세", None)
+    return option if isinstance(option, str) else ""
+
+
+# 유해요인 항목 1개에 대한 판정 결과 {부담작업 호수: "O" 또는 "△"}
+def evaluate_hazard_entry(hazard_entry):
+    result = {}
+    hazard_entry = hazard_from_dict(hazard_entry)
+    hazard_type = getattr(hazard_entry, "유형", None)
+    option = getattr(hazard_entry, "부담작업", None) or getattr(hazard_entry, "부담작업자세", None)
+    if not option or not isinstance(option, str):
+        return result
+
+    matched_groups = set()
+    for rule in BURDEN_RULES:
+        if rule.hazard_type != hazard_type or rule.marker not in option:
+            continue
+        if rule.group is not None and rule.group in matched_groups:
+            continue
+        if rule.requires is not None and rule.requires not in matched_groups:
+            continue
+        if rule.group is not None:
+            matched_groups.add(rule.group)
+
+        satisfied = bool(rule.conditions)
+        for field, minimum, kind in rule.conditions:
+            value, _ = parse_number(getattr(hazard_entry, _CONDITION_ATTRIBUTES[field], None), kind)
+            if not value >= minimum:
+                satisfied = False
+        result[rule.burden_no] = "O" if satisfied else "△"
+    return result
+
+
+# 새로 계산한 판정을 기존 값과 O, △, X 순서로 병합 (이미 O인 항목은 낮추지 않음)
+def merge_burden_flag(computed, existing):
+    if computed == "O":
+        return "O"
+    if computed == "△" and existing != "O":
+        return "△"
+    if existing not in ["O", "△"]:
+        return "X"
+    return existing
+
+
+# 단위작업 1개의 부담작업_1~12호를 계산하여 반영 (입력 화면에서 사용)
+def update_burden_criteria(unit_data):
+    burden_criteria = {k: "X" for k in range(1, 13)}
+    for hazard_entry in unit_data.get("유해요인_원인분석", []):
+        burden_criteria.update(evaluate_hazard_entry(hazard_entry))
+
+    for k, key in enumerate(BURDEN_COLUMNS, 1):
+        existing = unit_data.get(key)
+        flag = merge_burden_flag(burden_criteria[k], existing)
+        if flag != existing:
+            unit_data[key] = flag
+
+
+# 단위작업들의 항목 값 목록 (레코드는 슬롯을 직접 읽음)
+def _unit_values(task_units, key, default=None):
+    attribute = attribute_name(key)
+    return [
+        getattr(unit, attribute, default) if isinstance(unit, UnitRecord) else unit.get(key, default)
+        for unit in task_units
+    ]
+
+
+# 모든 단위작업의 유해요인 항목을 단위작업 순서대로 펼친 판정용 컬럼
+# 반환값: {"unit", "유형", "option", 판정 조건 항목: 항목 순서의 배열}
+# 항목마다 dict나 DataFrame 행을 만들지 않고 레코드 슬롯에서 컬럼별로 바로 모음
+def hazard_columns(task_units):
+    hazard_lists = _unit_values(task_units, HAZARD_KEY, [])
+    entries = [hazard_from_dict(hazard_entry) for hazards in hazard_lists for hazard_entry in hazards]
+    hazard_types = np.array([getattr(hazard_entry, "유형", None) for hazard_entry in entries], dtype=object)
+    columns = {
+        "unit": np.repeat(np.arange(len(task_units)), [len(hazards) for hazards in hazard_lists]),
+        "유형": hazard_types,
+        "option": np.array([_record_option(hazard_entry) for hazard_entry in entries], dtype=object),
+    }
+    # 조건 항목은 그 항목을 쓰는 유형의 항목에서만 읽고 나머지는 None
+    for field in CONDITION_FIELDS:
+        attribute = _CONDITION_ATTRIBUTES[field]
+        values = np.full(len(entries), None, dtype=object)
+        rows = np.flatnonzero(np.logical_or.reduce([hazard_types == hazard_type for hazard_type in _CONDITION_TYPES[field]]))
+        values[rows] = [getattr(entries[row], attribute, None) for row in rows.tolist()]
+        columns[field] = values
+    return columns
+
+
+# 조건 항목 값은 같은 입력이 많으므로 고유값만 숫자로 변환
+# (고유값이 적으면 값 1개씩 변환하는 편이 pandas 문자열 처리를 거치는 것보다 빠름)
+_SCALAR_PARSE_LIMIT = 256
+
+
+def _parse_condition(values, kind):
+    codes, uniques = pd.factorize(values)
+    if len(uniques) > _SCALAR_PARSE_LIMIT:
+        parsed, _ = parse_numbers(uniques, kind)
+    else:
+        parsed = np.array([parse_number(value, kind)[0] for value in uniques], dtype=float)
+    return np.append(parsed, np.nan)[codes] # 빈 값(코드 -1)은 NaN
+
+
+# 유해요인 항목 전체를 규칙 표 기준으로 한 번에 판정 (columns: hazard_columns 결과)
+# 반환값: {부담작업 호수: 항목 순서의 object 배열 ("O", "△", 해당 없으면 None)}
+def evaluate_hazard_columns(columns):
+    hazard_types = columns["유형"]
+    entry_count = len(hazard_types)
+    # 부담작업 문자열은 선택지 목록에서 오므로 고유값에 대해서만 포함 여부를 검사
+    option_codes, option_values = pd.factorize(columns["option"])
+
+    parsed_fields = {field: _parse_condition(columns[field], kind) for field, kind in CONDITION_UNITS.items()}
+
+    flags = {k: np.full(entry_count, None, dtype=object) for k in range(1, 13)}
+    matched_groups = {}
+    for rule in BURDEN_RULES:
+        marker_hits = np.array([rule.marker in option for option in option_values], dtype=bool)
+        mask = (hazard_types == rule.hazard_type) & marker_hits[option_codes]
+        if rule.group is not None:
+            already_matched = matched_groups.setdefault(rule.group, np.zeros(entry_count, dtype=bool))
+            mask &= ~already_matched
+        if rule.requires is not None:
+            mask &= matched_groups.get(rule.requires, np.zeros(entry_count, dtype=bool))
+        if rule.group is not None:
+            matched_groups[rule.group] = matched_groups[rule.group] | mask
+
+        satisfied = np.full(entry_count, bool(rule.conditions))
+        for field, minimum, _ in rule.conditions:
+            with np.errstate(invalid="ignore"):
+                satisfied &= parsed_fields[field] >= minimum
+        flags[rule.burden_no][mask] = np.where(satisfied[mask], "O", "△")
+    return flags
+
+
+# 단위작업별로 마지막에 판정된 항목의 값 (입력 화면과 같은 덮어쓰기 순서), 판정된 항목이 없으면 "X"
+# 항목이 단위작업 순서대로 펼쳐져 있으므로 같은 단위작업의 마지막 위치만 골라 씀
+# 반환값: {부담작업 컬럼: 단위작업 순서의 object 배열}
+def _last_flags(units, entry_flags, unit_count):
+    computed = {}
+    for k, col in enumerate(BURDEN_COLUMNS, 1):
+        flags = entry_flags[k]
+        rows = np.flatnonzero(flags != None)
+        flag_units = units[rows]
+        last = np.append(flag_units[1:] != flag_units[:-1], True) if len(rows) else np.zeros(0, dtype=bool)
+        column = np.full(unit_count, "X", dtype=object)
+        column[flag_units[last]] = flags[rows[last]]
+        computed[col] = column
+    return computed
+
+
+# 단위작업에 저장된 부담작업_1~12호 (반환값: {부담작업 컬럼: 단위작업 순서의 object 배열, 값이 없으면 None})
+def _existing_flags(task_units):
+    return {col: np.array(_unit_values(task_units, col), dtype=object) for col in BURDEN_COLUMNS}
+
+
+# 단위작업 목록의 부담작업_1~12호 판정, existing(_existing_flags 결과)을 주면 merge_burden_flag와 같은 규칙으로 병합
+# 반환값: {부담작업 컬럼: 단위작업 순서의 object 배열}
+def _evaluate_columns(task_units, existing=None):
+    columns = hazard_columns(task_units)
+    computed = _last_flags(columns["unit"], evaluate_hazard_columns(columns), len(task_units))
+    if existing is None:
+        return computed
+
+    merged = {}
+    for col in BURDEN_COLUMNS:
+        column = np.where((existing[col] == "O") | (existing[col] == "△"), existing[col], "X").astype(object)
+        column[(computed[col] == "△") & (existing[col] != "O")] = "△"
+        column[computed[col] == "O"] = "O"
+        merged[col] = column
+    return merged
+
+
+# 모든 단위작업의 부담작업_1~12호 판정표 (행: 단위작업 순서, 열: 부담작업_1~12호)
+# merge_existing=True이면 입력 화면과 같이 단위작업에 저장된 기존 판정과 병합
+def evaluate_task_units(task_units, merge_existing=True):
+    existing = _existing_flags(task_units) if merge_existing else None
+    return pd.DataFrame(_evaluate_columns(task_units, existing), columns=BURDEN_COLUMNS, index=range(len(task_units)))
+
+
+# 판정을 단위작업 목록에 반영 (값이 바뀐 칸만 씀)
+def apply_burden_criteria(task_units, merge_existing=True):
+    existing = _existing_flags(task_units)
+    for col, flags in _evaluate_columns(task_units, existing if merge_existing else None).items():
+        for row in np.flatnonzero(existing[col] != flags).tolist():
+            task_units[row][col] = flags[row]
+    return task_units
+
+
+# 작업목록 엑셀 파일 전체의 부담작업 판정표 (화면 없이 사용)
+def evaluate_workbook(file_bytes, merge_existing=True):
+    task_units, _ = load_task_units(file_bytes)
+    matrix = evaluate_task_units(task_units, merge_existing=merge_existing)
+    matrix.insert(0, "단위작업명", [unit["단위작업명"] for unit in task_units])
+    return matrix
@@ -0,0 +1,494 @@
+import csv
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+import xlsxwriter
+
+from worklist.cache import WorkbookCache
+from worklist.pools import process_pool
+from worklist.records import unit_content
+from worklist.schema import (
+    BURDEN_COLUMNS,
+    FIXED_MAX_HAZARD_ANALYTICS,
+    HAZARD_CONDITIONAL_FIELDS,
+    HAZARD_FIELDS,
+    HAZARD_ORDER_COLUMN,
+    HAZARD_SHEET_NAME,
+    UNIT_ID_COLUMN,
+    UNIT_PREFIX_COLUMNS,
+    UNIT_SUFFIX_COLUMNS,
+    WORKLIST_SHEET_NAME,
+    hazard_column_templates,
+    hazard_field_keys,
+)
+
+SHEET_NAME = WORKLIST_SHEET_NAME
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# 다운로드 형식 (형식 키: (표시 이름, 확장자, MIME))
+EXPORT_FORMATS = {
+    "xlsx": ("Excel (.xlsx)", "xlsx", XLSX_MIME),
+    "xlsx_long": ("Excel 정규화 양식 (.xlsx, 유해요인 시트 분리·개수 제한 없음)", "xlsx", XLSX_MIME),
+    "csv": ("CSV (.csv)", "csv", "text/csv"),
+    "parquet": ("Parquet (.parquet)", "parquet", "application/vnd.apache.parquet"),
+}
+
+# Parquet 저장 시 숫자형으로 저장하는 컬럼 (슬롯 번호는 {n})
+NUMERIC_COLUMN_TEMPLATES = [
+    "작업자 수", "1일 작업시간",
+    "유해요인_원인분석_수공구_무게(kg)_{n}",
+    "유해요인_원인분석_반복_물체무게_10호(kg)_{n}",
+    "유해요인_원인분석_반복_작업시간_12호_정적_{n}",
+    "유해요인_원인분석_반복_휴식시간_12호_정적_{n}",
+    "유해요인_원인분석_중량물_무게(kg)_{n}",
+    "유해요인_원인분석_하루8시간_중량물_횟수(회)_{n}",
+]
+
+PARQUET_ROW_GROUP_SIZE = 1000
+
+
+def build_ordered_columns(max_hazards=FIXED_MAX_HAZARD_ANALYTICS):
+    ordered_columns_hazard_analysis = [
+        column_template.format(n=j + 1)
+        for j in range(max_hazards)
+        for column_template in hazard_column_templates()
+    ]
+    return UNIT_PREFIX_COLUMNS + BURDEN_COLUMNS + ordered_columns_hazard_analysis + UNIT_SUFFIX_COLUMNS
+
+
+ORDERED_COLUMNS = build_ordered_columns()
+
+
+# 유해요인 슬롯 안에서 각 항목이 들어갈 위치 (슬롯 시작 위치 기준)
+def _hazard_slot_layout():
+    offsets = {template: offset for offset, template in enumerate(hazard_column_templates())}
+    fields = {
+        hazard_type: [(key, offsets[column_template]) for key, column_template, _ in type_fields]
+        for hazard_type, type_fields in HAZARD_FIELDS.items()
+    }
+    conditional_fields = {
+        hazard_type: [
+            (trigger_key, marker, [(key, offsets[column_template]) for key, column_template, _ in group_fields])
+            for trigger_key, marker, group_fields in groups
+        ]
+        for hazard_type, groups in HAZARD_CONDITIONAL_FIELDS.items()
+    }
+    return len(offsets), fields, conditional_fields
+
+
+_SLOT_WIDTH, _SLOT_FIELDS, _SLOT_CONDITIONAL_FIELDS = _hazard_slot_layout()
+_HAZARD_START = len(UNIT_PREFIX_COLUMNS) + len(BURDEN_COLUMNS)
+
+
+# 단위작업 1개를 ORDERED_COLUMNS 순서의 값 리스트(엑셀 한 행)로 평면화
+def unit_row_values(unit):
+    row = [unit.get(col) for col in UNIT_PREFIX_COLUMNS]
+    row.extend(unit.get(col, "X") for col in BURDEN_COLUMNS)
+    row.extend([None] * (_SLOT_WIDTH * FIXED_MAX_HAZARD_ANALYTICS))
+    row.extend([", ".join(unit["보호구"]), unit.get("작성자"), unit.get("연락처")])
+
+    # 유해요인 원인분석 데이터 평면화 (고정된 슬롯 수까지만)
+    for j, hazard_entry in enumerate(unit.get("유해요인_원인분석", [])[:FIXED_MAX_HAZARD_ANALYTICS]):
+        slot_start = _HAZARD_START + j * _SLOT_WIDTH
+        hazard_type = hazard_entry.get("유형", "")
+        row[slot_start] = hazard_type
+
+        for key, offset in _SLOT_FIELDS.get(hazard_type, []):
+            row[slot_start + offset] = hazard_entry.get(key)
+
+        for trigger_key, marker, group_fields in _SLOT_CONDITIONAL_FIELDS.get(hazard_type, []):
+            if marker in str(hazard_entry.get(trigger_key, "")): # 업로드한 빈 셀(NaN)도 문자열로 비교
+                for key, offset in group_fields:
+                    row[slot_start + offset] = hazard_entry.get(key)
+                break
+    return row
+
+
+# 정규화 양식: 작업목록 시트에는 유해요인 슬롯 없이 단위작업ID를 붙이고,
+# 유해요인 시트에 항목 하나를 한 행으로 (단위작업ID, 항목번호, 유형, 항목 키별 값) 저장
+LONG_UNIT_COLUMNS = [UNIT_ID_COLUMN] + UNIT_PREFIX_COLUMNS + BURDEN_COLUMNS + UNIT_SUFFIX_COLUMNS
+LONG_HAZARD_COLUMNS = [UNIT_ID_COLUMN, HAZARD_ORDER_COLUMN, "유형"] + hazard_field_keys()
+
+
+# 유해요인 시트 안에서 각 항목 키가 들어갈 위치 (유형별로 내보내는 항목은 가로형 양식과 같음)
+def _hazard_long_layout():
+    positions = {key: position for position, key in enumerate(LONG_HAZARD_COLUMNS)}
+    fields = {
+        hazard_type: [(key, positions[key]) for key, _, _ in type_fields]
+        for hazard_type, type_fields in HAZARD_FIELDS.items()
+    }
+    conditional_fields = {
+        hazard_type: [
+            (trigger_key, marker, [(key, positions[key]) for key, _, _ in group_fields])
+            for trigger_key, marker, group_fields in groups
+        ]
+        for hazard_type, groups in HAZARD_CONDITIONAL_FIELDS.items()
+    }
+    return fields, conditional_fields
+
+
+_LONG_FIELDS, _LONG_CONDITIONAL_FIELDS = _hazard_long_layout()
+
+
+def unit_long_row_values(unit, unit_id):
+    row = [unit_id]
+    row.extend(unit.get(col) for col in UNIT_PREFIX_COLUMNS)
+    row.extend(unit.get(col, "X") for col in BURDEN_COLUMNS)
+    row.extend([", ".join(unit["보호구"]), unit.get("작성자"), unit.get("연락처")])
+    return row
+
+
+# 단위작업 1개의 유해요인 항목을 유해요인 시트 행들로 (유형이 비어 있는 항목은 제외)
+def hazard_long_rows(unit, unit_id):
+    rows = []
+    for hazard_entry in unit.get("유해요인_원인분석", []):
+        hazard_type = hazard_entry.get("유형", "")
+        if not isinstance(hazard_type, str) or not hazard_type.strip():
+            continue
+        row = [unit_id, len(rows) + 1, hazard_type] + [None] * (len(LONG_HAZARD_COLUMNS) - 3)
+
+        for key, position in _LONG_FIELDS.get(hazard_type, []):
+            row[position] = hazard_entry.get(key)
+
+        for trigger_key, marker, group_fields in _LONG_CONDITIONAL_FIELDS.get(hazard_type, []):
+            if marker in str(hazard_entry.get(trigger_key, "")):
+                for key, position in group_fields:
+                    row[position] = hazard_entry.get(key)
+                break
+        rows.append(row)
+    return rows
+
+
+# 가로형 양식(xlsx, csv, parquet)에 다 들어가지 않는 단위작업 수 (유해요인 항목이 슬롯 수보다 많아 뒤쪽 항목이 빠짐)
+def count_truncated_units(task_units, max_hazards=FIXED_MAX_HAZARD_ANALYTICS):
+    return sum(1 for unit in task_units if len(unit.get("유해요인_원인분석", [])) > max_hazards)
+
+
+def iter_export_rows(task_units):
+    for unit in task_units:
+        yield unit_row_values(unit)
+
+
+# 셀에 쓸 수 없는 NaN은 빈 셀로
+def _cell_value(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _write_sheet_row(worksheet, row_index, values):
+    for col_index, value in enumerate(values):
+        value = _cell_value(value)
+        if value is not None:
+            worksheet.write(row_index, col_index, value)
+
+
+def _header_format(workbook):
+    return workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+
+
+# xlsxwriter constant_memory 모드로 한 행씩 기록 (중간 DataFrame 없이 메모리 사용량 일정)
+def write_xlsx(task_units, target):
+    workbook = xlsxwriter.Workbook(target, {"constant_memory": True})
+    worksheet = workbook.add_worksheet(SHEET_NAME)
+    worksheet.write_row(0, 0, ORDERED_COLUMNS, _header_format(workbook))
+
+    for row_index, values in enumerate(iter_export_rows(task_units), start=1):
+        _write_sheet_row(worksheet, row_index, values)
+    workbook.close()
+
+
+# 표 여러 개를 시트별로 저장한 xlsx (요약 표 다운로드용), sheets: {시트 이름: (컬럼 목록, 행 dict 목록)}
+def build_table_xlsx_bytes(sheets):
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+    header_format = _header_format(workbook)
+    for sheet_name, (columns, rows) in sheets.items():
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, columns, header_format)
+        for row_index, row in enumerate(rows, start=1):
+            _write_sheet_row(worksheet, row_index, [row.get(column) for column in columns])
+    workbook.close()
+    return output.getvalue()
+
+
+# 정규화 양식 xlsx (작업목록 시트 + 유해요인 시트, 유해요인 개수 제한 없음)
+# 단위작업ID는 내보내는 순서의 번호 (1부터)
+def write_xlsx_long(task_units, target):
+    workbook = xlsxwriter.Workbook(target, {"constant_memory": True})
+    unit_sheet = workbook.add_worksheet(SHEET_NAME)
+    hazard_sheet = workbook.add_worksheet(HAZARD_SHEET_NAME)
+    header_format = _header_format(workbook)
+    unit_sheet.write_row(0, 0, LONG_UNIT_COLUMNS, header_format)
+    hazard_sheet.write_row(0, 0, LONG_HAZARD_COLUMNS, header_format)
+
+    # constant_memory 모드는 시트별로 행 순서만 지키면 되므로 두 시트를 함께 기록
+    hazard_row_index = 1
+    for unit_id, unit in enumerate(task_units, start=1):
+        _write_sheet_row(unit_sheet, unit_id, unit_long_row_values(unit, unit_id))
+        for values in hazard_long_rows(unit, unit_id):
+            _write_sheet_row(hazard_sheet, hazard_row_index, values)
+            hazard_row_index += 1
+    workbook.close()
+
+
+def _write_csv_rows(task_units, text_stream):
+    writer = csv.writer(text_stream)
+    writer.writerow(ORDERED_COLUMNS)
+    for values in iter_export_rows(task_units):
+        writer.writerow(["" if _cell_value(value) is None else value for value in values])
+
+
+# CSV (Excel에서 한글이 깨지지 않도록 UTF-8 BOM 포함)
+def write_csv(task_units, target):
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "w", newline="", encoding="utf-8-sig") as f:
+            _write_csv_rows(task_units, f)
+    elif isinstance(target, io.TextIOBase):
+        _write_csv_rows(task_units, target)
+    else:
+        text_stream = io.TextIOWrapper(target, encoding="utf-8-sig", newline="")
+        _write_csv_rows(task_units, text_stream)
+        text_stream.detach()
+
+
+def _parquet_schema(pa):
+    numeric_columns = {
+        template.format(n=j + 1)
+        for template in NUMERIC_COLUMN_TEMPLATES
+        for j in range(FIXED_MAX_HAZARD_ANALYTICS)
+    }
+    return pa.schema([
+        (col, pa.float64() if col in numeric_columns else pa.string())
+        for col in ORDERED_COLUMNS
+    ])
+
+
+def _to_float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+def _to_text(value):
+    value = _cell_value(value)
+    return None if value is None else str(value)
+
+
+# Parquet (pyarrow 필요, PARQUET_ROW_GROUP_SIZE 행씩 나누어 기록)
+def write_parquet(task_units, target):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet 형식으로 저장하려면 pyarrow가 설치되어 있어야 합니다.") from e
+
+    schema = _parquet_schema(pa)
+    converters = [_to_float if field.type == pa.float64() else _to_text for field in schema]
+
+    def write_batch(writer, batch_rows):
+        columns = [[convert(row[i]) for row in batch_rows] for i, convert in enumerate(converters)]
+        writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+    with pq.ParquetWriter(target, schema) as writer:
+        batch_rows = []
+        for values in iter_export_rows(task_units):
+            batch_rows.append(values)
+            if len(batch_rows) >= PARQUET_ROW_GROUP_SIZE:
+                write_batch(writer, batch_rows)
+                batch_rows = []
+        if batch_rows:
+            write_batch(writer, batch_rows)
+
+
+EXPORT_WRITERS = {
+    "xlsx": write_xlsx,
+    "xlsx_long": write_xlsx_long,
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+# 파일 확장자로 내보내기 형식 판별 (모르는 확장자는 xlsx)
+def format_for_path(path):
+    suffix = str(path).rsplit(".", 1)[-1].lower()
+    return suffix if suffix in EXPORT_WRITERS else "xlsx"
+
+
+# 진행률 보고 간격 (단위작업 수)
+PROGRESS_EVERY = 200
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+# 내보내는 단위작업을 하나씩 넘기면서 progress(완료 수, 전체 수)를 호출하고, cancelled()가 참이면 중단
+def _tracked_units(task_units, progress, cancelled):
+    total = len(task_units)
+    for done, unit in enumerate(task_units):
+        if done % PROGRESS_EVERY == 0:
+            if cancelled is not None and cancelled():
+                raise ExportCancelled()
+            if progress is not None:
+                progress(done, total)
+        yield unit
+    if progress is not None:
+        progress(total, total)
+
+
+# split=True이면 소속/반별 파일을 zip 1개로 묶어서 씀 (write_split_zip)
+def write_export(task_units, target, file_format="xlsx", progress=None, cancelled=None, split=False):
+    if split:
+        write_split_zip(task_units, target, file_format, progress, cancelled)
+        return
+    if progress is not None or cancelled is not None:
+        task_units = _tracked_units(task_units, progress, cancelled)
+    EXPORT_WRITERS[file_format](task_units, target)
+
+
+def build_export_bytes(task_units, file_format="xlsx", progress=None, cancelled=None, split=False):
+    output = io.BytesIO()
+    write_export(task_units, output, file_format, progress, cancelled, split)
+    return output.getvalue()
+
+
+# 소속/반별 나누어 내보내기 설정
+# - 묶음별 파일을 동시에 만드는 프로세스 수 (0이면 CPU 수, 환경 변수로 변경 가능)
+# - 취소 여부를 확인하는 간격(초)
+SPLIT_EXPORT_WORKERS = int(os.environ.get("WORKLIST_SPLIT_EXPORT_WORKERS", "0"))
+SPLIT_POLL_SECONDS = 0.2
+ZIP_MIME = "application/zip"
+
+# zip 안의 파일 이름에 쓸 수 없는 문자
+_UNSAFE_NAME_CHARS = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+# 단위작업을 (소속, 반) 묶음으로 나눔 (처음 나온 순서, 묶음 안에서는 원래 순서 유지)
+def group_units(task_units):
+    groups = OrderedDict()
+    for unit in task_units:
+        key = (str(unit.get("소속") or "").strip(), str(unit.get("반") or "").strip())
+        groups.setdefault(key, []).append(unit)
+    return groups
+
+
+def _name_part(value, blank):
+    return _UNSAFE_NAME_CHARS.sub("_", value).strip("_") or blank
+
+
+# zip 안의 묶음별 파일 이름 (작업목록표_소속_반_날짜.확장자, 이미 쓴 이름이면 뒤에 번호)
+def split_file_name(소속, 반, file_format, used_names):
+    base = f"작업목록표_{_name_part(소속, '미정소속')}_{_name_part(반, '미정반')}_{datetime.now().strftime('%y%m%d')}"
+    extension = EXPORT_FORMATS[file_format][1]
+    name = f"{base}.{extension}"
+    number = 2
+    while name in used_names:
+        name = f"{base}({number}).{extension}"
+        number += 1
+    used_names.add(name)
+    return name
+
+
+# 소속/반 묶음별 파일을 프로세스 풀에서 동시에 만들고, 끝나는 순서대로 zip 1개에 기록
+# - 전체 시간은 대략 가장 큰 묶음 하나를 만드는 시간 (묶음이 1개이거나 프로세스를 만들 수 없으면 차례로 만듦)
+# - progress(완료 수, 전체 수)는 묶음이 끝날 때마다, cancelled()는 SPLIT_POLL_SECONDS마다 확인
+# - xlsx/parquet는 이미 압축된 형식이므로 zip에서는 다시 압축하지 않음
+def write_split_zip(task_units, target, file_format="xlsx", progress=None, cancelled=None, workers=None):
+    groups = list(group_units(task_units).items())
+    total = sum(len(units) for _, units in groups)
+    compression = zipfile.ZIP_DEFLATED if file_format == "csv" else zipfile.ZIP_STORED
+    used_names = set()
+    done = 0
+
+    with zipfile.ZipFile(target, "w", compression) as archive:
+        finished = set() # zip에 기록한 묶음 번호
+
+        def add(index, data):
+            nonlocal done
+            (소속, 반), units = groups[index]
+            archive.writestr(split_file_name(소속, 반, file_format, used_names), data)
+            finished.add(index)
+            done += len(units)
+            if progress is not None:
+                progress(done, total)
+
+        if progress is not None:
+            progress(0, total)
+        workers = min(workers or SPLIT_EXPORT_WORKERS or os.cpu_count() or 1, len(groups))
+        if workers > 1:
+            try:
+                _write_groups_parallel(groups, file_format, workers, add, cancelled)
+            except (OSError, BrokenProcessPool):
+                pass # 프로세스를 만들 수 없는 환경이면 남은 묶음을 아래에서 차례로 만듦
+        for index, (_, units) in enumerate(groups):
+            if index in finished:
+                continue
+            if cancelled is not None and cancelled():
+                raise ExportCancelled()
+            add(index, build_export_bytes(units, file_format, cancelled=cancelled))
+
+
+def _write_groups_parallel(groups, file_format, workers, add, cancelled):
+    executor = process_pool(workers)
+    try:
+        pending = {
+            executor.submit(build_export_bytes, units, file_format): index
+            for index, (_, units) in enumerate(groups)
+        }
+        while pending:
+            completed, _ = wait(pending, timeout=SPLIT_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            if cancelled is not None and cancelled():
+                raise ExportCancelled()
+            for future in completed:
+                add(pending.pop(future), future.result())
+    finally:
+        # 취소/실패한 경우 아직 시작하지 않은 묶음은 버리고, 이미 만드는 중인 묶음은 기다리지 않음
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 작업목록 내용 해시 (내용이 같으면 세션이나 업로드가 달라도 같은 값)
+# 레코드를 repr로 바꾸지 않도록 unit_content(고유ID/출처 제외)를 키 순서대로 JSON 직렬화
+def task_units_hash(task_units):
+    payload = json.dumps([unit_content(unit) for unit in task_units], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# 생성된 파일을 (내용 해시, 형식, 나누기)로 보관하는 프로세스 공용 캐시 (변경이 없으면 다시 만들지 않음)
+# 업로드 캐시와 같이 전체 크기와 보관 시간으로 제한 (환경 변수로 변경 가능)
+EXPORT_CACHE_MAX_MB = float(os.environ.get("WORKLIST_EXPORT_CACHE_MAX_MB", "64"))
+EXPORT_CACHE_TTL_MINUTES = float(os.environ.get("WORKLIST_EXPORT_CACHE_TTL_MINUTES", "60"))
+
+export_cache = WorkbookCache(
+    max_bytes=int(EXPORT_CACHE_MAX_MB * 1024 * 1024),
+    max_age_seconds=EXPORT_CACHE_TTL_MINUTES * 60,
+)
+
+
+def get_export_bytes(task_units, file_format="xlsx", progress=None, cancelled=None, split=False):
+    cache_key = (task_units_hash(task_units), file_format, split)
+    data = export_cache.get(cache_key)
+    if data is None:
+        data = build_export_bytes(task_units, file_format, progress, cancelled, split)
+        export_cache.put(cache_key, data)
+    return data
+
+
+def make_file_name(반, file_format="xlsx", prefix="작업목록표", split=False):
+    # 파일명 생성 (소속/반별로 나눈 경우 zip)
+    file_name_base = 반 if 반 else "미정반"
+    current_date = datetime.now().strftime("%y%m%d")
+    extension = "zip" if split else EXPORT_FORMATS[file_format][1]
+    return f"{prefix}_{file_name_base}_{current_date}.{extension}"
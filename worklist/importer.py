@@ -0,0 +1,350 @@
+import importlib.util
+import io
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from worklist.numeric import parse_numbers
+from worklist.records import HazardRecord, UnitRecord, new_hazard_entry
+from worklist.schema import (
+    BURDEN_COLUMNS,
+    FIXED_MAX_HAZARD_ANALYTICS,
+    HAZARD_CONDITIONAL_FIELDS,
+    HAZARD_FIELDS,
+    HAZARD_ORDER_COLUMN,
+    HAZARD_SHEET_NAME,
+    HAZARD_TYPE_COLUMN,
+    NUMBER_FIELD_UNITS,
+    UNIT_ID_COLUMN,
+    WORKLIST_SHEET_NAME,
+    hazard_field_keys,
+)
+
+# 파일 시그니처 (xlsx는 zip 컨테이너, xls는 OLE2 복합 문서)
+ZIP_SIGNATURE = b"PK\x03\x04"
+OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# 대용량 파일 모드에서 한 번에 변환하는 행 수
+STREAM_CHUNK_SIZE = 1000
+
+# 그대로 문자열로 읽어 앞뒤 공백을 제거하는 기본 정보 컬럼 (컬럼 이름, 기본값)
+TEXT_COLUMNS = [
+    ("회사명", ""), ("소속", ""), ("반", ""), ("단위작업명", ""),
+    ("작업내용(상세설명)", ""), ("작업자 이름", ""), ("작업형태", "주간"),
+    ("작성자", ""), ("연락처", ""),
+]
+
+
+# 바이트 또는 파일 객체를 처음 위치의 파일 객체로 (업로드 파일을 다시 복사하지 않음)
+def _as_file(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def _read_header(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source[:8])
+    source.seek(0)
+    header = source.read(8)
+    source.seek(0)
+    return header
+
+
+# 파일 앞부분의 시그니처로 엑셀 형식을 판별하고 사용할 엔진을 고름
+def detect_excel_engine(source):
+    header = _read_header(source)
+    if header.startswith(ZIP_SIGNATURE):
+        return "openpyxl"
+    if header.startswith(OLE2_SIGNATURE):
+        # .xls 파일은 xlrd가 있으면 xlrd, 없으면 calamine 사용
+        for engine, module_name in [("xlrd", "xlrd"), ("calamine", "python_calamine")]:
+            if importlib.util.find_spec(module_name) is not None:
+                return engine
+        raise ValueError("xls 파일을 읽을 수 있는 엔진(xlrd 또는 python-calamine)이 설치되어 있지 않습니다.")
+    raise ValueError("지원하지 않는 파일 형식입니다. (xlsx 또는 xls 파일이 아님)")
+
+
+def _select_sheet_name(sheet_names):
+    return WORKLIST_SHEET_NAME if WORKLIST_SHEET_NAME in sheet_names else sheet_names[0]
+
+
+# 작업목록 시트(없으면 첫 번째 시트)와 정규화 양식의 유해요인 시트(있을 때만)를 한 번만 열어서 함께 읽음
+# source: 파일 내용(bytes) 또는 파일 객체, 반환값: (작업목록 DataFrame, 유해요인 DataFrame 또는 None, 사용된 방법 설명)
+def read_worklist_tables(source):
+    engine = detect_excel_engine(source)
+    with pd.ExcelFile(_as_file(source), engine=engine) as excel_file:
+        sheet_name = _select_sheet_name(excel_file.sheet_names)
+        df = excel_file.parse(sheet_name)
+        hazard_df = None
+        if HAZARD_SHEET_NAME in excel_file.sheet_names and HAZARD_SHEET_NAME != sheet_name:
+            hazard_df = excel_file.parse(HAZARD_SHEET_NAME)
+
+    method = f"엔진: {engine}, 시트: '{sheet_name}'"
+    if hazard_df is not None:
+        method += f", 유해요인 시트: '{HAZARD_SHEET_NAME}'"
+    return df, hazard_df, method
+
+
+# 파일 하나를 읽어 단위작업 목록으로 변환 (화면 없이 사용, 반환값: (단위작업 목록, 사용된 방법 설명))
+def load_task_units(source):
+    df, hazard_df, method = read_worklist_tables(source)
+    hazards_by_unit = decode_hazard_rows(hazard_df) if hazard_df is not None else None
+    return decode_task_units(df, hazards_by_unit=hazards_by_unit), method
+
+
+def _header_names(header_row):
+    return [f"Unnamed: {i}" if name is None else str(name) for i, name in enumerate(header_row)]
+
+
+# openpyxl 읽기 전용 모드로 시트를 chunk_size 행씩 DataFrame으로 나누어 읽음 (xlsx 전용)
+# 생성값: (행 묶음 DataFrame, 지금까지 읽은 행 수, 전체 행 수 추정값 또는 None)
+# 행 묶음의 인덱스는 pd.read_excel과 같이 시트 행 번호 - 2 (빈 행을 건너뛰어도 원래 행 번호 유지)
+# sheet_name을 주면 해당 시트를 읽음 (기본값: 작업목록 시트, 없으면 첫 번째 시트)
+def iter_worklist_chunks(source, chunk_size=STREAM_CHUNK_SIZE, max_rows=None, sheet_name=None):
+    workbook = load_workbook(_as_file(source), read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name or _select_sheet_name(workbook.sheetnames)]
+        total_rows = worksheet.max_row - 1 if worksheet.max_row else None
+        if max_rows and total_rows is not None:
+            total_rows = min(total_rows, max_rows)
+
+        rows = worksheet.iter_rows(values_only=True)
+        columns = _header_names(next(rows, ()))
+        rows_read = 0
+        chunk = []
+        chunk_index = []
+        for row_index, values in enumerate(rows):
+            if max_rows and rows_read >= max_rows:
+                break
+            if all(value is None for value in values):
+                continue # 서식만 있는 빈 행은 건너뜀
+            values = [np.nan if value is None else value for value in values[:len(columns)]]
+            values.extend([np.nan] * (len(columns) - len(values)))
+            chunk.append(values)
+            chunk_index.append(row_index)
+            rows_read += 1
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=columns, index=chunk_index, dtype=object), rows_read, total_rows
+                chunk = []
+                chunk_index = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns, index=chunk_index, dtype=object), rows_read, total_rows
+    finally:
+        workbook.close()
+
+
+# 작업목록 시트를 행 묶음 단위로 읽어 바로 단위작업으로 변환 (전체 시트를 메모리에 올리지 않음)
+# progress_callback(지금까지 읽은 행 수, 전체 행 수 추정값 또는 None)
+# chunk_callback(시트 이름, 행 묶음 DataFrame): 변환 전에 행 묶음마다 호출 (업로드 검증 등)
+# 반환값: (단위작업 목록, 사용된 방법 설명)
+def stream_task_units(source, chunk_size=STREAM_CHUNK_SIZE, max_rows=None, progress_callback=None, chunk_callback=None):
+    if detect_excel_engine(source) != "openpyxl":
+        raise ValueError("대용량 파일 모드는 xlsx 파일만 지원합니다.")
+
+    # 정규화 양식이면 유해요인 시트를 먼저 읽어 단위작업ID별로 모아 둠
+    hazards_by_unit = None
+    workbook = load_workbook(_as_file(source), read_only=True)
+    has_hazard_sheet = HAZARD_SHEET_NAME in workbook.sheetnames
+    workbook.close()
+    if has_hazard_sheet:
+        hazards_by_unit = {}
+        for chunk, _, _ in iter_worklist_chunks(source, chunk_size, sheet_name=HAZARD_SHEET_NAME):
+            if chunk_callback is not None:
+                chunk_callback(HAZARD_SHEET_NAME, chunk)
+            decode_hazard_rows(chunk, hazards_by_unit)
+
+    task_units = []
+    rows_read = 0
+    for chunk, rows_read, total_rows in iter_worklist_chunks(source, chunk_size, max_rows):
+        if chunk_callback is not None:
+            chunk_callback(WORKLIST_SHEET_NAME, chunk)
+        task_units.extend(decode_task_units(chunk, hazards_by_unit=hazards_by_unit))
+        if progress_callback is not None:
+            progress_callback(rows_read, total_rows)
+
+    method = f"엔진: openpyxl(읽기 전용 스트리밍), 읽은 행: {rows_read}"
+    if max_rows and rows_read >= max_rows:
+        method += f" (최대 {max_rows}행까지)"
+    return task_units, method
+
+
+# 컬럼 전체를 파이썬 값 리스트로 꺼냄 (컬럼이 없으면 기본값으로 채움)
+def _column_values(df, name, default):
+    if name in df.columns:
+        return df[name].tolist()
+    return [default] * len(df)
+
+
+def _notna_mask(df, name):
+    if name in df.columns:
+        return df[name].notna().to_numpy()
+    return np.zeros(len(df), dtype=bool)
+
+
+# 숫자 입력칸 항목의 컬럼 값 (숫자로 읽히는 값은 기준 단위의 숫자로, 빈 값과 잘못된 값은 그대로 둠)
+def _field_values(df, name, key, default):
+    values = _column_values(df, name, default)
+    if key not in NUMBER_FIELD_UNITS:
+        return values
+    numbers, _ = parse_numbers(values, NUMBER_FIELD_UNITS[key])
+    return np.where(np.isnan(numbers), np.asarray(values, dtype=object), numbers.astype(object)).tolist()
+
+
+def _strip_column(df, name, default):
+    return [str(value).strip() for value in _column_values(df, name, default)]
+
+
+# 슬롯 하나의 유해요인 항목들을 유형별 마스크로 한꺼번에 만듦 (행 번호 -> 항목)
+def _decode_hazard_slot(df, slot):
+    type_column = HAZARD_TYPE_COLUMN.format(n=slot)
+    if type_column not in df.columns:
+        return {}
+
+    types = df[type_column].to_numpy(dtype=object)
+    notna = _notna_mask(df, type_column)
+    filled = np.zeros(len(df), dtype=bool)
+    filled[notna] = [str(value).strip() != "" for value in types[notna]]
+
+    entries = {int(row): HazardRecord({"유형": types[row]}) for row in np.flatnonzero(filled)}
+
+    for hazard_type, fields in HAZARD_FIELDS.items():
+        rows = np.flatnonzero(filled & (types == hazard_type)).tolist()
+        if not rows:
+            continue
+
+        for key, column_template, default in fields:
+            values = _field_values(df, column_template.format(n=slot), key, default)
+            for row in rows:
+                entries[row][key] = values[row]
+
+        # 내보내기와 같이 기준 값에 표시 문자열이 들어 있으면 읽음 (앞의 그룹과 맞은 항목은 건너뜀)
+        unmatched = set(rows)
+        for trigger_key, marker, conditional_fields in HAZARD_CONDITIONAL_FIELDS.get(hazard_type, []):
+            matched_rows = [row for row in rows if row in unmatched and marker in str(entries[row].get(trigger_key, ""))]
+            if not matched_rows:
+                continue
+            unmatched.difference_update(matched_rows)
+            for key, column_template, default in conditional_fields:
+                values = _field_values(df, column_template.format(n=slot), key, default)
+                for row in matched_rows:
+                    entries[row][key] = values[row]
+
+    return entries
+
+
+# 단위작업ID 셀 값을 비교 가능한 문자열로 (엑셀에서 1이 1.0으로 읽혀도 같은 ID)
+def unit_id_key(value):
+    if isinstance(value, float):
+        if np.isnan(value):
+            return None
+        if value.is_integer():
+            value = int(value)
+    return str(value).strip()
+
+
+# 정규화 양식의 유해요인 시트(한 행 = 유해요인 항목 1개)를 단위작업ID별 항목 목록으로 변환
+# - 같은 단위작업의 항목은 항목번호 순서, 빈 셀은 항목에 넣지 않음 (입력 화면의 기본값 사용)
+# - hazards_by_unit을 주면 그 dict에 이어서 추가 (행 묶음으로 나누어 읽을 때)
+def decode_hazard_rows(hazard_df, hazards_by_unit=None):
+    if hazards_by_unit is None:
+        hazards_by_unit = {}
+    if UNIT_ID_COLUMN not in hazard_df.columns or "유형" not in hazard_df.columns:
+        return hazards_by_unit
+
+    if HAZARD_ORDER_COLUMN in hazard_df.columns:
+        order = pd.to_numeric(hazard_df[HAZARD_ORDER_COLUMN], errors="coerce")
+        hazard_df = hazard_df.iloc[np.argsort(order.to_numpy(dtype=float), kind="stable")]
+
+    unit_ids = [unit_id_key(value) for value in hazard_df[UNIT_ID_COLUMN].tolist()]
+    types = _strip_column(hazard_df, "유형", "")
+    type_notna = _notna_mask(hazard_df, "유형")
+    field_values = [
+        (key, _field_values(hazard_df, key, key, None), _notna_mask(hazard_df, key))
+        for key in hazard_field_keys() if key in hazard_df.columns
+    ]
+
+    for row, unit_id in enumerate(unit_ids):
+        if unit_id is None or not type_notna[row] or not types[row]:
+            continue
+        entry = HazardRecord({"유형": types[row]})
+        for key, values, notna in field_values:
+            if notna[row]:
+                entry[key] = values[row]
+        hazards_by_unit.setdefault(unit_id, []).append(entry)
+    return hazards_by_unit
+
+
+# 업로드된 작업목록 시트를 단위작업 목록으로 변환
+# - 기존(가로형) 양식: 유해요인_원인분석 슬롯 컬럼에서 최대 max_hazards개
+# - 정규화 양식: hazards_by_unit(decode_hazard_rows 결과)에서 단위작업ID로 찾아 개수 제한 없이
+def decode_task_units(df, max_hazards=FIXED_MAX_HAZARD_ANALYTICS, hazards_by_unit=None):
+    row_count = len(df)
+
+    text_values = {name: _strip_column(df, name, default) for name, default in TEXT_COLUMNS}
+
+    # 작업자 수는 "3명"처럼 단위가 붙어 있어도 읽고, 비어 있거나 잘못된 값은 1명
+    worker_numbers, _ = parse_numbers(_column_values(df, "작업자 수", 1), "명")
+    worker_counts = np.where(np.isfinite(worker_numbers), worker_numbers, 1).astype(int).tolist()
+
+    # 1일 작업시간은 화면에서 고치지 않고 그대로 내보내는 값이므로 여기서 한 번만 정리 (빈 칸은 0, 그 외는 그대로)
+    daily_hours = [
+        value if notna else 0
+        for value, notna in zip(_column_values(df, "1일 작업시간", 0), _notna_mask(df, "1일 작업시간"))
+    ]
+
+    gear_values = _column_values(df, "보호구", "")
+    gear_notna = _notna_mask(df, "보호구")
+    protection_gear = [
+        [item.strip() for item in str(value).split(",") if item.strip()] if notna else []
+        for value, notna in zip(gear_values, gear_notna)
+    ]
+
+    burden_values = {}
+    for col_name in BURDEN_COLUMNS:
+        if col_name in df.columns:
+            stripped = np.array(_strip_column(df, col_name, "X"), dtype=object)
+            burden_values[col_name] = np.where(_notna_mask(df, col_name), stripped, "X").tolist()
+        else:
+            burden_values[col_name] = ["X"] * row_count
+
+    if hazards_by_unit is not None and UNIT_ID_COLUMN in df.columns:
+        unit_hazards = [
+            [hazard_entry.copy() for hazard_entry in hazards_by_unit.get(unit_id_key(value), [])]
+            for value in df[UNIT_ID_COLUMN].tolist()
+        ]
+    else:
+        hazard_slots = [_decode_hazard_slot(df, slot) for slot in range(1, max_hazards + 1)]
+        unit_hazards = [[slot[row] for slot in hazard_slots if row in slot] for row in range(row_count)]
+
+    loaded_task_units = []
+    for row in range(row_count):
+        unit = UnitRecord({
+            "회사명": text_values["회사명"][row],
+            "소속": text_values["소속"][row],
+            "반": text_values["반"][row],
+            "단위작업명": text_values["단위작업명"][row],
+            "작업내용(상세설명)": text_values["작업내용(상세설명)"][row],
+            "작업자 수": worker_counts[row],
+            "작업자 이름": text_values["작업자 이름"][row],
+            "작업형태": text_values["작업형태"][row],
+            "1일 작업시간": daily_hours[row],
+            "유해요인_원인분석": unit_hazards[row],
+            "보호구": protection_gear[row],
+            "작성자": text_values["작성자"][row],
+            "연락처": text_values["연락처"][row]
+        })
+        for col_name in BURDEN_COLUMNS:
+            unit[col_name] = burden_values[col_name][row]
+
+        if not any([unit["회사명"], unit["단위작업명"], unit["작업내용(상세설명)"]]):
+            continue
+
+        if not unit["유해요인_원인분석"]:
+            unit["유해요인_원인분석"].append(new_hazard_entry())
+
+        loaded_task_units.append(unit)
+
+    return loaded_task_units
@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from worklist import export, profiling
+from worklist.records import with_header
+
+# 내보내기 파일을 만드는 작업 스레드 수 (프로세스 공용, 환경 변수로 변경 가능)
+EXPORT_WORKERS = int(os.environ.get("WORKLIST_EXPORT_WORKERS", "2"))
+
+_executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix="worklist-export")
+
+
+# 내보내기 파일 1개를 작업 스레드에서 만드는 작업
+# - task_units의 단위작업은 작업이 끝날 때까지 고치지 않아야 함 (화면에서 고칠 단위작업은 복사해서 사용)
+# - header를 주면 작업 스레드에서 회사명/소속/반 머리글을 단위작업에 합쳐서 내보냄
+# - split=True이면 소속/반별 파일을 zip 1개로 묶음 (묶음별 파일은 프로세스 풀에서 동시에 만듦)
+# - progress: 0~1 진행률, cancel(): 다음 진행률 보고 시점에 중단
+# - session_id를 주면 완료 시간을 성능 측정 로그("export")로 남김
+class ExportJob:
+    def __init__(self, task_units, file_format, header=None, session_id=None, split=False):
+        self.task_units = task_units
+        self.file_format = file_format
+        self.split = split
+        self.header = header
+        self.session_id = session_id
+        self.done_units = 0
+        self.total_units = len(task_units)
+        self.seconds = None
+        self._cancel_event = threading.Event()
+        self._future = _executor.submit(self._run)
+
+    def _report(self, done, total):
+        self.done_units = done
+
+    def _run(self):
+        started = time.perf_counter()
+        task_units = self.task_units if self.header is None else with_header(self.task_units, self.header)
+        data = export.get_export_bytes(
+            task_units, self.file_format, progress=self._report, cancelled=self._cancel_event.is_set, split=self.split
+        )
+        self.seconds = time.perf_counter() - started
+        if self.session_id is not None:
+            profiling.log_event(
+                "export", self.session_id, ms=round(self.seconds * 1000, 2),
+                format=self.file_format, units=self.total_units, split=self.split, background=True
+            )
+        return data
+
+    @property
+    def progress(self):
+        return self.done_units / self.total_units if self.total_units else 1.0
+
+    @property
+    def running(self):
+        return not self._future.done()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+        self._future.cancel()
+
+    # 완료된 파일 내용 (완료 전이거나 실패/취소된 경우 None)
+    def result(self):
+        if self.running or self.cancelled or self.error() is not None:
+            return None
+        return self._future.result()
+
+    # 실패한 경우 예외 (취소는 실패로 보지 않음)
+    def error(self):
+        if self.running:
+            return None
+        try:
+            error = self._future.exception()
+        except CancelledError:
+            return None
+        return None if isinstance(error, export.ExportCancelled) else error
@@ -0,0 +1,85 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# 단위 종류별로 허용하는 단위 표기와 기준 단위로 바꾸는 배수 (빈 문자열: 숫자만 입력한 경우)
+# - "회/분", "초/회", "회/일"처럼 빗금이 있는 표기는 빗금 앞의 단위로 봄
+# - 예: 단위 종류 "분"에서 "2시간" -> 120, "90초" -> 1.5
+UNIT_SCALES = {
+    "분": {"": 1.0, "분": 1.0, "시간": 60.0, "초": 1 / 60},
+    "초": {"": 1.0, "초": 1.0, "분": 60.0, "시간": 3600.0},
+    "시간": {"": 1.0, "시간": 1.0, "분": 1 / 60},
+    "회": {"": 1.0, "회": 1.0, "번": 1.0},
+    "kg": {"": 1.0, "kg": 1.0, "g": 0.001},
+    "명": {"": 1.0, "명": 1.0},
+}
+
+# 단위 종류를 정하지 않으면 알려진 단위 표기를 모두 허용하고 환산하지 않음
+_ANY_UNIT = {unit: 1.0 for scales in UNIT_SCALES.values() for unit in scales}
+
+# 숫자 + 단위 표기 (천 단위 쉼표는 미리 제거)
+_NUMBER_PATTERN = r"^([-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)\s*([^\d\s/]*)\s*(?:/.*)?$"
+_NUMBER_REGEX = re.compile(_NUMBER_PATTERN)
+
+# 빈 값으로 보는 문자열 (엑셀에서 읽은 "nan" 등)
+_BLANK_TEXT = {"", "nan", "none"}
+
+
+def _unit_scales(kind):
+    return _ANY_UNIT if kind is None else UNIT_SCALES[kind]
+
+
+# 숫자 컬럼 전체를 한 번에 변환 (kind: UNIT_SCALES의 단위 종류, 기준 단위로 환산)
+# 반환값: (float 배열, 잘못된 값 마스크)
+# - 빈 값은 NaN이고 잘못된 값이 아님
+# - 비어 있지 않은데 숫자로 읽을 수 없거나 단위 종류에 맞지 않는 값은 NaN이고 마스크가 True
+def parse_numbers(values, kind=None):
+    series = pd.Series(np.asarray(values, dtype=object), dtype=object)
+    numbers = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, copy=True)
+    invalid = np.zeros(len(series), dtype=bool)
+
+    # 숫자로 바로 읽히지 않은 값만 문자열로 나누어 읽음 (단위 표기, 천 단위 쉼표 등)
+    text_rows = np.flatnonzero(np.isnan(numbers) & series.notna().to_numpy())
+    if len(text_rows):
+        text = series.iloc[text_rows].astype(str).str.strip().str.replace(",", "", regex=False)
+        parts = text.str.extract(_NUMBER_PATTERN)
+        scales = parts[1].str.lower().map(_unit_scales(kind))
+        converted = (pd.to_numeric(parts[0], errors="coerce") * scales).to_numpy(dtype=float)
+        numbers[text_rows] = converted
+        invalid[text_rows] = np.isnan(converted) & ~text.str.lower().isin(_BLANK_TEXT).to_numpy()
+    return numbers, invalid
+
+
+# parse_numbers의 값 1개 버전 (입력 화면에서 항목 1개를 판정할 때)
+# 반환값: (float 또는 NaN, 잘못된 값인지)
+def parse_number(value, kind=None):
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return float("nan"), False
+    if isinstance(value, (int, float, np.number)):
+        return float(value), False
+
+    text = str(value).strip().replace(",", "")
+    if text.lower() in _BLANK_TEXT:
+        return float("nan"), False
+    try:
+        return float(text), False
+    except ValueError:
+        pass
+    match = _NUMBER_REGEX.match(text)
+    scale = _unit_scales(kind).get(match.group(2).lower()) if match else None
+    if scale is None:
+        return float("nan"), True
+    return float(match.group(1)) * scale, False
+
+
+# 숫자 입력칸(st.number_input)에 넣을 값을 default와 같은 타입으로 맞춤
+# (업로드한 빈 셀(NaN), 정수 컬럼이 실수로 읽힌 12.0, 단위가 붙은 문자열 등)
+def input_number(value, default, min_value=None, kind=None):
+    number, _ = parse_number(value, kind)
+    if number != number or number in (float("inf"), float("-inf")):
+        number = default
+    number = int(number) if isinstance(default, int) else float(number)
+    if min_value is not None and number < min_value:
+        number = min_value
+    return number
@@ -0,0 +1,12 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# 프로세스 풀의 시작 방식 (환경 변수로 변경 가능: spawn, forkserver, fork)
+# Streamlit 서버는 세션마다 스레드를 쓰므로 fork로 만들면 다른 스레드가 잡고 있던 잠금(로깅, 자동 저장소,
+# 업로드/내보내기 캐시)까지 잠긴 채로 복사되어 자식 프로세스가 멈출 수 있음, 그래서 기본은 spawn
+PROCESS_START_METHOD = os.environ.get("WORKLIST_PROCESS_START_METHOD", "spawn")
+
+
+def process_pool(max_workers=None):
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(PROCESS_START_METHOD))
@@ -0,0 +1,172 @@
+import json
+import logging
+import os
+import sys
+import time
+
+# 성능 측정 켜기: 환경 변수 WORKLIST_PROFILE=1 (서버 전체) 또는 주소에 ?profile=1 (해당 세션만)
+PROFILE_ENV = "WORKLIST_PROFILE"
+PROFILE_QUERY_PARAM = "profile"
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+# 측정 결과는 한 줄짜리 JSON 로그로 남김 (서버에서 세션별로 모아 보기 위함)
+LOGGER_NAME = "worklist.profile"
+
+
+def _is_true(value):
+    if isinstance(value, (list, tuple)):
+        value = value[-1] if value else ""
+    return str(value).strip().lower() in _TRUE_VALUES
+
+
+def profiling_requested(query_params=None):
+    if _is_true(os.environ.get(PROFILE_ENV, "")):
+        return True
+    return bool(query_params) and _is_true(query_params.get(PROFILE_QUERY_PARAM, ""))
+
+
+def get_logger():
+    logger = logging.getLogger(LOGGER_NAME)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def log_event(event, session_id, **fields):
+    record = {"event": event, "session": session_id}
+    record.update(fields)
+    get_logger().info(json.dumps(record, ensure_ascii=False, default=str))
+    return record
+
+
+# Streamlit 내부 상태(ScriptRunContext)를 읽는 부분: streamlit 1.65.0에서 확인함
+# 공개 API가 아니라 버전에 따라 이름이나 위치가 바뀔 수 있으므로 읽지 못하면 None/False로 두고 측정만 빠짐
+def _script_run_ctx():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return get_script_run_ctx()
+    except Exception:
+        return None
+
+
+# 이번 실행에서 지금까지 그린 위젯 수 (ctx.shared.widget_ids_this_run, 읽지 못하면 None)
+def count_rendered_widgets():
+    try:
+        ctx = _script_run_ctx()
+        widget_ids = getattr(getattr(ctx, "shared", ctx), "widget_ids_this_run", None)
+        if widget_ids is None:
+            return None
+        return len(widget_ids.snapshot()) if hasattr(widget_ids, "snapshot") else len(widget_ids)
+    except Exception:
+        return None
+
+
+# 조각(st.fragment)만 다시 실행 중인지 (ctx.fragment_ids_this_run, 전체 실행이거나 읽지 못하면 False)
+def is_fragment_rerun():
+    try:
+        return bool(getattr(_script_run_ctx(), "fragment_ids_this_run", None))
+    except Exception:
+        return False
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+# 스크립트 실행(rerun) 1회의 단계별 시간과 단위작업별 위젯 수
+# - lap(이름): 이전 단계를 끝내고 새 단계 시작 (위에서 아래로 실행되는 스크립트에 표시만 넣으면 됨)
+# - add(이름, 초): 다른 단계 안에서 따로 잰 시간 (예: 입력 폼 안의 부담작업 판정)
+# - start_unit/end_unit: 단위작업 1개의 입력 위젯을 그리는 시간과 위젯 수
+# enabled=False이면 모든 메서드가 아무것도 하지 않음
+class RerunProfile:
+    def __init__(self, session_id, run_number, enabled=True, widget_counter=None):
+        self.session_id = session_id
+        self.run_number = run_number
+        self.enabled = enabled
+        self.widget_counter = widget_counter
+        self.phases = {}
+        self.nested = {}
+        self.units = []
+        self.record = None
+        self._run_started = time.perf_counter() if enabled else 0.0
+        self._phase_name = None
+        self._phase_started = 0.0
+        self._unit = None
+
+    def _widget_count(self):
+        if self.widget_counter is None:
+            return None
+        try:
+            return self.widget_counter()
+        except Exception:
+            return None
+
+    def lap(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._phase_name is not None:
+            self.phases[self._phase_name] = self.phases.get(self._phase_name, 0.0) + now - self._phase_started
+        self._phase_name = name
+        self._phase_started = now
+
+    def add(self, name, seconds):
+        if self.enabled:
+            self.nested[name] = self.nested.get(name, 0.0) + seconds
+
+    def start_unit(self, unit_index):
+        if self.enabled:
+            self._unit = (unit_index, time.perf_counter(), self._widget_count())
+
+    def end_unit(self):
+        if not self.enabled or self._unit is None:
+            return
+        unit_index, started, widgets_before = self._unit
+        widgets_after = self._widget_count()
+        widgets = None if widgets_before is None or widgets_after is None else widgets_after - widgets_before
+        self.units.append((unit_index, time.perf_counter() - started, widgets))
+        self._unit = None
+
+    # 측정 종료 후 로그 기록 (st.rerun() 직전처럼 중간에 끝나는 실행은 status로 구분)
+    def finish(self, status="완료", **fields):
+        if not self.enabled or self.record is not None:
+            return self.record
+        self.lap(None)
+        unit_widgets = [widgets for _, _, widgets in self.units if widgets is not None]
+        self.record = log_event(
+            "rerun",
+            self.session_id,
+            run=self.run_number,
+            status=status,
+            total_ms=_ms(time.perf_counter() - self._run_started),
+            phases_ms={name: _ms(seconds) for name, seconds in self.phases.items()},
+            nested_ms={name: _ms(seconds) for name, seconds in self.nested.items()},
+            units_rendered=len(self.units),
+            unit_ms_max=_ms(max((seconds for _, seconds, _ in self.units), default=0.0)),
+            widgets_total=sum(unit_widgets) if unit_widgets else None,
+            widgets_per_unit=round(sum(unit_widgets) / len(unit_widgets), 1) if unit_widgets else None,
+            **fields
+        )
+        return self.record
+
+    # 진단 화면용 표 (단계별 시간, 단위작업별 시간과 위젯 수)
+    def phase_rows(self):
+        rows = [{"단계": name, "시간(ms)": _ms(seconds)} for name, seconds in self.phases.items()]
+        rows.extend({"단계": f"  └ {name}", "시간(ms)": _ms(seconds)} for name, seconds in self.nested.items())
+        return rows
+
+    def unit_rows(self):
+        return [
+            {"번호": unit_index + 1, "시간(ms)": _ms(seconds), "위젯 수": widgets}
+            for unit_index, seconds, widgets in self.units
+        ]
+
+
+# 조각(st.fragment)만 다시 실행된 경우의 시간 (전체 실행의 RerunProfile과 따로 기록)
+def log_fragment(session_id, fragment, seconds, **fields):
+    return log_event("fragment", session_id, fragment=fragment, ms=_ms(seconds), **fields)
+
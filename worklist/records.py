@@ -0,0 +1,212 @@
+import re
+from collections.abc import MutableMapping
+
+from worklist.schema import (
+    BURDEN_COLUMNS,
+    HAZARD_KEY,
+    SOURCE_KEY,
+    UNIT_PREFIX_COLUMNS,
+    UNIT_SUFFIX_COLUMNS,
+    UNIT_UID_KEY,
+    hazard_field_keys,
+)
+
+# 세션 상태에 보관하는 단위작업/유해요인 항목 레코드
+# - 항목마다 dict를 두지 않고 __slots__로 고정된 칸에 저장 (세션이 많을 때 메모리 절약)
+# - 기존 코드와 같이 unit["단위작업명"], unit.get(...), unit.update(...)로 읽고 쓸 수 있음
+# - 값을 넣지 않은 칸은 dict에 키가 없는 것과 같음 (get의 기본값 사용, 저장/내보내기에서 제외)
+# - 정해진 항목 외의 키는 필요할 때만 만드는 별도 dict에 저장
+
+# 예전 단위작업에 있던 사용하지 않는 항목 (불러올 때 버림)
+# "1일 작업시간"은 입력 화면에서 고치지 않지만 작업목록표의 컬럼이므로 버리지 않고 그대로 내보냄
+# (업로드할 때 한 번만 정리: 빈 칸은 0, importer.decode_task_units)
+UNUSED_UNIT_KEYS = ("자세", "중량물", "도구")
+
+UNIT_KEYS = UNIT_PREFIX_COLUMNS + BURDEN_COLUMNS + [HAZARD_KEY] + UNIT_SUFFIX_COLUMNS + [UNIT_UID_KEY, SOURCE_KEY]
+HAZARD_KEYS = ["유형"] + hazard_field_keys()
+
+_MISSING = object()
+
+
+# 항목 키를 슬롯 이름으로 ("작업내용(상세설명)" -> "작업내용_상세설명_")
+def attribute_name(key):
+    name = re.sub(r"\W", "_", key)
+    return name if name.isidentifier() else "_" + name
+
+
+def _attribute_names(keys):
+    attributes = {key: attribute_name(key) for key in keys}
+    if len(set(attributes.values())) != len(attributes):
+        raise ValueError("항목 키의 슬롯 이름이 겹칩니다.")
+    return attributes
+
+
+class _Record(MutableMapping):
+    __slots__ = ("_extra",)
+    _ATTRIBUTES = {} # 항목 키 -> 슬롯 이름
+
+    def __init__(self, fields=None):
+        if fields:
+            self.update(fields)
+
+    def __getitem__(self, key):
+        attribute = self._ATTRIBUTES.get(key)
+        try:
+            return getattr(self, attribute) if attribute is not None else self._extra[key]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        attribute = self._ATTRIBUTES.get(key)
+        if attribute is not None:
+            setattr(self, attribute, value)
+            return
+        try:
+            self._extra[key] = value
+        except AttributeError:
+            self._extra = {key: value}
+
+    def __delitem__(self, key):
+        attribute = self._ATTRIBUTES.get(key)
+        try:
+            if attribute is not None:
+                delattr(self, attribute)
+            else:
+                del self._extra[key]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        for key, attribute in self._ATTRIBUTES.items():
+            if getattr(self, attribute, _MISSING) is not _MISSING:
+                yield key
+        yield from getattr(self, "_extra", ())
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    # MutableMapping 기본 구현(예외 처리 경유)보다 빠르게
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key, default=None):
+        attribute = self._ATTRIBUTES.get(key)
+        if attribute is not None:
+            return getattr(self, attribute, default)
+        return getattr(self, "_extra", {}).get(key, default)
+
+    # 칸을 그대로 옮겨 복사 (항목마다 __setitem__을 거치지 않음)
+    def copy(self):
+        record = type(self).__new__(type(self))
+        for attribute in self._ATTRIBUTES.values():
+            value = getattr(self, attribute, _MISSING)
+            if value is not _MISSING:
+                setattr(record, attribute, value)
+        extra = getattr(self, "_extra", None)
+        if extra is not None:
+            record._extra = dict(extra)
+        return record
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class HazardRecord(_Record):
+    _ATTRIBUTES = _attribute_names(HAZARD_KEYS)
+    __slots__ = tuple(_ATTRIBUTES.values())
+
+
+class UnitRecord(_Record):
+    _ATTRIBUTES = _attribute_names(UNIT_KEYS)
+    __slots__ = tuple(_ATTRIBUTES.values())
+
+
+def new_hazard_entry():
+    return HazardRecord({"유형": "", "부담작업": "", "부담작업자세": ""})
+
+
+def hazard_from_dict(hazard_entry):
+    return hazard_entry if isinstance(hazard_entry, HazardRecord) else HazardRecord(hazard_entry)
+
+
+# dict 단위작업(예전 자동 저장, 직접 만든 목록 등)을 레코드로 (유해요인 항목도 함께 변환)
+def unit_from_dict(unit):
+    if isinstance(unit, UnitRecord):
+        return unit
+    record = UnitRecord({key: value for key, value in unit.items() if key not in UNUSED_UNIT_KEYS and key != HAZARD_KEY})
+    record[HAZARD_KEY] = [hazard_from_dict(hazard_entry) for hazard_entry in unit.get(HAZARD_KEY, [])]
+    return record
+
+
+def units_from_dicts(task_units):
+    return [unit_from_dict(unit) for unit in task_units]
+
+
+# 단위작업 복사본 (유해요인 항목과 보호구 같은 목록 값도 복사하므로 복사본을 고쳐도 원본은 그대로)
+def clone_unit(unit):
+    record = unit.copy() if isinstance(unit, UnitRecord) else UnitRecord(unit)
+    for key, value in record.items():
+        if isinstance(value, list):
+            record[key] = list(value)
+    record[HAZARD_KEY] = [hazard_from_dict(hazard_entry).copy() for hazard_entry in unit.get(HAZARD_KEY, [])]
+    return record
+
+
+def hazard_to_dict(hazard_entry):
+    return dict(hazard_entry)
+
+
+# 레코드를 기존 dict 모양으로 (JSON 저장, 내용 비교 등)
+def unit_to_dict(unit):
+    unit_dict = dict(unit)
+    if HAZARD_KEY in unit_dict:
+        unit_dict[HAZARD_KEY] = [hazard_to_dict(hazard_entry) for hazard_entry in unit_dict[HAZARD_KEY]]
+    return unit_dict
+
+
+# 내용 비교/해시용 dict (화면에서만 쓰는 고유ID와 원본 파일 이름은 뺌, 세션이나 업로드가 달라도 내용이 같으면 같은 값)
+def unit_content(unit):
+    return {key: value for key, value in unit_to_dict(unit).items() if key not in (UNIT_UID_KEY, SOURCE_KEY)}
+
+
+# 회사명/소속/반 (작업목록 머리글)
+# - 세션에는 머리글 하나만 두고, 단위작업에는 머리글과 다른 값(여러 소속/반을 합친 경우 등)만 저장
+# - 단위작업의 값은 unit.get(key, header[key])로 읽고, 내보낼 때만 with_header로 합침
+HEADER_KEYS = ("회사명", "소속", "반")
+
+
+def empty_header():
+    return {key: "" for key in HEADER_KEYS}
+
+
+# 머리글과 같은 값은 단위작업에서 지움 (예전 자동 저장처럼 단위작업마다 머리글이 복사된 목록 정리)
+def strip_header(task_units, header):
+    for unit in task_units:
+        for key in HEADER_KEYS:
+            if key in unit and unit[key] == header.get(key, ""):
+                del unit[key]
+    return task_units
+
+
+# 불러온 단위작업 목록에서 머리글을 분리, 반환값: 머리글 dict
+# 모든 단위작업이 같은 값인 항목만 머리글로 옮기고, 서로 다른 항목은 머리글을 비우고 단위작업별 값을 유지
+def split_header(task_units):
+    header = {}
+    for key in HEADER_KEYS:
+        values = {unit.get(key, "") for unit in task_units}
+        header[key] = values.pop() if len(values) == 1 else ""
+    strip_header(task_units, header)
+    return header
+
+
+# 내보내기용 단위작업 목록 (머리글 값이 없는 단위작업에 머리글을 채운 복사본, 세션의 단위작업은 그대로)
+# copy_unit: 복사 방법 (기본은 얕은 복사, 유해요인 항목까지 복사하려면 clone_unit)
+def with_header(task_units, header, copy_unit=None):
+    joined_units = []
+    for unit in task_units:
+        joined_unit = copy_unit(unit) if copy_unit is not None else unit.copy()
+        for key in HEADER_KEYS:
+            if key not in joined_unit:
+                joined_unit[key] = header.get(key, "")
+        joined_units.append(joined_unit)
+    return joined_units
@@ -0,0 +1,166 @@
+# 작업목록 엑셀 양식의 컬럼 구성 (업로드/내보내기 공통)
+
+FIXED_MAX_HAZARD_ANALYTICS = 5
+
+WORKLIST_SHEET_NAME = "작업목록"
+
+# 정규화(세로형) 양식: 유해요인 항목을 별도 시트에 한 행씩 저장하고 단위작업ID로 연결
+HAZARD_SHEET_NAME = "유해요인"
+UNIT_ID_COLUMN = "단위작업ID"
+HAZARD_ORDER_COLUMN = "항목번호"
+
+HAZARD_TYPE_REPEAT = "반복동작"
+HAZARD_TYPE_POSTURE = "부자연스러운 자세"
+HAZARD_TYPE_FORCE = "과도한 힘"
+HAZARD_TYPE_OTHER = "접촉스트레스 또는 기타(진동, 밀고 당기기 등)"
+
+HAZARD_TYPE_COLUMN = "유해요인_원인분석_유형_{n}"
+
+# 유해요인 유형별 부담작업 선택지 (입력 화면의 선택 목록, 첫 항목은 선택 안 함)
+BURDEN_OPTIONS = {
+    HAZARD_TYPE_REPEAT: [
+        "",
+        "(1호)하루에 4시간 이상 집중적으로 자료입력 등을 위해 키보드 또는 마우스를 조작하는 작업",
+        "(2호)하루에 이 2시간 이상 목, 어깨, 팔꿈치, 손목 또는 손을 사용하여 같은 동작을 반복하는 작업",
+        "(6호)하루에 이 2시간 이상 지지되지 않은 상태에서 1kg 이상의 물건을 한손의 손가락으로 집어 옮기거나, 2kg 이상에 상당하는 힘을 가하여 한손의 손가락으로 물건을 쥐는 작업",
+        "(7호)하루에 이 2시간 이상 지지되지 않은 상태에서 4.5kg 이상의 물건을 한 손으로 들거나 동일한 힘으로 쥐는 작업",
+        "(10호)하루에 이 2시간 이상, 분당 2회 이상 4.5kg 이상의 물체를 드는 작업",
+        "(1호)하루에 4시간 이상 집중적으로 자료입력 등을 위해 키보드 또는 마우스를 조작하는 작업+(12호)정적자세(장시간 서서 작업, 또는 장시간 앉아서 작업)",
+        "(2호)하루에 이 2시간 이상 목, 어깨, 팔꿈치, 손목 또는 손을 사용하여 같은 동작을 반복하는 작업+(12호)정적자세(장시간 서서 작업, 또는 장시간 앉아서 작업)",
+        "(6호)하루에 이 2시간 이상 지지되지 않은 상태에서 1kg 이상의 물건을 한손의 손가락으로 집어 옮기거나, 2kg 이상에 상당하는 힘을 가하여 한손의 손가락으로 물건을 쥐는 작업+(12호)정적자세(장시간 서서 작업, 또는 장시간 앉아서 작업)",
+        "(7호)하루에 이 2시간 이상 지지되지 않은 상태에서 4.5kg 이상의 물건을 한 손으로 들거나 동일한 힘으로 쥐는 작업+(12호)정적자세(장시간 서서 작업, 또는 장시간 앉아서 작업)",
+        "(10호)하루에 이 2시간 이상, 분당 2회 이상 4.5kg 이상의 물체를 드는 작업+(12호)정적자세(장시간 서서 작업, 또는 장시간 앉아서 작업)",
+    ],
+    HAZARD_TYPE_POSTURE: [
+        "",
+        "(3호)하루에 이 2시간 이상 머리 위에 손이 있거나, 팔꿈치가 어깨위에 있거나, 팔꿈치를 몸통으로부터 들거나, 팔꿈치를 몸통뒤쪽에 위치하도록 하는 상태에서 이루어지는 작업",
+        "(4호)지지되지 않은 상태이거나 임의로 자세를 바꿀 수 없는 조건에서, 하루에 이 2시간 이상 목이나 허리를 구부리거나 트는 상태에서 이루어지는 작업",
+        "(5호)하루에 이 2시간 이상 쪼그리고 앉거나 무릎을 굽힌 자세에서 이루어지는 작업",
+    ],
+    HAZARD_TYPE_FORCE: [
+        "",
+        "(8호)하루에 10회 이상 25kg 이상의 물체를 드는 작업",
+        "(9호)하루에 25회 이상 10kg 이상의 물체를 무릎 아래에서 들거나, 어깨 위에서 들거나, 팔을 뻗은 상태에서 드는 작업",
+        "(12호)밀기/당기기 작업",
+        "(8호)하루에 10회 이상 25kg 이상의 물체를 드는 작업+(12호)밀기/당기기 작업",
+        "(9호)하루에 25회 이상 10kg 이상의 물체를 무릎 아래에서 들거나, 어깨 위에서 들거나, 팔을 뻗은 상태에서 드는 작업+(12호)밀기/당기기 작업",
+    ],
+    HAZARD_TYPE_OTHER: [
+        "",
+        "(11호)하루에 이 2시간 이상 시간당 10회 이상 손 또는 무릎을 사용하여 반복적으로 충격을 가하는 작업",
+        "(12호)진동작업(그라인더, 임팩터 등)",
+    ],
+}
+
+# 유해요인 유형별 (항목 키, 컬럼 이름 템플릿, 컬럼이 없을 때 기본값)
+HAZARD_FIELDS = {
+    HAZARD_TYPE_REPEAT: [
+        ("부담작업", "유해요인_원인분석_부담작업_{n}_반복", ""),
+        ("수공구 종류", "유해요인_원인분석_수공구_종류_{n}", ""),
+        ("수공구 용도", "유해요인_원인분석_수공구_용도_{n}", ""),
+        ("수공구 무게(kg)", "유해요인_원인분석_수공구_무게(kg)_{n}", 0.0),
+        ("수공구 사용시간(분)", "유해요인_원인분석_수공구_사용시간(분)_{n}", ""),
+        ("부담부위", "유해요인_원인분석_부담부위_{n}", ""),
+        ("회당 반복시간(초/회)", "유해요인_원인분석_반복_회당시간(초/회)_{n}", ""),
+        ("작업시간동안 반복횟수(회/일)", "유해요인_원인분석_반복_이횟수(회/일)_{n}", ""),
+        ("이 작업시간(분)", "유해요인_원인분석_반복_이시간(분)_{n}", ""),
+        ("물체 무게(kg)_10호", "유해요인_원인분석_반복_물체무게_10호(kg)_{n}", 0.0),
+        ("분당 반복횟수(회/분)_10호", "유해요인_원인분석_반복_분당반복횟수_10호(회/분)_{n}", ""),
+        ("작업내용_12호_정적", "유해요인_원인분석_반복_작업내용_12호_정적_{n}", ""),
+        ("작업시간(분)_12호_정적", "유해요인_원인분석_반복_작업시간_12호_정적_{n}", ""),
+        ("휴식시간(분)_12호_정적", "유해요인_원인분석_반복_휴식시간_12호_정적_{n}", ""),
+        ("인체부담부위_12호_정적", "유해요인_원인분석_반복_인체부담부위_12호_정적_{n}", ""),
+    ],
+    HAZARD_TYPE_POSTURE: [
+        ("부담작업자세", "유해요인_원인분석_부담작업자세_{n}", ""),
+        ("회당 반복시간(초/회)", "유해요인_원인분석_자세_회당시간(초/회)_{n}", ""),
+        ("작업시간동안 반복횟수(회/일)", "유해요인_원인분석_자세_이횟수(회/일)_{n}", ""),
+        ("이 작업시간(분)", "유해요인_원인분석_자세_이시간(분)_{n}", ""),
+    ],
+    HAZARD_TYPE_FORCE: [
+        ("부담작업", "유해요인_원인분석_부담작업_{n}_힘", ""),
+        ("중량물 명칭", "유해요인_원인분석_힘_중량물_명칭_{n}", ""),
+        ("중량물 용도", "유해요인_원인분석_힘_중량물_용도_{n}", ""),
+        ("중량물 무게(kg)", "유해요인_원인분석_중량물_무게(kg)_{n}", 0.0),
+        ("하루 8시간동안 중량물을 드는 횟수(회)", "유해요인_원인분석_하루8시간_중량물_횟수(회)_{n}", 0),
+        ("취급방법", "유해요인_원인분석_힘_취급방법_{n}", ""),
+        ("중량물 이동방법", "유해요인_원인분석_힘_이동방법_{n}", ""),
+        ("작업자가 직접 밀고/당기기", "유해요인_원인분석_힘_직접_밀당_{n}", ""),
+        ("기타_밀당_설명", "유해요인_원인분석_힘_기타_밀당_설명_{n}", ""),
+        ("작업시간동안 작업횟수(회/일)", "유해요인_원인분석_힘_이횟수(회/일)_{n}", ""),
+    ],
+    HAZARD_TYPE_OTHER: [
+        ("부담작업", "유해요인_원인분석_부담작업_{n}_기타", ""),
+    ],
+}
+
+# 특정 부담작업을 선택한 경우에만 읽고 쓰는 컬럼
+# (유형: [(기준 키, 포함 표시, 필드 목록)])
+# 업로드와 내보내기 모두 기준 키의 값에 표시 문자열이 포함되어 있으면 읽고 쓴다 (앞의 그룹이 우선).
+HAZARD_CONDITIONAL_FIELDS = {
+    HAZARD_TYPE_OTHER: [
+        ("부담작업", "(11호)", [
+            ("작업시간(분)", "유해요인_원인분석_기타_작업시간(분)_{n}", ""),
+        ]),
+        ("부담작업", "(12호)진동작업", [
+            ("진동수공구명", "유해요인_원인분석_기타_진동수공구명_{n}", ""),
+            ("진동수공구 용도", "유해요인_원인분석_기타_진동수공구_용도_{n}", ""),
+            ("작업시간(분)_진동", "유해요인_원인분석_기타_작업시간_진동_{n}", ""),
+            ("작업빈도(초/회)_진동", "유해요인_원인분석_기타_작업빈도_진동_{n}", ""),
+            ("작업량(회/일)_진동", "유해요인_원인분석_기타_작업량_진동_{n}", ""),
+            ("수공구사용시 지지대가 있는가?", "유해요인_원인분석_기타_지지대_여부_{n}", ""),
+        ]),
+    ],
+}
+
+BURDEN_COLUMNS = [f"부담작업_{k}호" for k in range(1, 13)]
+
+UNIT_PREFIX_COLUMNS = [
+    "회사명", "소속", "반", "단위작업명", "작업내용(상세설명)",
+    "작업자 수", "작업자 이름",
+    "작업형태", "1일 작업시간"
+]
+
+UNIT_SUFFIX_COLUMNS = ["보호구", "작성자", "연락처"]
+
+# 단위작업의 유해요인 항목 목록 키
+HAZARD_KEY = "유해요인_원인분석"
+
+# 엑셀 양식에는 없고 화면에서만 쓰는 단위작업 항목
+UNIT_UID_KEY = "고유ID" # 자동 저장용 단위작업 고유 ID
+SOURCE_KEY = "출처" # 여러 파일을 합칠 때 원본 파일 이름
+
+
+# 유해요인 슬롯 1개의 컬럼 이름 템플릿 (유형 컬럼, 유형별 필드, 조건부 필드 순서)
+def hazard_column_templates():
+    templates = [HAZARD_TYPE_COLUMN]
+    for hazard_type, fields in HAZARD_FIELDS.items():
+        templates.extend(column_template for _, column_template, _ in fields)
+        for _, _, conditional_fields in HAZARD_CONDITIONAL_FIELDS.get(hazard_type, []):
+            templates.extend(column_template for _, column_template, _ in conditional_fields)
+    return templates
+
+
+# 입력 화면에서 숫자 입력칸으로 받는 유해요인 항목 -> 단위 종류 (worklist.numeric.UNIT_SCALES)
+# 업로드할 때 "25kg", "2시간"처럼 단위가 붙은 값을 기준 단위의 숫자로 바꿈
+NUMBER_FIELD_UNITS = {
+    "수공구 무게(kg)": "kg",
+    "물체 무게(kg)_10호": "kg",
+    "작업시간(분)_12호_정적": "분",
+    "휴식시간(분)_12호_정적": "분",
+    "중량물 무게(kg)": "kg",
+    "하루 8시간동안 중량물을 드는 횟수(회)": "회",
+}
+
+# 정규화 양식 유해요인 시트의 항목 컬럼 (모든 유형의 항목 키, 중복 없이 양식 순서대로)
+def hazard_field_keys():
+    keys = []
+    for hazard_type, fields in HAZARD_FIELDS.items():
+        for key, _, _ in fields:
+            if key not in keys:
+                keys.append(key)
+        for _, _, conditional_fields in HAZARD_CONDITIONAL_FIELDS.get(hazard_type, []):
+            for key, _, _ in conditional_fields:
+                if key not in keys:
+                    keys.append(key)
+    return keys
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+import uuid
+
+from worklist.records import hazard_to_dict, units_from_dicts
+from worklist.schema import HAZARD_KEY, UNIT_UID_KEY
+
+# 자동 저장 설정 (환경 변수로 변경 가능, 기본은 꺼짐: WORKLIST_AUTOSAVE=1이면 처음부터 켜짐)
+AUTOSAVE_PATH = os.environ.get(
+    "WORKLIST_AUTOSAVE_PATH",
+    os.path.join(os.path.expanduser("~"), ".worklist", "autosave.sqlite3")
+)
+AUTOSAVE_ENABLED = os.environ.get("WORKLIST_AUTOSAVE", "0").strip().lower() not in ("0", "false", "no", "off")
+
+# 저장된 작업은 브라우저별 토큰(주소의 ?ws=...)으로 구분, 같은 토큰으로 연 화면에서만 목록/불러오기/삭제 가능
+OWNER_QUERY_PARAM = "ws"
+_OWNER_PATTERN = re.compile(r"[A-Za-z0-9_-]{16,64}")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workspaces (
+    workspace_id TEXT PRIMARY KEY,
+    company TEXT,
+    department TEXT,
+    team TEXT,
+    unit_count INTEGER,
+    updated_at REAL,
+    owner TEXT
+);
+CREATE TABLE IF NOT EXISTS units (
+    workspace_id TEXT,
+    unit_id TEXT,
+    position INTEGER,
+    data TEXT,
+    PRIMARY KEY (workspace_id, unit_id)
+);
+CREATE TABLE IF NOT EXISTS hazards (
+    workspace_id TEXT,
+    unit_id TEXT,
+    position INTEGER,
+    data TEXT,
+    PRIMARY KEY (workspace_id, unit_id, position)
+);
+"""
+
+
+def new_uid():
+    return uuid.uuid4().hex
+
+
+def ensure_uid(unit):
+    if not unit.get(UNIT_UID_KEY):
+        unit[UNIT_UID_KEY] = new_uid()
+    return unit[UNIT_UID_KEY]
+
+
+# 주소에 있던 토큰을 그대로 쓰고, 없거나 형식이 맞지 않으면 새로 만듦
+def owner_token(value=None):
+    if isinstance(value, (list, tuple)):
+        value = value[-1] if value else None
+    if value and _OWNER_PATTERN.fullmatch(str(value)):
+        return str(value)
+    return secrets.token_urlsafe(16)
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+# 단위작업 1개를 (유해요인을 뺀 단위작업 JSON, 유해요인 항목 JSON 목록)으로
+def _serialize_unit(unit):
+    unit_text = _dumps({key: value for key, value in unit.items() if key != HAZARD_KEY})
+    hazard_texts = [_dumps(hazard_to_dict(hazard_entry)) for hazard_entry in unit.get(HAZARD_KEY, [])]
+    return unit_text, hazard_texts
+
+
+# 로컬 SQLite 자동 저장소 (프로세스 공용, 세션 스레드 간에는 잠금으로 직렬화)
+# 작업(workspace) 하나 = 회사명/소속/반 정보 + 단위작업 행 + 유해요인 항목 행
+class AutosaveStore:
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            # 토큰 컬럼이 없던 예전 저장소: 컬럼만 추가 (예전 작업은 토큰이 없어 어느 화면에도 보이지 않음)
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(workspaces)")]
+            if "owner" not in columns:
+                with connection:
+                    connection.execute("ALTER TABLE workspaces ADD COLUMN owner TEXT")
+            self._connection = connection
+        return self._connection
+
+    def write_changes(self, workspace_id, owner, header, unit_count, unit_rows, hazard_rows, hazard_trims, removed_units):
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO workspaces VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (workspace_id, header.get("회사명", ""), header.get("소속", ""), header.get("반", ""), unit_count, time.time(), owner)
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO units VALUES (?, ?, ?, ?)",
+                    [(workspace_id, unit_id, position, data) for unit_id, position, data in unit_rows]
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO hazards VALUES (?, ?, ?, ?)",
+                    [(workspace_id, unit_id, position, data) for unit_id, position, data in hazard_rows]
+                )
+                connection.executemany(
+                    "DELETE FROM hazards WHERE workspace_id = ? AND unit_id = ? AND position >= ?",
+                    [(workspace_id, unit_id, hazard_count) for unit_id, hazard_count in hazard_trims]
+                )
+                connection.executemany(
+                    "DELETE FROM units WHERE workspace_id = ? AND unit_id = ?",
+                    [(workspace_id, unit_id) for unit_id in removed_units]
+                )
+                connection.executemany(
+                    "DELETE FROM hazards WHERE workspace_id = ? AND unit_id = ?",
+                    [(workspace_id, unit_id) for unit_id in removed_units]
+                )
+
+    # owner 토큰으로 저장된 작업 목록 (최근 저장 순)
+    def list_workspaces(self, owner, limit=50):
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT workspace_id, company, department, team, unit_count, updated_at "
+                "FROM workspaces WHERE owner = ? ORDER BY updated_at DESC LIMIT ?",
+                (owner, limit)
+            ).fetchall()
+        return [
+            {"workspace_id": row[0], "회사명": row[1], "소속": row[2], "반": row[3], "단위작업 수": row[4], "저장 시각": row[5]}
+            for row in rows
+        ]
+
+    # 저장된 작업을 엑셀을 거치지 않고 그대로 불러옴, 반환값: (회사명/소속/반 dict, 단위작업 목록)
+    # 없는 작업이나 다른 owner의 작업이면 KeyError
+    def load_workspace(self, workspace_id, owner):
+        with self._lock:
+            connection = self._connect()
+            header_row = connection.execute(
+                "SELECT company, department, team FROM workspaces WHERE workspace_id = ? AND owner = ?", (workspace_id, owner)
+            ).fetchone()
+            if header_row is None:
+                raise KeyError(workspace_id)
+            unit_rows = connection.execute(
+                "SELECT unit_id, data FROM units WHERE workspace_id = ? ORDER BY position", (workspace_id,)
+            ).fetchall()
+            hazard_rows = connection.execute(
+                "SELECT unit_id, data FROM hazards WHERE workspace_id = ? ORDER BY unit_id, position", (workspace_id,)
+            ).fetchall()
+
+        hazards_by_unit = {}
+        for unit_id, data in hazard_rows:
+            hazards_by_unit.setdefault(unit_id, []).append(json.loads(data))
+
+        task_units = []
+        for unit_id, data in unit_rows:
+            unit = json.loads(data)
+            unit[HAZARD_KEY] = hazards_by_unit.get(unit_id, [])
+            task_units.append(unit)
+        return {"회사명": header_row[0], "소속": header_row[1], "반": header_row[2]}, units_from_dicts(task_units)
+
+    # owner의 작업이면 지우고 True, 없거나 다른 owner의 작업이면 아무것도 지우지 않고 False
+    def delete_workspace(self, workspace_id, owner):
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                if connection.execute(
+                    "SELECT 1 FROM workspaces WHERE workspace_id = ? AND owner = ?", (workspace_id, owner)
+                ).fetchone() is None:
+                    return False
+                for table in ["workspaces", "units", "hazards"]:
+                    connection.execute(f"DELETE FROM {table} WHERE workspace_id = ?", (workspace_id,))
+        return True
+
+
+# 세션 하나의 저장 상태 (마지막으로 저장한 내용의 해시를 기억해 바뀐 단위작업/유해요인 항목만 기록)
+# owner: 작업을 저장한 브라우저의 토큰 (owner_token)
+class WorkspaceTracker:
+    def __init__(self, owner, workspace_id=None):
+        self.owner = owner
+        self.workspace_id = workspace_id or new_uid()
+        self.saved_at = None
+        self._header = None
+        self._units = {} # 고유ID -> (위치, 단위작업 해시, [유해요인 항목 해시])
+
+    @classmethod
+    def from_loaded(cls, owner, workspace_id, header, task_units):
+        tracker = cls(owner, workspace_id)
+        tracker._header = dict(header)
+        for position, unit in enumerate(task_units):
+            unit_text, hazard_texts = _serialize_unit(unit)
+            tracker._units[ensure_uid(unit)] = (position, _digest(unit_text), [_digest(text) for text in hazard_texts])
+        return tracker
+
+    @property
+    def started(self):
+        return self.saved_at is not None
+
+    # 바뀐 내용만 저장, unit_indices를 주면 해당 위치의 단위작업만 비교 (None이면 전체 비교 및 삭제된 단위작업 정리)
+    # 단위작업 수가 마지막 저장과 다르면 다른 위치의 단위작업도 밀렸으므로 unit_indices를 주어도 전체 비교
+    # 반환값: (기록한 단위작업 수, 기록한 유해요인 항목 수)
+    def save(self, store, header, task_units, unit_indices=None):
+        full_sync = unit_indices is None or len(task_units) != len(self._units)
+        if full_sync:
+            unit_indices = range(len(task_units))
+
+        unit_rows = []
+        hazard_rows = []
+        hazard_trims = []
+        new_states = {}
+        for position in unit_indices:
+            unit = task_units[position]
+            unit_id = ensure_uid(unit)
+            unit_text, hazard_texts = _serialize_unit(unit)
+            unit_digest = _digest(unit_text)
+            hazard_digests = [_digest(text) for text in hazard_texts]
+
+            previous_position, previous_digest, previous_hazards = self._units.get(unit_id, (None, None, []))
+            if previous_position != position or previous_digest != unit_digest:
+                unit_rows.append((unit_id, position, unit_text))
+            for hazard_position, (text, hazard_digest) in enumerate(zip(hazard_texts, hazard_digests)):
+                if hazard_position >= len(previous_hazards) or previous_hazards[hazard_position] != hazard_digest:
+                    hazard_rows.append((unit_id, hazard_position, text))
+            if len(previous_hazards) > len(hazard_digests):
+                hazard_trims.append((unit_id, len(hazard_digests)))
+            new_states[unit_id] = (position, unit_digest, hazard_digests)
+
+        removed_units = [unit_id for unit_id in self._units if unit_id not in new_states] if full_sync else []
+        header = dict(header)
+        if not (unit_rows or hazard_rows or hazard_trims or removed_units) and header == self._header:
+            return 0, 0
+
+        store.write_changes(self.workspace_id, self.owner, header, len(task_units), unit_rows, hazard_rows, hazard_trims, removed_units)
+        self._header = header
+        self._units.update(new_states)
+        for unit_id in removed_units:
+            del self._units[unit_id]
+        self.saved_at = time.time()
+        return len(unit_rows), len(hazard_rows)
+
+
+autosave_store = AutosaveStore(AUTOSAVE_PATH)
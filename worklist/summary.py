@@ -0,0 +1,112 @@
+from collections import Counter
+
+from worklist.numeric import input_number
+from worklist.schema import BURDEN_COLUMNS
+from worklist.store import ensure_uid
+
+# 부담작업 판정 요약 (호별 해당(O)/의심(△) 단위작업 수와 작업자 수)
+EXPOSURE_FLAGS = {"O": "해당(O)", "△": "의심(△)"}
+ANY_BURDEN = "전체" # 1~12호 중 하나라도 해당/의심인 단위작업 (해당(O)이 하나라도 있으면 해당으로 셈)
+
+SUMMARY_COLUMNS = ["부담작업"] + [
+    f"{label} {measure}" for label in EXPOSURE_FLAGS.values() for measure in ("단위작업 수", "작업자 수")
+]
+GROUP_SUMMARY_COLUMNS = ["소속", "반"] + SUMMARY_COLUMNS
+
+
+def _burden_label(column):
+    return column.replace("부담작업_", "") if column != ANY_BURDEN else ANY_BURDEN
+
+
+# 단위작업 1개의 기여분: (소속/반, [(부담작업 컬럼, 판정)], 작업자 수)
+# 소속/반 값이 없는 단위작업은 None (머리글 값을 따르므로 표를 만들 때 머리글 값으로 바꿈)
+def unit_contribution(unit):
+    flags = [(column, unit.get(column)) for column in BURDEN_COLUMNS if unit.get(column) in EXPOSURE_FLAGS]
+    if flags:
+        flags.append((ANY_BURDEN, "O" if any(flag == "O" for _, flag in flags) else "△"))
+    workers = input_number(unit.get("작업자 수", 1), 1, min_value=1, kind="명")
+    return (unit.get("소속"), unit.get("반")), tuple(flags), workers
+
+
+# 부담작업 판정 요약을 단위작업별 기여분의 합으로 유지
+# - update(unit): 그 단위작업의 이전 기여분을 빼고 새 기여분을 더함 (다른 단위작업은 다시 보지 않음)
+# - remove(unit): 삭제한 단위작업의 기여분을 뺌
+# - rebuild(task_units): 업로드/불러오기처럼 목록 전체가 바뀐 경우에만 처음부터 다시 계산
+class ExposureSummary:
+    def __init__(self):
+        self.unit_counts = Counter() # (소속/반, 부담작업 컬럼, 판정) -> 단위작업 수
+        self.worker_counts = Counter() # (소속/반, 부담작업 컬럼, 판정) -> 작업자 수
+        self._contributions = {} # 고유ID -> 기여분
+
+    def __len__(self):
+        return len(self._contributions)
+
+    def _apply(self, contribution, sign):
+        group, flags, workers = contribution
+        for column, flag in flags:
+            self.unit_counts[(group, column, flag)] += sign
+            self.worker_counts[(group, column, flag)] += sign * workers
+
+    # 반환값: 요약이 바뀌었는지
+    def update(self, unit):
+        unit_id = ensure_uid(unit)
+        contribution = unit_contribution(unit)
+        previous = self._contributions.get(unit_id)
+        if previous == contribution:
+            return False
+        if previous is not None:
+            self._apply(previous, -1)
+        self._apply(contribution, 1)
+        self._contributions[unit_id] = contribution
+        return True
+
+    def remove(self, unit):
+        previous = self._contributions.pop(ensure_uid(unit), None)
+        if previous is not None:
+            self._apply(previous, -1)
+
+    def rebuild(self, task_units):
+        self.unit_counts.clear()
+        self.worker_counts.clear()
+        self._contributions.clear()
+        for unit in task_units:
+            self.update(unit)
+
+    def _grouped(self, header):
+        grouped = {}
+        for (group, column, flag), unit_count in self.unit_counts.items():
+            if not unit_count:
+                continue
+            소속, 반 = group
+            key = (header.get("소속", "") if 소속 is None else 소속, header.get("반", "") if 반 is None else 반)
+            counts = grouped.setdefault(key, Counter())
+            counts[(column, flag, "단위작업 수")] += unit_count
+            counts[(column, flag, "작업자 수")] += self.worker_counts[(group, column, flag)]
+        return grouped
+
+    @staticmethod
+    def _rows(counts, skip_empty=False):
+        rows = []
+        for column in BURDEN_COLUMNS + [ANY_BURDEN]:
+            row = {"부담작업": _burden_label(column)}
+            for flag, label in EXPOSURE_FLAGS.items():
+                for measure in ("단위작업 수", "작업자 수"):
+                    row[f"{label} {measure}"] = counts[(column, flag, measure)]
+            if skip_empty and not any(row[name] for name in SUMMARY_COLUMNS[1:]):
+                continue
+            rows.append(row)
+        return rows
+
+    # 호별 요약 (마지막 행은 1~12호 중 하나라도 해당/의심인 단위작업)
+    def burden_rows(self, header):
+        total = Counter()
+        for counts in self._grouped(header).values():
+            total.update(counts)
+        return self._rows(total)
+
+    # 소속/반별 호별 요약 (피벗 내보내기용, 해당/의심이 없는 행은 생략)
+    def group_rows(self, header):
+        rows = []
+        for (소속, 반), counts in sorted(self._grouped(header).items()):
+            rows.extend({"소속": 소속, "반": 반, **row} for row in self._rows(counts, skip_empty=True))
+        return rows
@@ -0,0 +1,193 @@
+# 성능 측정용 가상 작업목록 생성기
+#
+#   python -m worklist.synthetic 1000 -o 가상_작업목록.xlsx --mix 반복동작=3,과도한 힘=1 --max-hazards 3
+#
+# 입력 화면의 선택지와 같은 값으로 단위작업과 유해요인 항목을 만들고,
+# 내보내기와 같은 양식(xlsx, xlsx_long, csv, parquet)으로 저장한다. 같은 seed면 같은 결과.
+import argparse
+import random
+import sys
+
+from worklist import export
+from worklist.records import HazardRecord, UnitRecord
+from worklist.schema import (
+    BURDEN_COLUMNS,
+    BURDEN_OPTIONS,
+    FIXED_MAX_HAZARD_ANALYTICS,
+    HAZARD_TYPE_FORCE,
+    HAZARD_TYPE_OTHER,
+    HAZARD_TYPE_POSTURE,
+    HAZARD_TYPE_REPEAT,
+)
+
+# 유해요인 유형별 기본 비율 (상대 가중치)
+DEFAULT_HAZARD_MIX = {
+    HAZARD_TYPE_REPEAT: 4,
+    HAZARD_TYPE_POSTURE: 3,
+    HAZARD_TYPE_FORCE: 2,
+    HAZARD_TYPE_OTHER: 1,
+}
+
+# 단위 표기가 섞인 시간/횟수 입력 (실제 제출 파일처럼 숫자만, 단위 포함, 빈 값이 섞임)
+MINUTE_VALUES = ["", "30", "60", "90", "130", "150", "240", "300.00", "2시간", "45분"]
+COUNT_VALUES = ["", "100", "500회", "1200", "2000"]
+SECOND_VALUES = ["", "3", "5", "10초", "20"]
+
+COMPANY_NAMES = ["가나산업", "다라전자", "마바중공업"]
+DEPARTMENTS = ["생산1팀", "생산2팀", "물류팀", "품질팀"]
+TEAMS = ["1반", "2반", "3반"]
+TASK_NAMES = ["부품 조립", "박스 포장", "자재 운반", "용접", "검사", "연마", "적재", "배선 작업"]
+
+
+def _burden_option(rng, hazard_type):
+    return rng.choice(BURDEN_OPTIONS[hazard_type][1:])
+
+
+def make_hazard_entry(rng, hazard_type):
+    hazard_entry = HazardRecord({"유형": hazard_type, "부담작업": "", "부담작업자세": ""})
+
+    if hazard_type == HAZARD_TYPE_REPEAT:
+        burden_task = _burden_option(rng, hazard_type)
+        hazard_entry.update({
+            "부담작업": burden_task,
+            "수공구 종류": rng.choice(["", "드라이버", "스패너", "가위"]),
+            "수공구 용도": rng.choice(["", "체결", "절단"]),
+            "수공구 무게(kg)": rng.choice([0.0, 0.5, 1.5]),
+            "수공구 사용시간(분)": rng.choice(MINUTE_VALUES),
+            "부담부위": rng.choice(["손목", "어깨", "목", "손가락"]),
+            "회당 반복시간(초/회)": rng.choice(SECOND_VALUES),
+            "작업시간동안 반복횟수(회/일)": rng.choice(COUNT_VALUES),
+            "이 작업시간(분)": rng.choice(MINUTE_VALUES),
+        })
+        if "(10호)" in burden_task:
+            hazard_entry["물체 무게(kg)_10호"] = rng.choice([0.0, 3.0, 5.0, 8.0])
+            hazard_entry["분당 반복횟수(회/분)_10호"] = rng.choice(["", "1", "3", "4회"])
+        if "(12호)정적자세" in burden_task:
+            hazard_entry.update({
+                "작업내용_12호_정적": rng.choice(["서서 작업", "앉아서 작업"]),
+                "작업시간(분)_12호_정적": rng.choice([0, 60, 120, 240]),
+                "휴식시간(분)_12호_정적": rng.choice([0, 10, 20]),
+                "인체부담부위_12호_정적": rng.choice(["허리", "다리", "목"]),
+            })
+
+    elif hazard_type == HAZARD_TYPE_POSTURE:
+        hazard_entry.update({
+            "부담작업자세": _burden_option(rng, hazard_type),
+            "회당 반복시간(초/회)": rng.choice(SECOND_VALUES),
+            "작업시간동안 반복횟수(회/일)": rng.choice(COUNT_VALUES),
+            "이 작업시간(분)": rng.choice(MINUTE_VALUES),
+        })
+
+    elif hazard_type == HAZARD_TYPE_FORCE:
+        hazard_entry.update({
+            "부담작업": _burden_option(rng, hazard_type),
+            "중량물 명칭": rng.choice(["박스", "부품 상자", "원자재"]),
+            "중량물 용도": rng.choice(["운반", "적재"]),
+            "중량물 무게(kg)": rng.choice([0.0, 5.0, 12.0, 30.0]),
+            "하루 8시간동안 중량물을 드는 횟수(회)": rng.choice([0, 5, 12, 30]),
+            "취급방법": rng.choice(["", "직접 취급", "크레인 사용"]),
+        })
+        if hazard_entry["취급방법"] == "직접 취급":
+            hazard_entry["중량물 이동방법"] = rng.choice(["", "1인 직접이동", "이동대차(인력이동)", "지게차"])
+            if hazard_entry["중량물 이동방법"] == "이동대차(인력이동)":
+                hazard_entry["작업자가 직접 밀고/당기기"] = rng.choice(["작업자가 직접 바퀴달린 이동대차를 밀고/당기기", "기타"])
+                if hazard_entry["작업자가 직접 밀고/당기기"] == "기타":
+                    hazard_entry["기타_밀당_설명"] = "수레 사용"
+
+    elif hazard_type == HAZARD_TYPE_OTHER:
+        burden_task = _burden_option(rng, hazard_type)
+        hazard_entry["부담작업"] = burden_task
+        if "(11호)" in burden_task:
+            hazard_entry["작업시간(분)"] = rng.choice(MINUTE_VALUES)
+        elif "(12호)진동작업" in burden_task:
+            hazard_entry.update({
+                "진동수공구명": rng.choice(["그라인더", "임팩터"]),
+                "진동수공구 용도": rng.choice(["연마", "체결"]),
+                "작업시간(분)_진동": rng.choice(MINUTE_VALUES),
+                "작업빈도(초/회)_진동": rng.choice(SECOND_VALUES),
+                "작업량(회/일)_진동": rng.choice(COUNT_VALUES),
+                "수공구사용시 지지대가 있는가?": rng.choice(["", "예", "아니오"]),
+            })
+
+    return hazard_entry
+
+
+# 가상 단위작업 목록
+# hazard_mix: {유해요인 유형: 상대 가중치}, 단위작업마다 min_hazards~max_hazards개의 유해요인 항목
+def make_task_units(unit_count, hazard_mix=None, min_hazards=1, max_hazards=FIXED_MAX_HAZARD_ANALYTICS, seed=0):
+    rng = random.Random(seed)
+    hazard_mix = hazard_mix or DEFAULT_HAZARD_MIX
+    hazard_types = list(hazard_mix)
+    weights = [hazard_mix[hazard_type] for hazard_type in hazard_types]
+
+    task_units = []
+    for i in range(unit_count):
+        hazard_count = rng.randint(min_hazards, max_hazards)
+        unit = UnitRecord({
+            "회사명": rng.choice(COMPANY_NAMES),
+            "소속": rng.choice(DEPARTMENTS),
+            "반": rng.choice(TEAMS),
+            "단위작업명": f"{rng.choice(TASK_NAMES)} {i + 1}",
+            "작업내용(상세설명)": rng.choice(["", "라인에서 부품을 조립", "완제품을 박스에 포장", "자재를 대차로 운반"]),
+            "작업자 수": rng.randint(1, 5),
+            "작업자 이름": rng.choice(["", "김철수", "이영희", "박민수"]),
+            "작업형태": rng.choice(["주간", "교대"]),
+            "1일 작업시간": rng.choice([0, 4, 8]),
+            "유해요인_원인분석": [
+                make_hazard_entry(rng, hazard_type)
+                for hazard_type in rng.choices(hazard_types, weights=weights, k=hazard_count)
+            ],
+            "보호구": rng.choice([[], ["기타"], ["무릎보호대", "손목보호대"]]),
+            "작성자": rng.choice(["", "안전관리자"]),
+            "연락처": rng.choice(["", "010-0000-0000"]),
+        })
+        for col_name in BURDEN_COLUMNS:
+            unit[col_name] = "X"
+        task_units.append(unit)
+    return task_units
+
+
+# 가상 작업목록 파일 내용 (내보내기 형식 키: xlsx, xlsx_long, csv, parquet)
+def make_workbook_bytes(unit_count, file_format="xlsx", **options):
+    return export.build_export_bytes(make_task_units(unit_count, **options), file_format)
+
+
+def _parse_mix(text):
+    hazard_mix = {}
+    for item in text.split(","):
+        hazard_type, _, weight = item.partition("=")
+        hazard_type = hazard_type.strip()
+        if hazard_type not in DEFAULT_HAZARD_MIX:
+            raise argparse.ArgumentTypeError(f"알 수 없는 유해요인 유형: '{hazard_type}' (사용 가능: {', '.join(DEFAULT_HAZARD_MIX)})")
+        hazard_mix[hazard_type] = float(weight) if weight else 1.0
+    return hazard_mix
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m worklist.synthetic", description="성능 측정용 가상 작업목록 파일을 만듭니다.")
+    parser.add_argument("units", type=int, help="단위작업 수")
+    parser.add_argument("-o", "--output", default="가상_작업목록.xlsx", help="저장할 파일 경로, 확장자로 형식 결정 (기본값: %(default)s)")
+    parser.add_argument("--long", action="store_true", help="xlsx를 정규화 양식(유해요인 시트 분리)으로 저장")
+    parser.add_argument("--mix", type=_parse_mix, default=None, help="유해요인 유형별 가중치, 예: '반복동작=3,과도한 힘=1' (기본값: 모든 유형)")
+    parser.add_argument("--min-hazards", type=int, default=1, help="단위작업당 최소 유해요인 항목 수 (기본값: %(default)s)")
+    parser.add_argument("--max-hazards", type=int, default=FIXED_MAX_HAZARD_ANALYTICS, help="단위작업당 최대 유해요인 항목 수 (기본값: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드 (기본값: %(default)s)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    output_format = export.format_for_path(args.output)
+    if args.long and output_format == "xlsx":
+        output_format = "xlsx_long"
+
+    task_units = make_task_units(
+        args.units, hazard_mix=args.mix, min_hazards=args.min_hazards, max_hazards=args.max_hazards, seed=args.seed
+    )
+    export.write_export(task_units, args.output, output_format)
+    print(f"단위작업 {len(task_units)}개 -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
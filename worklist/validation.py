@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+from worklist.criteria import CONDITION_UNITS
+from worklist.importer import unit_id_key
+from worklist.numeric import parse_numbers
+from worklist.schema import (
+    BURDEN_COLUMNS,
+    BURDEN_OPTIONS,
+    FIXED_MAX_HAZARD_ANALYTICS,
+    HAZARD_CONDITIONAL_FIELDS,
+    HAZARD_FIELDS,
+    HAZARD_SHEET_NAME,
+    HAZARD_TYPE_COLUMN,
+    NUMBER_FIELD_UNITS,
+    UNIT_ID_COLUMN,
+    WORKLIST_SHEET_NAME,
+)
+
+# 업로드 검증 결과 표 (한 행 = 셀 1개의 문제, 행은 엑셀 행 번호)
+ISSUE_COLUMNS = ["시트", "행", "컬럼", "값", "오류"]
+
+# 단위작업으로 읽지 않는 행의 기준 컬럼 (모두 비어 있으면 건너뜀, importer.decode_task_units와 같음)
+REQUIRED_TEXT_COLUMNS = ["회사명", "단위작업명", "작업내용(상세설명)"]
+
+BURDEN_FLAGS = {"O", "△", "X"}
+
+# 숫자로 읽는 항목 -> 단위 종류 (판정 조건 항목 + 숫자 입력칸 항목)
+NUMERIC_FIELD_UNITS = {**CONDITION_UNITS, **NUMBER_FIELD_UNITS}
+
+# 유해요인 유형별 부담작업 선택 항목 키 (부자연스러운 자세는 부담작업자세)
+BURDEN_OPTION_KEYS = {
+    hazard_type: next(key for key, _, _ in fields if key in ("부담작업", "부담작업자세"))
+    for hazard_type, fields in HAZARD_FIELDS.items()
+}
+
+
+# 유해요인 유형별로 읽을 수 있는 부담작업 값 (입력 화면의 선택지)
+ACCEPTED_OPTIONS = {hazard_type: set(options) for hazard_type, options in BURDEN_OPTIONS.items()}
+
+
+# 가로형 양식의 유형별 항목 키 -> 컬럼 이름 템플릿 (조건부 항목 포함)
+SLOT_COLUMN_TEMPLATES = {
+    hazard_type: {
+        key: column_template
+        for key, column_template, _ in fields + [
+            field for *_, conditional_fields in HAZARD_CONDITIONAL_FIELDS.get(hazard_type, []) for field in conditional_fields
+        ]
+    }
+    for hazard_type, fields in HAZARD_FIELDS.items()
+}
+
+
+# DataFrame 인덱스를 엑셀 행 번호로 (1행은 컬럼 이름)
+def excel_rows(df):
+    return df.index.to_numpy() + 2
+
+
+def _text(series):
+    return series.astype(str).str.strip()
+
+
+def _blank(series):
+    return (series.isna() | _text(series).isin(["", "nan"])).to_numpy()
+
+
+# mask가 True인 행마다 문제 1건 (값은 화면 표에 그대로 보이도록 문자열로)
+def _issues(df, column, mask, message, sheet):
+    if not mask.any():
+        return None
+    values = df[column][mask]
+    return pd.DataFrame({
+        "시트": sheet,
+        "행": excel_rows(df)[mask],
+        "컬럼": column,
+        "값": values.where(values.notna(), "").astype(str).to_numpy(),
+        "오류": message,
+    })
+
+
+def _numeric_issues(df, column, kind, rows, sheet, note):
+    numbers, invalid = parse_numbers(df[column], kind)
+    return _issues(df, column, invalid & rows, f"숫자로 읽을 수 없음 (단위: {kind}, {note})", sheet)
+
+
+# 유형 컬럼 1개와 그 항목 컬럼들 검사 (가로형 슬롯 또는 정규화 양식의 유해요인 시트)
+# column_for(유형, 항목 키) -> 컬럼 이름
+def _hazard_issues(df, type_column, column_for, rows, sheet):
+    issues = []
+    types = _text(df[type_column]).to_numpy(dtype=object)
+    filled = rows & ~_blank(df[type_column])
+    issues.append(_issues(df, type_column, filled & ~np.isin(types, list(HAZARD_FIELDS)), "알 수 없는 유형 (항목 내용을 읽지 않음)", sheet))
+
+    for hazard_type, fields in HAZARD_FIELDS.items():
+        type_rows = filled & (types == hazard_type)
+        if not type_rows.any():
+            continue
+
+        option_column = column_for(hazard_type, BURDEN_OPTION_KEYS[hazard_type])
+        if option_column in df.columns:
+            options = df[option_column]
+            unknown = type_rows & ~_blank(options) & ~options.isin(ACCEPTED_OPTIONS[hazard_type]).to_numpy()
+            issues.append(_issues(df, option_column, unknown, "선택지에 없는 부담작업 (입력 화면에서 선택되지 않음)", sheet))
+
+        checked = [(key, type_rows) for key, _, _ in fields]
+        # importer와 같이 기준 값에 표시 문자열이 들어 있는 행 (앞의 그룹과 맞은 행은 건너뜀)
+        unmatched = type_rows.copy()
+        for trigger_key, marker, conditional_fields in HAZARD_CONDITIONAL_FIELDS.get(hazard_type, []):
+            trigger_column = column_for(hazard_type, trigger_key)
+            if trigger_column not in df.columns:
+                continue
+            trigger_rows = unmatched & df[trigger_column].astype(str).str.contains(marker, regex=False).to_numpy()
+            unmatched &= ~trigger_rows
+            checked.extend((key, trigger_rows) for key, _, _ in conditional_fields)
+
+        for key, key_rows in checked:
+            column = column_for(hazard_type, key)
+            if key not in NUMERIC_FIELD_UNITS or column not in df.columns:
+                continue
+            note = "판정에서 조건을 만족하지 않음" if key in CONDITION_UNITS else "0으로 표시"
+            issues.append(_numeric_issues(df, column, NUMERIC_FIELD_UNITS[key], key_rows, sheet, note))
+    return issues
+
+
+# 작업목록 시트 검사 (importer.decode_task_units가 건너뛰거나 기본값으로 바꾸는 셀)
+def validate_worklist(df, max_hazards=FIXED_MAX_HAZARD_ANALYTICS, sheet=WORKLIST_SHEET_NAME):
+    issues = []
+    row_count = len(df)
+
+    required = [column for column in REQUIRED_TEXT_COLUMNS if column in df.columns]
+    skipped = np.ones(row_count, dtype=bool)
+    for column in required:
+        skipped &= (_text(df[column]) == "").to_numpy()
+    first_column = required[0] if required else df.columns[0] if len(df.columns) else None
+    if first_column is not None:
+        issues.append(_issues(df, first_column, skipped, "회사명, 단위작업명, 작업내용(상세설명)이 모두 비어 있어 읽지 않음", sheet))
+    rows = ~skipped
+
+    if "작업자 수" in df.columns:
+        workers, invalid = parse_numbers(df["작업자 수"], "명")
+        issues.append(_issues(df, "작업자 수", invalid & rows, "숫자로 읽을 수 없음 (1명으로 읽음)", sheet))
+        with np.errstate(invalid="ignore"):
+            issues.append(_issues(df, "작업자 수", (workers < 1) & rows, "1명 이상이어야 함", sheet))
+    if "1일 작업시간" in df.columns:
+        issues.append(_numeric_issues(df, "1일 작업시간", "시간", rows, sheet, "그대로 읽음"))
+
+    for column in BURDEN_COLUMNS:
+        if column in df.columns:
+            unknown = rows & ~_blank(df[column]) & ~_text(df[column]).isin(BURDEN_FLAGS).to_numpy()
+            issues.append(_issues(df, column, unknown, "O, △, X 중 하나가 아님 (X로 판정)", sheet))
+
+    if UNIT_ID_COLUMN not in df.columns:
+        for slot in range(1, max_hazards + 1):
+            type_column = HAZARD_TYPE_COLUMN.format(n=slot)
+            if type_column in df.columns:
+                column_for = lambda hazard_type, key, slot=slot: SLOT_COLUMN_TEMPLATES[hazard_type][key].format(n=slot)
+                issues.extend(_hazard_issues(df, type_column, column_for, rows, sheet))
+    return _issue_rows(issues)
+
+
+# 정규화 양식 유해요인 시트 검사 (unit_ids: 작업목록 시트의 단위작업ID, 주면 연결되지 않는 행도 표시)
+def validate_hazard_sheet(hazard_df, unit_ids=None, sheet=HAZARD_SHEET_NAME):
+    if UNIT_ID_COLUMN not in hazard_df.columns or "유형" not in hazard_df.columns:
+        return []
+
+    issues = []
+    rows = ~_blank(hazard_df[UNIT_ID_COLUMN])
+    if unit_ids is not None:
+        known = {unit_id_key(value) for value in unit_ids}
+        linked = np.array([unit_id_key(value) in known for value in hazard_df[UNIT_ID_COLUMN].tolist()], dtype=bool)
+        issues.append(_issues(hazard_df, UNIT_ID_COLUMN, rows & ~linked, "작업목록 시트에 없는 단위작업ID (항목을 읽지 않음)", sheet))
+    issues.extend(_hazard_issues(hazard_df, "유형", lambda hazard_type, key: key, rows, sheet))
+    return _issue_rows(issues)
+
+
+# 파일 1개의 검사 결과 (작업목록 시트 + 있으면 유해요인 시트)
+def validate_tables(df, hazard_df=None):
+    issues = validate_worklist(df)
+    if hazard_df is not None:
+        unit_ids = df[UNIT_ID_COLUMN].tolist() if UNIT_ID_COLUMN in df.columns else []
+        issues += validate_hazard_sheet(hazard_df, unit_ids)
+    return issues
+
+
+def _issue_rows(issues):
+    frames = [frame for frame in issues if frame is not None]
+    if not frames:
+        return []
+    table = pd.concat(frames, ignore_index=True).sort_values(["행"], kind="stable")
+    table["행"] = table["행"].astype(int)
+    return table[ISSUE_COLUMNS].to_dict("records")
+
+
+# 대용량 파일 모드의 행 묶음 1개 검사 (importer.stream_task_units의 chunk_callback용)
+# 유해요인 시트를 먼저 읽으므로 작업목록 시트와 연결되지 않는 단위작업ID는 검사하지 않음
+def validate_chunk(sheet_name, chunk):
+    if sheet_name == HAZARD_SHEET_NAME:
+        return validate_hazard_sheet(chunk)
+    return validate_worklist(chunk)
+
+
+# 여러 파일의 검사 결과를 하나의 표로 (앞에 파일 이름 컬럼)
+def tag_file(issues, name):
+    return [{"파일": name, **issue} for issue in issues]